@@ -0,0 +1,132 @@
+"""Benchmark parsing fight and fighter pages with and without HTML trimming.
+
+Parses the fixture pages under each parser backend, checks that the parsed
+items are identical either way, and reports the page size, the median parse
+time and the memory taken by each page's tree.
+
+Example:
+    python benchmarks/html_trim_benchmark.py --repeat 200
+
+"""
+
+import argparse
+from multiprocessing import get_context
+from pathlib import Path
+import resource
+from statistics import median
+import sys
+from time import perf_counter
+from typing import Any, Callable, cast, Dict, List, Tuple
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(REPO_DIR / "src"), str(REPO_DIR / "src" / "ufcstats")]
+
+from scrapy.http import HtmlResponse, Response  # noqa: E402
+
+from tests import FIGHT_RESPONSE_VALID_PATH, FIGHTER_RESPONSE_VALID_PATH  # noqa: E402
+from ufcstats.parsers.html_trim import trim_response  # noqa: E402
+from ufcstats.parsers.parser_backends import set_parser_backend  # noqa: E402
+from ufcstats.spiders.fight_pages import parse_fight_page  # noqa: E402
+from ufcstats.spiders.fighters import parse_fighter_page  # noqa: E402
+
+PARSER_BACKENDS = ("parsel", "lxml")
+PAGES: List[Tuple[str, str, Path, Callable[[Response], List[Any]]]] = [
+    (
+        "fight",
+        "http://www.ufcstats.com/fight-details/ebf7cea27b83c432",
+        FIGHT_RESPONSE_VALID_PATH,
+        parse_fight_page,
+    ),
+    (
+        "fighter",
+        "http://www.ufcstats.com/fighter-details/f4c49976c75c5ab2",
+        FIGHTER_RESPONSE_VALID_PATH,
+        parse_fighter_page,
+    ),
+]
+# Trees built per page when measuring memory, so the RSS growth is measurable
+NUM_TREES = 300
+
+
+def load_response(url: str, path: Path, trim: bool) -> HtmlResponse:
+    """Load a fixture page, trimmed or whole."""
+    response = HtmlResponse(url=url, body=path.read_bytes())
+    # Trimming an HtmlResponse returns one
+    return cast(HtmlResponse, trim_response(response)) if trim else response
+
+
+def get_fields(items: List[Any]) -> List[Any]:
+    """Get each item's fields, leaving out the time it was scraped at."""
+    return [
+        (
+            type(item).__name__,
+            {k: v for k, v in vars(item).items() if k != "scraped_at"},
+        )
+        for item in items
+    ]
+
+
+def time_parse(
+    url: str, path: Path, parse: Callable[[Response], List[Any]], repeat: int
+) -> Tuple[float, float]:
+    """Get the median time in ms to parse a page whole and trimmed.
+
+    Whole and trimmed parses alternate, so drift in machine load affects both
+    alike. Raises AssertionError if trimming changes the items parsed.
+    """
+    times: Dict[bool, List[float]] = {False: [], True: []}
+    items: Dict[bool, List[Any]] = {}
+    for _ in range(repeat):
+        for trim in (False, True):
+            start = perf_counter()
+            items[trim] = parse(load_response(url, path, trim))
+            times[trim].append(perf_counter() - start)
+
+    if get_fields(items[False]) != get_fields(items[True]):
+        raise AssertionError(f"Trimming changed the items parsed from {path.name}")
+
+    return median(times[False]) * 1e3, median(times[True]) * 1e3
+
+
+def measure_tree_memory(url: str, path: Path, trim: bool) -> float:
+    """Get the KB of RSS taken by each tree built for a page.
+
+    Run in a fresh process, so the peak RSS only covers this page's trees.
+    """
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    responses = []
+    for _ in range(NUM_TREES):
+        response = load_response(url, path, trim)
+        # The tree is built lazily, on first access
+        response.selector.root
+        responses.append(response)
+
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss) / NUM_TREES
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Print the size, parse time and tree memory of each page."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument(
+        "--repeat", type=int, default=200, help="Times each page is parsed"
+    )
+    args = arg_parser.parse_args(argv)
+
+    for name, url, path, parse in PAGES:
+        trimmed_size = len(load_response(url, path, trim=True).body)
+        print(f"{name} page: {path.stat().st_size} -> {trimmed_size} bytes")
+        for parser_backend in PARSER_BACKENDS:
+            set_parser_backend(parser_backend)
+            full_ms, trimmed_ms = time_parse(url, path, parse, args.repeat)
+            print(f"  {parser_backend:6} {full_ms:.2f} -> {trimmed_ms:.2f} ms")
+
+        with get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+            full_kb, trimmed_kb = (
+                pool.apply(measure_tree_memory, (url, path, trim))
+                for trim in (False, True)
+            )
+        print(f"  tree RSS ~{full_kb:.0f} -> ~{trimmed_kb:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark the utils text helpers against the regex versions they replaced.
+
+Times each helper on the fight stat values of the fight fixture page, after
+checking that it returns the same as the regex version it replaced, and
+times the bulk helpers against calling the single-value helper in a loop.
+
+Example:
+    python benchmarks/utils_benchmark.py --repeat 7
+
+"""
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+import re
+import sys
+from timeit import repeat as timeit_repeat
+from typing import Any, Callable, List, Sequence, Tuple
+from uuid import NAMESPACE_URL, uuid5
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(REPO_DIR / "src"), str(REPO_DIR / "src" / "ufcstats")]
+
+from scrapy.http import HtmlResponse  # noqa: E402
+
+from tests import FIGHT_RESPONSE_VALID_PATH  # noqa: E402
+from ufcstats.parsers.base_parser import CssQueries  # noqa: E402
+import utils  # noqa: E402
+
+URLS = [
+    "http://www.ufcstats.com/fighter-details/07f72a2a7591b409",
+    "http://ufcstats.com/fight-details/ebf7cea27b83c432",
+] * 50
+DATES = ["October 26, 2024", "July 19, 1987", "March 2, 2019"] * 100
+# Calls per timing run, of a helper on every value or of a bulk helper
+NUMBER = 200
+
+
+def old_clean_string(raw_string: str) -> str:
+    """Normalize whitespace as clean_string did before."""
+    return re.sub(r"\s+", " ", raw_string).strip()
+
+
+def old_format_href(url: str) -> str:
+    """Remove 'www.' from a URL as format_href did before."""
+    return re.sub(r"(?<=://)www\.", "", url)
+
+
+def old_get_uuid_string(input_string: str) -> str:
+    """Generate a URL's UUID as get_uuid_string did before."""
+    return str(uuid5(namespace=NAMESPACE_URL, name=old_format_href(input_string)))
+
+
+def old_get_strikes_landed_attempted(fight_stat: str) -> Tuple[int, int]:
+    """Parse an "X of Y" fight stat as get_strikes_landed_attempted did before."""
+    strikes_attempted_landed_pattern = re.compile(r"^\d+\s+of\s+\d+$")
+    fight_stat_clean = old_clean_string(fight_stat)
+    if not strikes_attempted_landed_pattern.fullmatch(fight_stat_clean):
+        raise ValueError(f"Invalid fight_stat format: {fight_stat!r}")
+    fight_stat_split = fight_stat_clean.split(" of ")
+
+    return int(fight_stat_split[0]), int(fight_stat_split[1])
+
+
+def old_format_date(date_string: str) -> str:
+    """Convert a date to ISO format with strptime, as the parsers did before."""
+    return datetime.strftime(datetime.strptime(date_string, "%B %d, %Y"), "%Y-%m-%d")
+
+
+def time_call(function: Callable[[], Any], repeat: int) -> float:
+    """Get the fastest time in seconds of one call of function."""
+    return min(timeit_repeat(function, number=NUMBER, repeat=repeat)) / NUMBER
+
+
+def compare_per_value(
+    name: str,
+    old: Callable[[str], Any],
+    new: Callable[[str], Any],
+    values: Sequence[str],
+    repeat: int,
+) -> None:
+    """Print the time per value of a helper and the version it replaced."""
+    if [old(value) for value in values] != [new(value) for value in values]:
+        raise AssertionError(f"{name} does not match the version it replaced")
+
+    old_ns = time_call(lambda: [old(value) for value in values], repeat)
+    new_ns = time_call(lambda: [new(value) for value in values], repeat)
+    old_ns, new_ns = old_ns / len(values) * 1e9, new_ns / len(values) * 1e9
+    print(f"{name:30}{old_ns:8.0f} ns -> {new_ns:6.0f} ns  ({old_ns / new_ns:.1f}x)")
+
+
+def compare_bulk(
+    name: str,
+    loop: Callable[[], List[Any]],
+    bulk: Callable[[], List[Any]],
+    repeat: int,
+) -> None:
+    """Print the time of a bulk helper and of a loop doing the same."""
+    if loop() != bulk():
+        raise AssertionError(f"{name} does not match the loop it replaced")
+
+    loop_us = time_call(loop, repeat) * 1e6
+    bulk_us = time_call(bulk, repeat) * 1e6
+    print(
+        f"{name:30}{loop_us:8.1f} us -> {bulk_us:6.1f} us  ({loop_us / bulk_us:.1f}x)"
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Print the time of each helper and of the version it replaced."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=7,
+        help="Timing runs, of which the fastest is kept",
+    )
+    args = arg_parser.parse_args(argv)
+
+    response = HtmlResponse(
+        url="http://www.ufcstats.com/fight-details/ebf7cea27b83c432",
+        body=FIGHT_RESPONSE_VALID_PATH.read_bytes(),
+    )
+    raw_values = response.css(CssQueries.fight_stat_values_query).getall()
+    clean_values = utils.clean_strings(raw_values)
+    strikes = [value for value in clean_values if " of " in value]
+    print(f"{len(raw_values)} fight stat values, {len(strikes)} 'X of Y' stats")
+
+    compare_per_value(
+        "clean_string, raw values",
+        old_clean_string,
+        utils.clean_string,
+        raw_values,
+        args.repeat,
+    )
+    compare_per_value(
+        "clean_string, clean values",
+        old_clean_string,
+        utils.clean_string,
+        clean_values,
+        args.repeat,
+    )
+    compare_per_value(
+        "format_href", old_format_href, utils.format_href, URLS, args.repeat
+    )
+    compare_per_value(
+        "get_strikes_landed_attempted",
+        old_get_strikes_landed_attempted,
+        utils.get_strikes_landed_attempted,
+        strikes,
+        args.repeat,
+    )
+    compare_per_value(
+        "format_date, warm cache",
+        old_format_date,
+        lambda date_string: utils.format_date(date_string, "%B %d, %Y"),
+        DATES,
+        args.repeat,
+    )
+    compare_bulk(
+        f"clean_strings, {len(raw_values)} values",
+        lambda: [old_clean_string(value) for value in raw_values],
+        lambda: utils.clean_strings(raw_values),
+        args.repeat,
+    )
+    compare_bulk(
+        f"get_uuid_strings, {len(URLS)} urls",
+        lambda: [old_get_uuid_string(url) for url in URLS],
+        lambda: utils.get_uuid_strings(URLS),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
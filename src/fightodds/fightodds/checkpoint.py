@@ -0,0 +1,180 @@
+"""Checkpoint of how far a fightodds.io crawl has paged through the GraphQL API.
+
+Scrapy's JOBDIR keeps the request queue and seen request fingerprints of a
+stopped crawl, but only writes them when the crawl shuts down cleanly. The
+checkpoint is written to the JOBDIR whenever a list page is finished, every
+CHECKPOINT_SAVE_EVERY completed entries in between and when the crawl
+closes. So even a crawl that was killed resumes from the first list page it
+had not finished, and skips the events or fighters on it that it finished
+before the last write.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scrapy import signals
+from scrapy.crawler import Crawler
+
+CHECKPOINT_FILE_NAME = "checkpoint.json"
+# Completed entries between writes of the checkpoint within a list page
+DEFAULT_SAVE_EVERY = 100
+
+# An entry requested from a list page, an event by PK or a fighter by slug
+EntryKey = int | str
+
+
+class CrawlCheckpoint:
+    """Pagination cursor and completed entries of a fightodds.io crawl.
+
+    An entry is completed once every request made for it has been parsed,
+    e.g. the odds of each of an event's fights. A list page is finished once
+    every entry on it is completed, and the cursor only moves past a page
+    once it and every page before it are finished. A resumed crawl requests
+    the first unfinished page again and every entry on it that was not
+    completed, so requests in flight when the crawl stopped are made again.
+    Pages up to the cursor are never requested again, so the keys of their
+    entries are dropped once the cursor moves past them. Without a path,
+    e.g. when JOBDIR is not set, the checkpoint is kept in memory only.
+
+    Args:
+        path (Optional[Path]): JSON file the checkpoint is loaded from and
+            saved to.
+        save_every (int): Completed entries between writes of the checkpoint,
+            besides the writes when the cursor moves.
+
+    Attributes:
+        end_cursor (str): endCursor of the last list page finished, from which
+            a resumed crawl requests the next page.
+        completed_keys (Set[EntryKey]): Keys of the completed entries on pages
+            after end_cursor.
+        _pending_pages (List[Tuple[Optional[str], Set[EntryKey], Set[EntryKey]]]):
+            endCursor, entries and uncompleted entries of each list page after
+            end_cursor, in page order.
+        _pending_requests (Dict[EntryKey, int]): Number of requests per
+            started entry that have not been parsed yet.
+        _num_unsaved (int): Entries completed since the checkpoint was saved.
+
+    """
+
+    def __init__(
+        self, path: Optional[Path] = None, save_every: int = DEFAULT_SAVE_EVERY
+    ):
+        self._path = path
+        self._save_every = save_every
+        self.end_cursor = ""
+        self.completed_keys: Set[EntryKey] = set()
+        self._pending_pages: List[
+            Tuple[Optional[str], Set[EntryKey], Set[EntryKey]]
+        ] = []
+        self._pending_requests: Dict[EntryKey, int] = {}
+        self._num_unsaved = 0
+        if path is not None and path.exists():
+            checkpoint = json.loads(path.read_text())
+            self.end_cursor = checkpoint["end_cursor"]
+            self.completed_keys = set(checkpoint["completed_keys"])
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "CrawlCheckpoint":
+        """Load the checkpoint of the crawler's JOBDIR, if it has one.
+
+        The checkpoint is saved when the spider closes.
+        """
+        job_dir = crawler.settings.get("JOBDIR")
+        if not job_dir:
+            return cls()
+
+        Path(job_dir).mkdir(parents=True, exist_ok=True)
+        checkpoint = cls(
+            Path(job_dir) / CHECKPOINT_FILE_NAME,
+            crawler.settings.getint("CHECKPOINT_SAVE_EVERY", DEFAULT_SAVE_EVERY),
+        )
+        crawler.signals.connect(checkpoint.save, signal=signals.spider_closed)
+
+        return checkpoint
+
+    def save(self) -> None:
+        """Write the checkpoint to its file, if it has one."""
+        self._num_unsaved = 0
+        if self._path is None:
+            return
+
+        checkpoint = {
+            "end_cursor": self.end_cursor,
+            "completed_keys": sorted(self.completed_keys, key=str),
+        }
+        # Written to a temporary file first, so a crash never leaves it half written
+        temporary_path = self._path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(checkpoint))
+        os.replace(temporary_path, self._path)
+
+    def _advance_end_cursor(self) -> None:
+        # Saved whenever the cursor moves, and every save_every entries otherwise
+        is_advanced = False
+        while self._pending_pages and not self._pending_pages[0][2]:
+            end_cursor, page_keys, _ = self._pending_pages.pop(0)
+            # The last page can be empty and have no endCursor
+            self.end_cursor = end_cursor or self.end_cursor
+            self.completed_keys -= page_keys
+            is_advanced = True
+
+        if is_advanced or self._num_unsaved >= self._save_every:
+            self.save()
+
+    def record_page(self, end_cursor: Optional[str], keys: Iterable[EntryKey]) -> None:
+        """Record the entries on a list page, before any are parsed.
+
+        Call it after checking which entries are completed, as completing the
+        page drops their keys.
+
+        Args:
+            end_cursor (Optional[str]): endCursor of the list page.
+            keys (Iterable[EntryKey]): Keys of every entry on the page,
+                including those already completed.
+
+        """
+        page_keys = set(keys)
+        self._pending_pages.append(
+            (end_cursor, page_keys, page_keys - self.completed_keys)
+        )
+        self._advance_end_cursor()
+
+    def record_requests(self, key: EntryKey, num_requests: int) -> None:
+        """Record how many requests were made for an entry, completing it if none.
+
+        Args:
+            key (EntryKey): Key of the entry.
+            num_requests (int): Number of requests made for the entry.
+
+        """
+        if num_requests:
+            self._pending_requests[key] = num_requests
+        else:
+            self.record_completed(key)
+
+    def record_request_parsed(self, key: EntryKey) -> None:
+        """Record that a request made for an entry was parsed.
+
+        Args:
+            key (EntryKey): Key of the entry the request was made for.
+
+        """
+        pending_requests = self._pending_requests.get(key, 1) - 1
+        if pending_requests > 0:
+            self._pending_requests[key] = pending_requests
+        else:
+            self._pending_requests.pop(key, None)
+            self.record_completed(key)
+
+    def record_completed(self, key: EntryKey) -> None:
+        """Record that every request made for an entry was parsed."""
+        self.completed_keys.add(key)
+        self._num_unsaved += 1
+        for _, _, pending_keys in self._pending_pages:
+            pending_keys.discard(key)
+        self._advance_end_cursor()
+
+    def is_completed(self, key: EntryKey) -> bool:
+        """Check whether an entry was completed, e.g. before the crawl was stopped."""
+        return key in self.completed_keys
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, Iterator
 
 from fightodds.entities.fighter import Fighter
-from utils import clean_string
+from utils import clean_string, format_date
 
 
 class FighterParser:
@@ -41,9 +41,7 @@ class FighterParser:
                 )
             )
         dob_clean = clean_string(self._fighter["birthDate"])
-        self._dob_formatted = datetime.strptime(dob_clean, "%Y-%m-%d").strftime(
-            "%Y-%m-%d"
-        )
+        self._dob_formatted = format_date(dob_clean, "%Y-%m-%d")
 
     def _get_fighting_style(self) -> None:
         self._fighting_style_clean = (
@@ -52,9 +52,20 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-# DOWNLOADER_MIDDLEWARES = {
-#    "fightodds.middlewares.FightoddsDownloaderMiddleware": 543,
-# }
+DOWNLOADER_MIDDLEWARES = {
+    # After decompression and redirects, so only final, decoded bodies are archived
+    "response_archive.ResponseArchiveMiddleware": 550,
+}
+
+# Every distinct response body is kept compressed in RESPONSE_ARCHIVE_DIR, see
+# src/response_archive.py
+RESPONSE_ARCHIVE_ENABLED = True
+RESPONSE_ARCHIVE_DIR = "archive"
+
+# Completed events or fighters between writes of a resumable crawl's
+# checkpoint, which is also written whenever a list page is finished, see
+# fightodds/checkpoint.py
+CHECKPOINT_SAVE_EVERY = 100
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -6,7 +6,9 @@ from typing import Any, Dict
 
 import scrapy
 from glom import glom  # type: ignore[import-untyped]
+from scrapy.crawler import Crawler
 
+from fightodds.checkpoint import CrawlCheckpoint
 from fightodds.parsers.event_parser import EventParser
 from .constants import (
     FIGHTODDS_API_URL as URL,
@@ -17,9 +19,16 @@ from .constants import (
 
 
 class CrawlEvents(scrapy.Spider):
-    """Crawl all UFC events from fightodds.io and yield event overview metrics."""
+    """Crawl all UFC events from fightodds.io and yield event overview metrics.
+
+    With JOBDIR set, a stopped crawl resumes from the first events page with
+    an event that was not parsed, and skips events that were. Requests are
+    made with dont_filter, as those made before the crawl was killed may be
+    in JOBDIR's seen requests without having been parsed.
+    """
 
     name = "crawl_events"
+    _checkpoint: CrawlCheckpoint
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -50,8 +59,18 @@ class CrawlEvents(scrapy.Spider):
         self._end_date = end_date
         self._num_requests = num_requests
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with the checkpoint of its JOBDIR."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._checkpoint = CrawlCheckpoint.from_crawler(crawler)
+
+        return spider
+
     def start_requests(self, after: str = "") -> Any:
         """Issue the initial events list request, with optional pagination cursor."""
+        # Resume from the last events page reached before the crawl was stopped
+        after = after or self._checkpoint.end_cursor
         payload = {
             "operationName": "EventsListQuery",
             "variables": {
@@ -70,13 +89,23 @@ class CrawlEvents(scrapy.Spider):
             headers=HEADERS,
             body=json.dumps(payload),
             callback=self._get_event_slugs,
+            dont_filter=True,
         )
 
     def _get_event_slugs(self, response: Any) -> Any:
         """Extract event metadata from the events list response and paginate if needed."""
         json_response = response.json()
         events_data = glom(json_response, "data.promotion.events")
-        event_edges = events_data["edges"]
+        event_edges = [
+            edge
+            for edge in events_data["edges"]
+            if not self._checkpoint.is_completed(edge["node"]["pk"])
+        ]
+        page_info = events_data["pageInfo"]
+        self._checkpoint.record_page(
+            page_info["endCursor"],
+            [edge["node"]["pk"] for edge in events_data["edges"]],
+        )
 
         for edge in event_edges:
             node = edge["node"]
@@ -100,13 +129,19 @@ class CrawlEvents(scrapy.Spider):
                 body=json.dumps(payload),
                 callback=self._get_event_fighters,
                 cb_kwargs={"event_meta": event_meta},
+                dont_filter=True,
             )
 
-        page_info = events_data["pageInfo"]
         if page_info["hasNextPage"]:
             yield from self.start_requests(after=page_info["endCursor"])
 
     def _get_event_fighters(self, response: Any, event_meta: Dict[str, str]) -> Any:
         """Parse per-event fight slugs and yield an Event item."""
+        event_pk = int(event_meta["pk"])
+        # Also requested again from its events page when resuming a stopped crawl
+        if self._checkpoint.is_completed(event_pk):
+            return
+
         event_parser = EventParser(event_meta, response)
         yield from event_parser.parse_response()
+        self._checkpoint.record_completed(event_pk)
@@ -2,11 +2,13 @@
 
 from datetime import datetime
 import json
-from typing import Any
+from typing import Any, List
 
 import scrapy
 from glom import glom  # type: ignore[import-untyped]
+from scrapy.crawler import Crawler
 
+from fightodds.checkpoint import CrawlCheckpoint
 from fightodds.parsers.fight_odds_parser import FightOddsParser
 from .constants import (
     FIGHTODDS_API_URL as URL,
@@ -18,9 +20,17 @@ from .constants import (
 
 
 class CrawlFightBettingOdds(scrapy.Spider):
-    """Crawl all fight URLs from fightodds.io and yield betting odds per sportsbook."""
+    """Crawl all fight URLs from fightodds.io and yield betting odds per sportsbook.
+
+    With JOBDIR set, a stopped crawl resumes from the first events page with
+    an event whose fight odds were not all parsed, and skips events whose
+    fight odds were. Requests are made with dont_filter, as those made before
+    the crawl was killed may be in JOBDIR's seen requests without having
+    been parsed.
+    """
 
     name = "crawl_fight_betting_odds"
+    _checkpoint: CrawlCheckpoint
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -51,8 +61,18 @@ class CrawlFightBettingOdds(scrapy.Spider):
         self._end_date = end_date
         self._num_requests = num_requests
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with the checkpoint of its JOBDIR."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._checkpoint = CrawlCheckpoint.from_crawler(crawler)
+
+        return spider
+
     def start_requests(self, after: str = "") -> Any:
         """Issue the initial events list request, with optional pagination cursor."""
+        # Resume from the last events page reached before the crawl was stopped
+        after = after or self._checkpoint.end_cursor
         payload = {
             "operationName": "EventsPromotionRecentQuery",
             "variables": {
@@ -71,16 +91,23 @@ class CrawlFightBettingOdds(scrapy.Spider):
             headers=HEADERS,
             body=json.dumps(payload),
             callback=self._get_event_pks,
+            dont_filter=True,
         )
 
     def _get_event_pks(self, response: Any) -> Any:
         """Extract event PKs from the events list response and paginate if needed."""
         json_response = response.json()
         events_data = glom(json_response, "data.promotion.events")
-        event_edges = events_data["edges"]
+        page_event_pks: List[int] = glom(events_data, ("edges", ["node.pk"]))
+        event_pks = [
+            event_pk
+            for event_pk in page_event_pks
+            if not self._checkpoint.is_completed(event_pk)
+        ]
+        page_info = events_data["pageInfo"]
+        self._checkpoint.record_page(page_info["endCursor"], page_event_pks)
 
-        for edge in event_edges:
-            event_pk: int = glom(edge, "node.pk")
+        for event_pk in event_pks:
             payload = {
                 "operationName": "EventOddsQuery",
                 "variables": {"eventPk": event_pk},
@@ -92,20 +119,28 @@ class CrawlFightBettingOdds(scrapy.Spider):
                 headers=HEADERS,
                 body=json.dumps(payload),
                 callback=self._get_fight_slugs,
+                cb_kwargs={"event_pk": event_pk},
+                dont_filter=True,
             )
 
-        page_info = events_data["pageInfo"]
         if page_info["hasNextPage"]:
             yield from self.start_requests(after=page_info["endCursor"])
 
-    def _get_fight_slugs(self, response: Any) -> Any:
+    def _get_fight_slugs(self, response: Any, event_pk: int) -> Any:
         """Extract fight slugs from an event's fight offers and request per-fight odds."""
+        # Also requested again from its events page when resuming a stopped crawl
+        if self._checkpoint.is_completed(event_pk):
+            return
+
         json_response = response.json()
-        fight_edges = glom(json_response, "data.eventOfferTable.fightOffers.edges")
+        fight_edges = [
+            edge
+            for edge in glom(json_response, "data.eventOfferTable.fightOffers.edges")
+            if not glom(edge, "node.isCancelled")
+        ]
+        self._checkpoint.record_requests(event_pk, len(fight_edges))
 
         for edge in fight_edges:
-            if glom(edge, "node.isCancelled"):
-                continue
             fight_slug: str = glom(edge, "node.slug")
             payload = {
                 "operationName": "FightOddsQuery",
@@ -118,9 +153,12 @@ class CrawlFightBettingOdds(scrapy.Spider):
                 headers=HEADERS,
                 body=json.dumps(payload),
                 callback=self._get_fight_odds,
+                cb_kwargs={"event_pk": event_pk},
+                dont_filter=True,
             )
 
-    def _get_fight_odds(self, response: Any) -> Any:
+    def _get_fight_odds(self, response: Any, event_pk: int) -> Any:
         """Parse per-fight odds and yield one FightOdds item per sportsbook."""
         fight_odds_parser = FightOddsParser(response)
         yield from fight_odds_parser.parse_response()
+        self._checkpoint.record_request_parsed(event_pk)
@@ -1,10 +1,12 @@
 """Defines the spider to crawl all fighter slugs from fightodds.io and parse fighter stats."""
 
 import json
-from typing import Any
+from typing import Any, List
 
 import scrapy
+from scrapy.crawler import Crawler
 
+from fightodds.checkpoint import CrawlCheckpoint
 from fightodds.fightodds.parsers.fighter_info_parser import FighterParser
 from .constants import (
     FIGHTODDS_API_URL as URL,
@@ -15,9 +17,16 @@ from .constants import (
 
 
 class CrawlFighters(scrapy.Spider):
-    """Crawl all fighter slugs from fightodds.io and yield fighter stats."""
+    """Crawl all fighter slugs from fightodds.io and yield fighter stats.
+
+    With JOBDIR set, a stopped crawl resumes from the first fighters page
+    with a fighter that was not parsed, and skips fighters that were.
+    Requests are made with dont_filter, as those made before the crawl was
+    killed may be in JOBDIR's seen requests without having been parsed.
+    """
 
     name = "crawl_fighters"
+    _checkpoint: CrawlCheckpoint
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -35,8 +44,18 @@ class CrawlFighters(scrapy.Spider):
         super().__init__(**kwargs)
         self._num_requests = num_requests
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with the checkpoint of its JOBDIR."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._checkpoint = CrawlCheckpoint.from_crawler(crawler)
+
+        return spider
+
     def start_requests(self, after: str | None = None) -> Any:
         """Issue the initial fighters list request, with optional pagination cursor."""
+        # Resume from the last fighters page reached before the crawl was stopped
+        after = after or self._checkpoint.end_cursor or None
         payload = {
             "operationName": "FightersListQuery",
             "variables": {
@@ -51,15 +70,25 @@ class CrawlFighters(scrapy.Spider):
             headers=HEADERS,
             body=json.dumps(payload),
             callback=self._get_fighter_slugs,
+            dont_filter=True,
         )
 
     def _get_fighter_slugs(self, response: Any) -> Any:
         """Extract fighter slugs from the fighters list response and paginate if needed."""
         json_response = response.json()
         fighters_data = json_response["data"]["allFighters"]
+        page_fighter_slugs: List[str] = [
+            edge["node"]["slug"] for edge in fighters_data["edges"]
+        ]
+        fighter_slugs = [
+            fighter_slug
+            for fighter_slug in page_fighter_slugs
+            if not self._checkpoint.is_completed(fighter_slug)
+        ]
+        page_info = fighters_data["pageInfo"]
+        self._checkpoint.record_page(page_info["endCursor"], page_fighter_slugs)
 
-        for edge in fighters_data["edges"]:
-            fighter_slug: str = edge["node"]["slug"]
+        for fighter_slug in fighter_slugs:
             payload = {
                 "operationName": "FighterStatsQuery",
                 "variables": {"fighterSlug": fighter_slug},
@@ -71,13 +100,19 @@ class CrawlFighters(scrapy.Spider):
                 headers=HEADERS,
                 body=json.dumps(payload),
                 callback=self._get_fighter,
+                cb_kwargs={"fighter_slug": fighter_slug},
+                dont_filter=True,
             )
 
-        page_info = fighters_data["pageInfo"]
         if page_info["hasNextPage"] and page_info["endCursor"]:
             yield from self.start_requests(after=page_info["endCursor"])
 
-    def _get_fighter(self, response: Any) -> Any:
+    def _get_fighter(self, response: Any, fighter_slug: str) -> Any:
         """Parse per-fighter stats and yield a Fighter item."""
+        # Also requested again from its fighters page when resuming a stopped crawl
+        if self._checkpoint.is_completed(fighter_slug):
+            return
+
         fighter_parser = FighterParser(response)
         yield from fighter_parser.parse_response()
+        self._checkpoint.record_completed(fighter_slug)
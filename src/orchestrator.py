@@ -0,0 +1,345 @@
+"""Run ufcstats and fightodds spiders together in a single Scrapy process.
+
+All spiders share one reactor, so crawls of different hosts run concurrently
+instead of back to back. Requests are de-duplicated across spiders, whether
+in flight or already downloaded, and requests to the same host are spaced
+out across every spider.
+
+Example:
+    python src/orchestrator.py ufcstats:crawl_fight_pages ufcstats:crawl_fighters \
+        fightodds:crawl_fight_betting_odds -a output_format=csv --jobdir jobs
+
+"""
+
+import argparse
+from collections import OrderedDict
+from pathlib import Path
+import sys
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler, CrawlerProcess
+from scrapy.http import Response
+from scrapy.settings import Settings
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.request import fingerprint
+from twisted.internet import defer
+from twisted.internet.task import deferLater
+
+SRC_DIR = Path(__file__).resolve().parent
+PROJECTS = ("ufcstats", "fightodds")
+
+# Each Scrapy project lives in its own directory under src/
+for project in PROJECTS:
+    sys.path.insert(0, str(SRC_DIR / project))
+
+from response_archive import compress_body, decompress_body  # noqa: E402
+
+# Responses kept for reuse by default, see SharedDownloadMiddleware
+MAX_DOWNLOADED_RESPONSES = 1000
+
+
+def _no_response() -> Optional[Response]:
+    return None
+
+
+class SharedDownloadMiddleware:
+    """Downloader middleware sharing downloads and host politeness across spiders.
+
+    State is held on the class, so it is shared by every crawler in the
+    process. A request whose fingerprint matches one that another spider is
+    already downloading waits for that download and reuses its response.
+    The most recently used successful responses are kept, with compressed
+    bodies, so a request for a page downloaded earlier reuses that response
+    too, unless it is made with dont_filter, e.g. to poll a page, or with
+    Cache-Control: no-cache. Older responses are dropped, as the HTTP cache
+    keeps them for later runs. Downloads to the same host are spaced at least
+    ORCHESTRATOR_HOST_DELAY seconds apart, however many spiders are crawling
+    that host.
+
+    Args:
+        host_delay (float): Minimum seconds between downloads from one host.
+        max_downloaded (int): Number of successful responses kept for reuse.
+
+    """
+
+    _in_flight: Dict[bytes, List[defer.Deferred[Optional[Response]]]] = {}
+    _downloaded: OrderedDict[bytes, Tuple[Response, bytes]] = OrderedDict()
+    _next_download_at: Dict[str, float] = {}
+
+    def __init__(
+        self, host_delay: float, max_downloaded: int = MAX_DOWNLOADED_RESPONSES
+    ):
+        self._host_delay = host_delay
+        self._max_downloaded = max_downloaded
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "SharedDownloadMiddleware":
+        """Create the middleware using the crawler's orchestrator settings."""
+        return cls(
+            crawler.settings.getfloat("ORCHESTRATOR_HOST_DELAY"),
+            crawler.settings.getint(
+                "ORCHESTRATOR_MAX_DOWNLOADED", MAX_DOWNLOADED_RESPONSES
+            ),
+        )
+
+    def _wait_for_host(self, request: Request) -> defer.Deferred[Optional[Response]]:
+        # Imported here so the reactor chosen by the crawler settings is installed first
+        from twisted.internet import reactor
+
+        host = request.url.split("/")[2].removeprefix("www.")
+        now = time()
+        download_at = max(now, self._next_download_at.get(host, now))
+        self._next_download_at[host] = download_at + self._host_delay
+
+        # The reactor module is only typed as IReactorTime by some Twisted versions
+        return deferLater(
+            reactor,  # type: ignore[arg-type, unused-ignore]
+            download_at - now,
+            _no_response,
+        )
+
+    @staticmethod
+    def _is_refetch(request: Request) -> bool:
+        return request.dont_filter or b"no-cache" in request.headers.getlist(
+            "Cache-Control"
+        )
+
+    def _get_downloaded(
+        self, request_fingerprint: bytes, request: Request
+    ) -> Optional[Response]:
+        if request_fingerprint not in self._downloaded or self._is_refetch(request):
+            return None
+
+        self._downloaded.move_to_end(request_fingerprint)
+        response, compressed_body = self._downloaded[request_fingerprint]
+        return response.replace(body=decompress_body(compressed_body), request=request)
+
+    def process_request(
+        self, request: Request, spider: Spider
+    ) -> defer.Deferred[Optional[Response]]:
+        """Reuse a matching download, or wait for this host's next slot."""
+        request_fingerprint = fingerprint(request)
+        downloaded_response = self._get_downloaded(request_fingerprint, request)
+        if downloaded_response is not None:
+            return defer.succeed(downloaded_response)
+
+        if request_fingerprint in self._in_flight:
+            shared_response: defer.Deferred[Optional[Response]] = defer.Deferred()
+            self._in_flight[request_fingerprint].append(shared_response)
+            shared_response.addCallback(
+                lambda response: response.replace(request=request)
+                if response is not None
+                else self._wait_for_host(request)
+            )
+            return shared_response
+
+        self._in_flight[request_fingerprint] = []
+        request.meta["shared_download_fingerprint"] = request_fingerprint
+
+        return self._wait_for_host(request)
+
+    def _release(self, request: Request, response: Optional[Response]) -> None:
+        request_fingerprint = request.meta.pop("shared_download_fingerprint", None)
+        for waiting in self._in_flight.pop(request_fingerprint, []):
+            waiting.callback(response)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        """Keep a successful response and hand it to any spiders waiting for it."""
+        if response.status == 200 and "shared_download_fingerprint" in request.meta:
+            request_fingerprint = request.meta["shared_download_fingerprint"]
+            compressed_body, _ = compress_body(response.body)
+            self._downloaded[request_fingerprint] = (
+                response.replace(body=b""),
+                compressed_body,
+            )
+            self._downloaded.move_to_end(request_fingerprint)
+            while len(self._downloaded) > self._max_downloaded:
+                self._downloaded.popitem(last=False)
+        self._release(request, response)
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        """Let waiting spiders download the request themselves."""
+        self._release(request, None)
+
+
+def get_project_settings(project: str, overrides: Dict[str, str]) -> Settings:
+    """Load a project's settings module and add the shared download middleware.
+
+    Args:
+        project (str): Scrapy project name, either ufcstats or fightodds.
+        overrides (Dict[str, str]): Settings passed on the command line.
+
+    Returns:
+        Settings: The project settings for one of its crawlers.
+
+    """
+    settings = Settings()
+    settings.setmodule(f"{project}.settings", priority="project")
+    downloader_middlewares = settings.getdict("DOWNLOADER_MIDDLEWARES")
+    # After HttpCacheMiddleware (900), so cache hits are never held back
+    downloader_middlewares["orchestrator.SharedDownloadMiddleware"] = 950
+    settings.set("DOWNLOADER_MIDDLEWARES", downloader_middlewares, priority="project")
+    settings.setdict(overrides, priority="cmdline")
+    settings.setdefault("ORCHESTRATOR_HOST_DELAY", settings.getfloat("DOWNLOAD_DELAY"))
+
+    return settings
+
+
+def get_spider_feeds(
+    project: str, name: str, output_format: str, overwrite: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """Build a FEEDS setting that writes a spider's items to a single file.
+
+    Spiders run together share one working directory, so the file is named
+    after the project and the spider, e.g. data/fightodds_crawl_fighters.csv.
+    Spiders that write a feed per entity type, e.g. crawl_fight_pages, set
+    their own FEEDS in place of this one.
+
+    Args:
+        project (str): Scrapy project name of the spider.
+        name (str): Name of the spider.
+        output_format (str): Feed export format, e.g. csv or json.
+        overwrite (bool): Whether to replace the file, rather than append to
+            it when resuming a crawl.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: FEEDS mapping of the file to its options.
+
+    """
+    return {
+        f"data/{project}_{name}.{output_format}": {
+            "format": output_format,
+            "overwrite": overwrite,
+        }
+    }
+
+
+def get_job_dir(job_dir: Optional[str], project: str, name: str) -> Optional[str]:
+    """Get the JOBDIR of one spider, so spiders run together never share one.
+
+    Args:
+        job_dir (Optional[str]): Directory holding the job directory of every
+            spider, or None to run without one.
+        project (str): Scrapy project name of the spider.
+        name (str): Name of the spider.
+
+    Returns:
+        Optional[str]: The spider's job directory, or None.
+
+    """
+    if job_dir is None:
+        return None
+
+    return str(Path(job_dir) / f"{project}_{name}")
+
+
+def parse_key_values(key_values: List[str]) -> Dict[str, str]:
+    """Parse NAME=VALUE command line arguments into a dict."""
+    return dict(key_value.split("=", 1) for key_value in key_values)
+
+
+def parse_spider_names(spider_names: List[str]) -> List[Tuple[str, str]]:
+    """Split project:spider arguments into (project, spider) pairs."""
+    project_spiders = []
+    for spider_name in spider_names:
+        project, _, name = spider_name.partition(":")
+        if project not in PROJECTS or not name:
+            raise ValueError(
+                f"Invalid spider {spider_name!r}, expected one of "
+                f"{', '.join(PROJECTS)} followed by :<spider name>"
+            )
+        project_spiders.append((project, name))
+
+    return project_spiders
+
+
+def create_crawlers(
+    project_spiders: List[Tuple[str, str]],
+    spider_args: Dict[str, Any],
+    setting_overrides: Dict[str, str],
+    job_dir: Optional[str] = None,
+) -> List[Crawler]:
+    """Create a crawler with its own project settings for each spider.
+
+    Args:
+        project_spiders (List[Tuple[str, str]]): (project, spider) pairs.
+        spider_args (Dict[str, Any]): Spider arguments passed to every spider.
+            With output_format set, each spider's items are written to a feed,
+            see get_spider_feeds.
+        setting_overrides (Dict[str, str]): Settings passed on the command line.
+        job_dir (Optional[str]): Directory holding each spider's JOBDIR.
+
+    Returns:
+        List[Crawler]: The crawlers, in the order of project_spiders. Only the
+            first one installs the reactor.
+
+    """
+    output_format = spider_args.get("output_format")
+    crawlers = []
+    for index, (project, name) in enumerate(project_spiders):
+        settings = get_project_settings(project, setting_overrides)
+        if output_format:
+            # Feeds are appended to when resuming, as with crawl_resumable_%
+            settings.set(
+                "FEEDS",
+                get_spider_feeds(project, name, output_format, job_dir is None),
+                priority="project",
+            )
+        spider_job_dir = get_job_dir(job_dir, project, name)
+        if spider_job_dir is not None:
+            settings.set("JOBDIR", spider_job_dir, priority="cmdline")
+        spidercls = SpiderLoader.from_settings(settings).load(name)
+        crawlers.append(Crawler(spidercls, settings, init_reactor=index == 0))
+
+    return crawlers
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the requested spiders in a single CrawlerProcess."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument(
+        "spiders", nargs="+", help="Spiders to run, e.g. ufcstats:crawl_fight_pages"
+    )
+    arg_parser.add_argument(
+        "-a",
+        dest="spider_args",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Spider argument passed to every spider",
+    )
+    arg_parser.add_argument(
+        "-s",
+        dest="settings",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Setting applied to every spider",
+    )
+    arg_parser.add_argument(
+        "--jobdir",
+        help="Directory to keep each spider's JOBDIR in, so a stopped run resumes",
+    )
+    args = arg_parser.parse_args(argv)
+
+    spider_args: Dict[str, Any] = parse_key_values(args.spider_args)
+    setting_overrides = parse_key_values(args.settings)
+
+    process = CrawlerProcess(Settings(setting_overrides))
+    for crawler in create_crawlers(
+        parse_spider_names(args.spiders), spider_args, setting_overrides, args.jobdir
+    ):
+        process.crawl(crawler, **spider_args)
+
+    process.start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""Compressed archive of every raw ufcstats.com page and fightodds.io GraphQL response.
+
+Unlike the HTTP cache, which keeps the latest copy of a page as several
+uncompressed files, the archive keeps every distinct version of each
+response, for replaying parsers and auditing changes to the sites. Bodies are
+stored once per SHA-256 hash, compressed with zstd when the optional
+zstandard package is installed (pip install ".[archive]") and gzip otherwise,
+as objects/<hash[:2]>/<hash>.zst or .gz. An SQLite index maps each request,
+a URL or a GraphQL operation and its variables, to the hashes of the bodies
+it returned and when each was first and last fetched.
+
+    python src/response_archive.py archive list --url-pattern fight-details
+
+"""
+
+import argparse
+from dataclasses import dataclass
+import gzip
+import hashlib
+import importlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import sys
+from time import time
+from types import ModuleType
+from typing import Iterator, List, Optional, Tuple
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse, Response, TextResponse
+from scrapy.statscollectors import StatsCollector
+
+# Optional, installed with the archive extra
+zstandard: Optional[ModuleType]
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:
+    zstandard = None
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    operation_name TEXT NOT NULL DEFAULT '',
+    variables TEXT NOT NULL DEFAULT '',
+    status INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    first_fetched_at REAL NOT NULL,
+    last_fetched_at REAL NOT NULL,
+    UNIQUE (url, operation_name, variables, body_hash)
+);
+CREATE INDEX IF NOT EXISTS responses_latest
+    ON responses (url, operation_name, variables, last_fetched_at);
+"""
+INDEX_FILE_NAME = "index.db"
+OBJECTS_DIR_NAME = "objects"
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 9
+
+
+def compress_body(body: bytes) -> Tuple[bytes, str]:
+    """Compress a response body with zstd if installed, or gzip.
+
+    Args:
+        body (bytes): The body to compress.
+
+    Returns:
+        Tuple[bytes, str]: The compressed body and its file extension.
+
+    """
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        compressed_body: bytes = compressor.compress(body)
+        return compressed_body, ".zst"
+
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), ".gz"
+
+
+def decompress_body(data: bytes) -> bytes:
+    """Decompress a zstd or gzip compressed body, or return an uncompressed one.
+
+    Raises:
+        RuntimeError: If the body is zstd compressed and zstandard is not
+            installed.
+
+    """
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Reading zstd compressed bodies needs zstandard")
+        body: bytes = zstandard.ZstdDecompressor().decompress(data)
+        return body
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+
+    return data
+
+
+def get_request_key(request: Request) -> Tuple[str, str, str]:
+    """Get the URL, GraphQL operation name and variables identifying a request.
+
+    fightodds.io serves every GraphQL query from one URL, so its requests are
+    told apart by the operation and variables in their JSON body, with the
+    variables serialised with sorted keys. Other requests only have a URL.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        Tuple[str, str, str]: The URL, operation name and variables, the
+            latter two empty for requests that are not GraphQL queries.
+
+    """
+    if request.method != "POST" or not request.body:
+        return request.url, "", ""
+
+    try:
+        query = json.loads(request.body)
+    except ValueError:
+        return request.url, "", ""
+    if not isinstance(query, dict) or "operationName" not in query:
+        return request.url, "", ""
+
+    variables = json.dumps(
+        query.get("variables") or {}, sort_keys=True, separators=(",", ":")
+    )
+    return request.url, query["operationName"], variables
+
+
+@dataclass(frozen=True)
+class ArchivedResponse:
+    """A distinct response body returned for a request.
+
+    Attributes:
+        url (str): URL of the response.
+        operation_name (str): GraphQL operation of the request, or empty.
+        variables (str): JSON GraphQL variables of the request, or empty.
+        status (int): HTTP status of the response.
+        content_type (str): Content-Type header of the response.
+        body_hash (str): SHA-256 hex digest of the uncompressed body.
+        first_fetched_at (float): When the body was first fetched.
+        last_fetched_at (float): When the body was last fetched.
+
+    """
+
+    url: str
+    operation_name: str
+    variables: str
+    status: int
+    content_type: str
+    body_hash: str
+    first_fetched_at: float
+    last_fetched_at: float
+
+    @property
+    def request_body(self) -> bytes:
+        """The JSON body of the GraphQL request, or empty for other requests."""
+        if not self.operation_name:
+            return b""
+
+        query = {
+            "operationName": self.operation_name,
+            "variables": json.loads(self.variables),
+        }
+        return json.dumps(query).encode()
+
+
+class ResponseArchive:
+    """Content-addressed store of response bodies with an SQLite index of requests.
+
+    Args:
+        path (str | Path): Directory of the archive, created if missing.
+
+    Attributes:
+        _connection (sqlite3.Connection): Open connection to the index.
+
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        # Waits for the write lock held by another crawler rather than failing
+        self._connection = sqlite3.connect(self._path / INDEX_FILE_NAME, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(ARCHIVE_SCHEMA)
+
+    def _get_object_path(self, body_hash: str, extension: str) -> Path:
+        return self._path / OBJECTS_DIR_NAME / body_hash[:2] / f"{body_hash}{extension}"
+
+    def _find_object(self, body_hash: str) -> Optional[Path]:
+        for extension in (".zst", ".gz"):
+            path = self._get_object_path(body_hash, extension)
+            if path.exists():
+                return path
+
+        return None
+
+    def store_body(self, body: bytes) -> Tuple[str, bool]:
+        """Store a body unless a body with the same hash is already stored.
+
+        Args:
+            body (bytes): The uncompressed body.
+
+        Returns:
+            Tuple[str, bool]: Hash of the body, and whether it was new.
+
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        if self._find_object(body_hash) is not None:
+            return body_hash, False
+
+        compressed_body, extension = compress_body(body)
+        path = self._get_object_path(body_hash, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name, so readers never see a partial object
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_bytes(compressed_body)
+        os.replace(temporary_path, path)
+
+        return body_hash, True
+
+    def add(
+        self, request: Request, response: Response, fetched_at: Optional[float] = None
+    ) -> bool:
+        """Archive a response, recording when its body was fetched for the request.
+
+        Args:
+            request (Request): The request the response was fetched for.
+            response (Response): The downloaded response.
+            fetched_at (Optional[float]): When the response was fetched, now
+                by default.
+
+        Returns:
+            bool: True if the body was not stored before.
+
+        """
+        fetched_at = time() if fetched_at is None else fetched_at
+        body_hash, is_new = self.store_body(response.body)
+        url, operation_name, variables = get_request_key(request)
+        content_type = (response.headers.get(b"Content-Type") or b"").decode("latin-1")
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO responses (url, operation_name, variables, status, "
+                "content_type, body_hash, first_fetched_at, last_fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url, operation_name, variables, body_hash) DO UPDATE SET "
+                "last_fetched_at = MAX(last_fetched_at, excluded.last_fetched_at), "
+                "first_fetched_at = MIN(first_fetched_at, excluded.first_fetched_at)",
+                (
+                    url,
+                    operation_name,
+                    variables,
+                    response.status,
+                    content_type,
+                    body_hash,
+                    fetched_at,
+                    fetched_at,
+                ),
+            )
+
+        return is_new
+
+    def get_latest(
+        self, url_pattern: Optional[str] = None
+    ) -> Iterator[ArchivedResponse]:
+        """Iterate over the most recently fetched response of every request.
+
+        Args:
+            url_pattern (Optional[str]): Only responses whose URL contains it.
+
+        """
+        rows = self._connection.execute(
+            "SELECT url, operation_name, variables, status, content_type, body_hash, "
+            "first_fetched_at, MAX(last_fetched_at) FROM responses WHERE instr(url, ?) "
+            "GROUP BY url, operation_name, variables ORDER BY url, operation_name, "
+            "variables",
+            (url_pattern or "",),
+        ).fetchall()
+        for row in rows:
+            yield ArchivedResponse(*row)
+
+    def get_history(
+        self, url: str, operation_name: str = "", variables: str = ""
+    ) -> List[ArchivedResponse]:
+        """Get every distinct response of a request, first fetched first."""
+        rows = self._connection.execute(
+            "SELECT url, operation_name, variables, status, content_type, body_hash, "
+            "first_fetched_at, last_fetched_at FROM responses WHERE url = ? "
+            "AND operation_name = ? AND variables = ? ORDER BY first_fetched_at",
+            (url, operation_name, variables),
+        ).fetchall()
+
+        return [ArchivedResponse(*row) for row in rows]
+
+    def get_object_path(self, body_hash: str) -> Path:
+        """Get the path of a stored body, which decompress_body decompresses.
+
+        Raises:
+            KeyError: If no body with the hash is stored.
+
+        """
+        path = self._find_object(body_hash)
+        if path is None:
+            raise KeyError(f"No body with hash {body_hash} in {self._path}")
+
+        return path
+
+    def get_body(self, body_hash: str) -> bytes:
+        """Get a stored body, uncompressed."""
+        return decompress_body(self.get_object_path(body_hash).read_bytes())
+
+    def load_response(self, archived_response: ArchivedResponse) -> Response:
+        """Rebuild the response to a request from the archive, e.g. to parse it."""
+        response_class = (
+            HtmlResponse if "html" in archived_response.content_type else TextResponse
+        )
+        return response_class(
+            url=archived_response.url,
+            status=archived_response.status,
+            headers={"Content-Type": archived_response.content_type},
+            body=self.get_body(archived_response.body_hash),
+            encoding="utf-8",
+            request=Request(
+                archived_response.url,
+                method="POST" if archived_response.operation_name else "GET",
+                body=archived_response.request_body,
+            ),
+        )
+
+    def close(self) -> None:
+        """Close the index."""
+        self._connection.close()
+
+
+class ResponseArchiveMiddleware:
+    """Downloader middleware archiving every successful response downloaded.
+
+    Enabled with the RESPONSE_ARCHIVE_ENABLED setting, archiving to
+    RESPONSE_ARCHIVE_DIR. Responses served from the HTTP cache were archived
+    when they were downloaded, so are skipped.
+    """
+
+    def __init__(self, path: str, stats: Optional[StatsCollector]):
+        self._path = path
+        self._stats = stats
+        self._archive: Optional[ResponseArchive] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ResponseArchiveMiddleware":
+        """Create the middleware if the archive is enabled."""
+        if not crawler.settings.getbool("RESPONSE_ARCHIVE_ENABLED"):
+            raise NotConfigured
+
+        middleware = cls(crawler.settings.get("RESPONSE_ARCHIVE_DIR"), crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        """Archive the response if it was downloaded successfully."""
+        if response.status != 200 or "cached" in response.flags:
+            return response
+
+        if self._archive is None:
+            self._archive = ResponseArchive(self._path)
+        if self._archive.add(request, response):
+            stat = "response_archive/stored"
+        else:
+            stat = "response_archive/deduplicated"
+        if self._stats is not None:
+            self._stats.inc_value(stat, spider=spider)
+
+        return response
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the archive."""
+        if self._archive is not None:
+            self._archive.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """List the latest archived responses, or write an archived body to stdout."""
+    arg_parser = argparse.ArgumentParser(description=main.__doc__)
+    arg_parser.add_argument("archive_dir", type=Path, help="Directory of the archive")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="List the latest responses")
+    list_parser.add_argument("--url-pattern", help="Only URLs containing the pattern")
+    cat_parser = subparsers.add_parser("cat", help="Write a body to stdout")
+    cat_parser.add_argument("body_hash", help="Hash of the body")
+    args = arg_parser.parse_args(argv)
+
+    archive = ResponseArchive(args.archive_dir)
+    try:
+        if args.command == "list":
+            for archived_response in archive.get_latest(args.url_pattern):
+                print(
+                    f"{archived_response.last_fetched_at:.0f} "
+                    f"{archived_response.body_hash} {archived_response.url} "
+                    f"{archived_response.operation_name} {archived_response.variables}"
+                )
+        else:
+            sys.stdout.buffer.write(archive.get_body(args.body_hash))
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 """Defines dataclass for parsed Event output."""
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
 class Event:
-    """Dataclass for general UFC event attributes."""
+    """Dataclass for general UFC event attributes.
+
+    Events parsed from the events listing have fights set to None, as the
+    fights are only listed on the event page.
+    """
 
     scraped_at: str
     event_id: str
@@ -16,4 +21,4 @@ class Event:
     city: str
     state: str
     country: str
-    fights: str
+    fights: Optional[str]
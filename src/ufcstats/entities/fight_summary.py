@@ -0,0 +1,38 @@
+"""Defines dataclass for parsed FightSummary output."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class FightSummary:
+    """Dataclass for the result and headline stats of a UFC fight.
+
+    Parsed from a fight's row on its event page, so it is keyed by the same
+    fight_id as Fight. Methods are abbreviated as on the event page, e.g.
+    "U-DEC" or "KO/TKO", with any detail such as "Punch" in
+    finish_method_details.
+    """
+
+    scraped_at: str
+    fight_id: str
+    event_id: str
+    url: str
+    fighter_1_id: str
+    fighter_2_id: str
+    fighter_1_outcome: str
+    fighter_2_outcome: str
+    fighter_1_knockdowns: int
+    fighter_2_knockdowns: int
+    fighter_1_significant_strikes_landed: int
+    fighter_2_significant_strikes_landed: int
+    fighter_1_takedowns_landed: int
+    fighter_2_takedowns_landed: int
+    fighter_1_submissions_attempted: int
+    fighter_2_submissions_attempted: int
+    weight_class: str
+    title_bout: bool
+    finish_method: str
+    finish_method_details: str
+    finish_round: int
+    finish_time_minute: int
+    finish_time_second: int
@@ -0,0 +1,163 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse, TextResponse
+from scrapy.settings import Settings
+
+from response_archive import (
+    decompress_body,
+    get_request_key,
+    ResponseArchive,
+    ResponseArchiveMiddleware,
+)
+from tests import FIGHT_ODDS_RESPONSE_VALID_PATH, FIGHT_RESPONSE_VALID_PATH
+
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+FIGHTODDS_URL = "https://api.fightodds.io/gql"
+
+
+def fight_response(body: bytes) -> HtmlResponse:
+    return HtmlResponse(
+        url=FIGHT_URL,
+        request=Request(FIGHT_URL),
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        body=body,
+    )
+
+
+def graphql_request(variables: dict) -> Request:
+    return Request(
+        FIGHTODDS_URL,
+        method="POST",
+        body=json.dumps({"operationName": "FightOddsQuery", "variables": variables}),
+    )
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> ResponseArchive:
+    return ResponseArchive(tmp_path / "archive")
+
+
+def test_archive_stores_identical_bodies_once(
+    archive: ResponseArchive, tmp_path: Path
+) -> None:
+    body = FIGHT_RESPONSE_VALID_PATH.read_bytes()
+    response = fight_response(body)
+
+    assert archive.add(response.request, response, fetched_at=1.0)  # type: ignore[arg-type]
+    assert not archive.add(response.request, response, fetched_at=2.0)  # type: ignore[arg-type]
+
+    objects = list((tmp_path / "archive" / "objects").glob("*/*"))
+    assert len(objects) == 1
+    assert objects[0].stat().st_size < len(body) / 3
+    history = archive.get_history(FIGHT_URL)
+    assert len(history) == 1
+    assert (history[0].first_fetched_at, history[0].last_fetched_at) == (1.0, 2.0)
+    assert archive.get_body(history[0].body_hash) == body
+
+
+def test_archive_keeps_every_version_of_a_page(archive: ResponseArchive) -> None:
+    for fetched_at, body in enumerate([b"<html>v1</html>", b"<html>v2</html>"]):
+        response = fight_response(body)
+        archive.add(response.request, response, fetched_at=fetched_at)  # type: ignore[arg-type]
+
+    history = archive.get_history(FIGHT_URL)
+    latest = list(archive.get_latest())
+
+    assert [archive.get_body(version.body_hash) for version in history] == [
+        b"<html>v1</html>",
+        b"<html>v2</html>",
+    ]
+    assert len(latest) == 1
+    assert archive.get_body(latest[0].body_hash) == b"<html>v2</html>"
+
+
+def test_get_request_key_identifies_graphql_queries() -> None:
+    assert get_request_key(Request(FIGHT_URL)) == (FIGHT_URL, "", "")
+    assert get_request_key(graphql_request({"b": 1, "a": "x"})) == (
+        FIGHTODDS_URL,
+        "FightOddsQuery",
+        '{"a":"x","b":1}',
+    )
+
+
+def test_archive_loads_graphql_response(archive: ResponseArchive) -> None:
+    request = graphql_request({"fightSlug": "jones-vs-aspinall-66300"})
+    body = FIGHT_ODDS_RESPONSE_VALID_PATH.read_bytes()
+    response = TextResponse(
+        url=FIGHTODDS_URL,
+        request=request,
+        headers={"Content-Type": "application/json"},
+        body=body,
+    )
+    archive.add(request, response)
+
+    archived_response = next(archive.get_latest("fightodds"))
+    loaded_response = archive.load_response(archived_response)
+
+    assert archived_response.operation_name == "FightOddsQuery"
+    assert isinstance(loaded_response, TextResponse)
+    assert not isinstance(loaded_response, HtmlResponse)
+    assert loaded_response.body == body
+    assert get_request_key(loaded_response.request) == get_request_key(request)  # type: ignore[arg-type]
+
+
+def test_decompress_body_reads_gzip_and_uncompressed_bodies() -> None:
+    assert decompress_body(gzip.compress(b"<html></html>")) == b"<html></html>"
+    assert decompress_body(b"<html></html>") == b"<html></html>"
+
+
+def create_middleware(
+    tmp_path: Path, mocker: MockerFixture, enabled: bool = True
+) -> ResponseArchiveMiddleware:
+    settings = Settings(
+        {
+            "RESPONSE_ARCHIVE_ENABLED": enabled,
+            "RESPONSE_ARCHIVE_DIR": str(tmp_path / "archive"),
+        }
+    )
+    crawler = Crawler(Spider, settings)
+    crawler.stats = mocker.Mock()
+
+    return ResponseArchiveMiddleware.from_crawler(crawler)
+
+
+def test_middleware_archives_downloaded_responses_only(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    middleware = create_middleware(tmp_path, mocker)
+    spider = Spider(name="crawl_fight_pages")
+    response = fight_response(b"<html></html>")
+    cached_response = fight_response(b"<html>cached</html>").replace(flags=["cached"])
+    error_response = fight_response(b"<html>error</html>").replace(status=500)
+
+    for archived in [response, response, cached_response, error_response]:
+        assert (
+            middleware.process_response(archived.request, archived, spider)  # type: ignore[arg-type]
+            is archived
+        )
+    middleware.spider_closed(spider)
+
+    archive = ResponseArchive(tmp_path / "archive")
+    assert [
+        archive.get_body(version.body_hash) for version in archive.get_latest()
+    ] == [b"<html></html>"]
+    middleware._stats.inc_value.assert_any_call(  # type: ignore[attr-defined]
+        "response_archive/stored", spider=spider
+    )
+    middleware._stats.inc_value.assert_any_call(  # type: ignore[attr-defined]
+        "response_archive/deduplicated", spider=spider
+    )
+
+
+def test_middleware_not_configured_when_disabled(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    with pytest.raises(NotConfigured):
+        create_middleware(tmp_path, mocker, enabled=False)
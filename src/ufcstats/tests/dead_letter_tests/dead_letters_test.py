@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Spider
+from scrapy.http import HtmlResponse
+
+from ufcstats.dead_letters import DeadLetterStore, reparse_dead_letters
+from ufcstats.entity_feeds import EntityFeedWriter
+from ufcstats.middlewares import DeadLetterMiddleware
+from ufcstats.parser_pool import run_page_parser
+from ufcstats.spiders.fight_pages import parse_fight_page
+from tests import FIGHT_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+
+
+@pytest.fixture
+def dead_letter_path(tmp_path: Path) -> Path:
+    return tmp_path / "dead_letters.db"
+
+
+@pytest.fixture
+def broken_fight_response() -> HtmlResponse:
+    return HtmlResponse(url=FIGHT_URL, body=b"<html><body></body></html>")
+
+
+def store_failure(
+    dead_letter_path: Path,
+    response: HtmlResponse,
+    mocker: MockerFixture,
+) -> DeadLetterMiddleware:
+    middleware = DeadLetterMiddleware(str(dead_letter_path), mocker.Mock())
+    with pytest.raises(ValueError) as exception_info:
+        run_page_parser(parse_fight_page, response)
+    middleware.process_spider_exception(
+        response, exception_info.value, Spider(name="crawl_fight_pages")
+    )
+    middleware.spider_closed(Spider(name="crawl_fight_pages"))
+
+    return middleware
+
+
+def test_run_page_parser_records_failing_parser(
+    broken_fight_response: HtmlResponse,
+) -> None:
+    with pytest.raises(ValueError) as exception_info:
+        run_page_parser(parse_fight_page, broken_fight_response)
+
+    assert (
+        exception_info.value.page_parser  # type: ignore[attr-defined]
+        == "ufcstats.spiders.fight_pages.parse_fight_page"
+    )
+    assert exception_info.value.parser_class == "FightStatParser"  # type: ignore[attr-defined]
+
+
+def test_dead_letter_middleware_stores_failed_page(
+    dead_letter_path: Path,
+    broken_fight_response: HtmlResponse,
+    mocker: MockerFixture,
+) -> None:
+    store_failure(dead_letter_path, broken_fight_response, mocker)
+
+    dead_letters = list(DeadLetterStore(dead_letter_path).get_all())
+
+    assert len(dead_letters) == 1
+    assert dead_letters[0].url == FIGHT_URL
+    assert dead_letters[0].body == broken_fight_response.body
+    assert dead_letters[0].parser_class == "FightStatParser"
+    assert "ValueError: No result" in dead_letters[0].traceback
+
+
+def test_dead_letter_middleware_ignores_other_exceptions(
+    dead_letter_path: Path, mocker: MockerFixture
+) -> None:
+    middleware = DeadLetterMiddleware(str(dead_letter_path), mocker.Mock())
+
+    middleware.process_spider_exception(
+        HtmlResponse(url=FIGHT_URL, body=b""),
+        ValueError("Not raised by a parser"),
+        Spider(name="crawl_fight_pages"),
+    )
+
+    assert not dead_letter_path.exists()
+
+
+def test_reparse_dead_letters(
+    dead_letter_path: Path,
+    broken_fight_response: HtmlResponse,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    store_failure(dead_letter_path, broken_fight_response, mocker)
+    store = DeadLetterStore(dead_letter_path)
+    # Stands in for a parser fix, as the stored page now parses
+    fight_response = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH)
+    with store._connection:
+        store._connection.execute(
+            "UPDATE dead_letters SET body = ?", (fight_response.body,)
+        )
+
+    with EntityFeedWriter(tmp_path / "data", "jsonl") as feed_writer:
+        assert reparse_dead_letters(store, feed_writer) == (1, 0)
+
+    fights = (tmp_path / "data" / "fights.jsonl").read_text().splitlines()
+    assert len(fights) == 1
+    assert json.loads(fights[0])["url"] == FIGHT_URL
+    assert (tmp_path / "data" / "fight_stats.jsonl").exists()
+    assert list(store.get_all()) == []
+
+
+def test_reparse_dead_letters_keeps_failing_pages(
+    dead_letter_path: Path,
+    broken_fight_response: HtmlResponse,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    store_failure(dead_letter_path, broken_fight_response, mocker)
+    store = DeadLetterStore(dead_letter_path)
+
+    with EntityFeedWriter(tmp_path / "data", "jsonl") as feed_writer:
+        assert reparse_dead_letters(store, feed_writer) == (0, 1)
+
+    assert len(list(store.get_all())) == 1
+    assert not (tmp_path / "data").exists()
@@ -0,0 +1,204 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+
+from ufcstats.frontier import CrawlFrontier, FrontierScheduler
+from ufcstats.middlewares import FrontierDownloaderMiddleware, FrontierMiddleware
+
+EVENTS_URL = "http://www.ufcstats.com/statistics/events/completed?page=all"
+EVENT_URL = "http://www.ufcstats.com/event-details/e955046551f8c7dd"
+
+
+class FrontierSpider(Spider):
+    name = "crawl_fights"
+
+    def parse(self, response: Any, **kwargs: Any) -> Any:
+        pass
+
+    def parse_event(self, response: Any) -> Any:
+        pass
+
+
+def create_scheduler(
+    frontier_path: Path, mocker: MockerFixture, claim_timeout: float = 600
+) -> FrontierScheduler:
+    settings = Settings(
+        {
+            "SCHEDULER": "ufcstats.frontier.FrontierScheduler",
+            "FRONTIER_DB": str(frontier_path),
+            "FRONTIER_CLAIM_TIMEOUT_SECS": claim_timeout,
+            "FRONTIER_MAX_ATTEMPTS": 2,
+        }
+    )
+    crawler = Crawler(FrontierSpider, settings)
+    crawler.stats = mocker.Mock()
+    crawler.request_fingerprinter = mocker.Mock(
+        fingerprint=lambda request: request.url.encode()
+    )
+    scheduler = FrontierScheduler.from_crawler(crawler)
+    scheduler.open(FrontierSpider())
+
+    return scheduler
+
+
+@pytest.fixture
+def frontier_path(tmp_path: Path) -> Path:
+    return tmp_path / "frontier.db"
+
+
+def test_frontier_schedulers_share_seen_requests(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    schedulers = [create_scheduler(frontier_path, mocker) for _ in range(2)]
+
+    assert schedulers[0].enqueue_request(Request(EVENTS_URL, dont_filter=True))
+    assert not schedulers[1].enqueue_request(Request(EVENTS_URL, dont_filter=True))
+
+    claimed_requests = [scheduler.next_request() for scheduler in schedulers]
+
+    assert [request.url if request else None for request in claimed_requests] == [
+        EVENTS_URL,
+        None,
+    ]
+    # The second worker waits for the first, which may find more requests
+    assert schedulers[1].has_pending_requests()
+    assert not schedulers[0].has_pending_requests()
+
+
+def test_frontier_scheduler_claims_highest_priority_with_callback(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    spider = FrontierSpider()
+    scheduler.open(spider)
+    scheduler.enqueue_request(Request(EVENTS_URL, priority=0))
+    scheduler.enqueue_request(
+        Request(EVENT_URL, callback=spider.parse_event, priority=1)
+    )
+
+    request = scheduler.next_request()
+
+    assert request is not None
+    assert request.url == EVENT_URL
+    assert request.callback == spider.parse_event
+
+
+def test_frontier_scheduler_requeues_retried_requests(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    scheduler.enqueue_request(Request(EVENT_URL))
+    request = scheduler.next_request()
+    assert request is not None
+
+    assert scheduler.enqueue_request(request.copy())
+    assert scheduler.next_request() is not None
+
+
+def test_frontier_reclaims_expired_claims(frontier_path: Path) -> None:
+    frontier = CrawlFrontier(frontier_path)
+    frontier.add("crawl_fights", "fingerprint", EVENT_URL, 0, b"request")
+
+    assert frontier.claim("crawl_fights", "worker_1", 600, 2) is not None
+    assert frontier.claim("crawl_fights", "worker_2", 600, 2) is None
+    assert frontier.claim("crawl_fights", "worker_2", -1, 2) is not None
+    # Failed once claimed as many times as allowed
+    assert frontier.claim("crawl_fights", "worker_3", -1, 2) is None
+    assert frontier.count("crawl_fights", "failed") == 1
+
+
+def test_frontier_releases_claims_on_close(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    scheduler.enqueue_request(Request(EVENT_URL))
+    assert scheduler.next_request() is not None
+
+    scheduler.close("shutdown")
+
+    frontier = CrawlFrontier(frontier_path)
+    assert frontier.count("crawl_fights", "pending") == 1
+
+
+@pytest.mark.parametrize("parsed_ok, status", [(True, "done"), (False, "failed")])
+def test_frontier_middleware_marks_requests(
+    frontier_path: Path, mocker: MockerFixture, parsed_ok: bool, status: str
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    scheduler.enqueue_request(Request(EVENT_URL))
+    request = scheduler.next_request()
+    assert request is not None
+    frontier = CrawlFrontier(frontier_path)
+    middleware = FrontierMiddleware(frontier, mocker.Mock())
+    response = HtmlResponse(url=EVENT_URL, body=b"", request=request)
+    spider = FrontierSpider()
+
+    def callback_output() -> Any:
+        if not parsed_ok:
+            raise ValueError(f"No result for query on {EVENT_URL}")
+        yield {"event_url": EVENT_URL}
+
+    if parsed_ok:
+        list(middleware.process_spider_output(response, callback_output(), spider))
+    else:
+        with pytest.raises(ValueError):
+            list(middleware.process_spider_output(response, callback_output(), spider))
+
+    assert frontier.count("crawl_fights", status) == 1
+    assert not scheduler.has_pending_requests()
+
+
+def test_frontier_fails_requests_released_too_often(frontier_path: Path) -> None:
+    frontier = CrawlFrontier(frontier_path)
+    frontier.add("crawl_fights", "fingerprint", EVENT_URL, 0, b"request")
+
+    for worker in ["worker_1", "worker_2"]:
+        assert frontier.claim("crawl_fights", worker, 600, 2) is not None
+        frontier.release("crawl_fights", worker)
+
+    assert frontier.claim("crawl_fights", "worker_3", 600, 2) is None
+    assert frontier.count("crawl_fights", "failed") == 1
+
+
+def test_frontier_downloader_middleware_marks_failed_downloads(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    scheduler.enqueue_request(Request(EVENT_URL))
+    request = scheduler.next_request()
+    assert request is not None
+    frontier = CrawlFrontier(frontier_path)
+    middleware = FrontierDownloaderMiddleware(frontier, mocker.Mock())
+
+    middleware.process_exception(request, TimeoutError(), FrontierSpider())
+
+    assert frontier.count("crawl_fights", "failed") == 1
+    assert not scheduler.has_pending_requests()
+
+
+def test_frontier_middleware_marks_dropped_requests(
+    frontier_path: Path, mocker: MockerFixture
+) -> None:
+    scheduler = create_scheduler(frontier_path, mocker)
+    scheduler.enqueue_request(Request(EVENTS_URL))
+    scheduler.enqueue_request(Request(EVENT_URL))
+    events_request = scheduler.next_request()
+    event_request = scheduler.next_request()
+    assert events_request is not None and event_request is not None
+    frontier = CrawlFrontier(frontier_path)
+    middleware = FrontierMiddleware(frontier, mocker.Mock())
+    spider = FrontierSpider()
+    response = HtmlResponse(url=EVENTS_URL, body=b"", request=events_request)
+    list(middleware.process_spider_output(response, iter([]), spider))
+
+    middleware.request_dropped(events_request, spider)
+    middleware.request_dropped(event_request, spider)
+
+    assert frontier.count("crawl_fights", "done") == 1
+    assert frontier.count("crawl_fights", "failed") == 1
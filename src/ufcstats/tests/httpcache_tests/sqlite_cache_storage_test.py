@@ -0,0 +1,150 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+from scrapy.http import HtmlResponse, TextResponse
+from scrapy.settings import Settings
+from scrapy.utils.request import RequestFingerprinter
+
+from ufcstats.httpcache import (
+    CacheEntry,
+    iter_filesystem_cache,
+    main,
+    SqliteCacheStorage,
+    SqliteHttpCache,
+)
+from tests import FIGHT_RESPONSE_VALID_PATH
+
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+FIGHTODDS_URL = "https://api.fightodds.io/gql"
+
+
+def open_spider(storage: object, settings: Settings, name: str) -> Spider:
+    spider = Spider(name=name)
+    spider.crawler = Crawler(Spider, settings)
+    spider.crawler.request_fingerprinter = RequestFingerprinter()
+    storage.open_spider(spider)  # type: ignore[attr-defined]
+
+    return spider
+
+
+def fight_response() -> HtmlResponse:
+    return HtmlResponse(
+        url=FIGHT_URL,
+        request=Request(FIGHT_URL),
+        headers={"Content-Type": "text/html; charset=utf-8", "ETag": '"abc"'},
+        body=FIGHT_RESPONSE_VALID_PATH.read_bytes(),
+    )
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    return Settings({"HTTPCACHE_DIR": str(tmp_path / "httpcache")})
+
+
+def test_sqlite_cache_storage_serves_stored_response(
+    settings: Settings, tmp_path: Path
+) -> None:
+    storage = SqliteCacheStorage(settings)
+    spider = open_spider(storage, settings, "crawl_fight_pages")
+    response = fight_response()
+
+    assert storage.retrieve_response(spider, response.request) is None  # type: ignore[arg-type]
+    storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+    cached_response = storage.retrieve_response(spider, Request(FIGHT_URL))
+    storage.close_spider(spider)
+
+    assert isinstance(cached_response, HtmlResponse)
+    assert cached_response.url == FIGHT_URL
+    assert cached_response.status == 200
+    assert cached_response.body == response.body
+    assert cached_response.headers[b"ETag"] == b'"abc"'
+    assert list(tmp_path.iterdir()) == [tmp_path / "httpcache.db"]
+    assert (tmp_path / "httpcache.db").stat().st_size < len(response.body)
+
+
+def test_sqlite_cache_storage_shares_requests_across_spiders(
+    settings: Settings,
+) -> None:
+    storage = SqliteCacheStorage(settings)
+    spider = open_spider(storage, settings, "crawl_fight_betting_odds")
+    request = Request(FIGHTODDS_URL, method="POST", body=b'{"operationName": "A"}')
+    response = TextResponse(
+        url=FIGHTODDS_URL,
+        request=request,
+        headers={"Content-Type": "application/json"},
+        body=b'{"data": {}}',
+    )
+    storage.store_response(spider, request, response)
+
+    other_query = request.replace(body=b'{"operationName": "B"}')
+    other_spider = Spider(name="crawl_fighters")
+
+    assert storage.retrieve_response(spider, request).body == b'{"data": {}}'  # type: ignore[union-attr]
+    assert storage.retrieve_response(spider, other_query) is None
+    assert storage.retrieve_response(other_spider, request).body == b'{"data": {}}'  # type: ignore[union-attr]
+
+    # The same request stored by another spider replaces the cached response
+    storage.store_response(other_spider, request, response.replace(body=b"{}"))
+    cache = SqliteHttpCache(storage.path)
+    assert [(e.spider, e.body) for e in cache.get_all()] == [("crawl_fighters", b"{}")]
+
+
+def test_sqlite_cache_storage_expires_responses(settings: Settings) -> None:
+    settings.set("HTTPCACHE_EXPIRATION_SECS", 60)
+    storage = SqliteCacheStorage(settings)
+    spider = open_spider(storage, settings, "crawl_fighters")
+    response = fight_response()
+    storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+    assert storage.retrieve_response(spider, Request(FIGHT_URL)) is not None
+
+    cache = SqliteHttpCache(storage.path)
+    entry = next(cache.get_all())
+    with cache._connection:
+        cache._connection.execute("UPDATE responses SET timestamp = timestamp - 3600")
+
+    assert storage.retrieve_response(spider, Request(FIGHT_URL)) is None
+    storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+    # An older response never replaces a newer one
+    cache.put(replace(entry, body=b"old", timestamp=0))
+    assert storage.retrieve_response(spider, Request(FIGHT_URL)).body == response.body  # type: ignore[union-attr]
+
+
+def test_import_and_export_filesystem_cache(tmp_path: Path) -> None:
+    filesystem_settings = Settings({"HTTPCACHE_DIR": str(tmp_path / "filesystem")})
+    filesystem_storage = FilesystemCacheStorage(filesystem_settings)
+    spider = open_spider(filesystem_storage, filesystem_settings, "crawl_fights")
+    response = fight_response()
+    filesystem_storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+    db_path = tmp_path / "httpcache.db"
+
+    main(["import", str(tmp_path / "filesystem"), "--db", str(db_path)])
+    main(["export", str(tmp_path / "exported"), "--db", str(db_path)])
+    main(["export", str(tmp_path / "copy.db"), "--db", str(db_path)])
+
+    imported_entries = list(iter_filesystem_cache(tmp_path / "filesystem"))
+    exported_entries = list(iter_filesystem_cache(tmp_path / "exported"))
+    copied_entries = list(SqliteHttpCache(tmp_path / "copy.db").get_all())
+    assert len(imported_entries) == 1
+    assert exported_entries == imported_entries
+    assert copied_entries == imported_entries
+    assert exported_entries[0].body == response.body
+    assert exported_entries[0].spider == "crawl_fights"
+
+
+def test_sqlite_cache_get_all_without_bodies(tmp_path: Path) -> None:
+    cache = SqliteHttpCache(tmp_path / "httpcache.db")
+    entry = CacheEntry(
+        "crawl_fights", "ab12", FIGHT_URL, "GET", b"", 200, FIGHT_URL, b"", b"body", 1.0
+    )
+    cache.put(entry)
+
+    assert list(cache.get_all("crawl_fights")) == [entry]
+    assert list(cache.get_all("crawl_fighters")) == []
+    assert [e.body for e in cache.get_all(with_bodies=False)] == [b""]
+    assert cache.get_body("ab12") == b"body"
+    with pytest.raises(KeyError):
+        cache.get_body("cd34")
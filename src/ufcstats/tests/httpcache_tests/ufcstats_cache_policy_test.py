@@ -0,0 +1,174 @@
+from email.utils import formatdate
+from pathlib import Path
+import re
+from time import time
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+from scrapy.utils.request import RequestFingerprinter
+
+from ufcstats.httpcache import (
+    COMPLETED_PAGE_HEADER,
+    SqliteCacheStorage,
+    UfcStatsCachePolicy,
+)
+from tests import EVENT_RESPONSE_VALID_PATH, FIGHT_RESPONSE_VALID_PATH
+
+TTL_SECS = 3600
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+EVENT_URL = "http://www.ufcstats.com/event-details/e955046551f8c7dd"
+TEN_YEARS_SECS = 10 * 365 * 24 * 3600
+
+
+@pytest.fixture
+def cache_policy() -> UfcStatsCachePolicy:
+    settings = Settings(
+        {
+            "HTTPCACHE_PERMANENT_URL_PATTERNS": ["event-details", "fight-details"],
+            "HTTPCACHE_TTL_SECS": TTL_SECS,
+        }
+    )
+
+    return UfcStatsCachePolicy(settings)
+
+
+def cached_response(
+    url: str, age_secs: int, body: bytes = b"", **headers: str
+) -> HtmlResponse:
+    date = formatdate(time() - age_secs, usegmt=True)
+
+    return HtmlResponse(url=url, body=body, headers={"Date": date, **headers})
+
+
+def upcoming_fight_body() -> bytes:
+    # A fight that has not taken place yet shows no outcome for its fighters
+    return re.sub(
+        rb"(b-fight-details__person-status[^>]*>)\s*[WLD]\s*<",
+        rb"\1<",
+        FIGHT_RESPONSE_VALID_PATH.read_bytes(),
+    )
+
+
+def ongoing_event_body() -> bytes:
+    # Fights later on the card are flagged as next while the event is on
+    return EVENT_RESPONSE_VALID_PATH.read_bytes().replace(
+        b'b-flag__text">win', b'b-flag__text">next', 1
+    )
+
+
+@pytest.mark.parametrize(
+    "url, path",
+    [(FIGHT_URL, FIGHT_RESPONSE_VALID_PATH), (EVENT_URL, EVENT_RESPONSE_VALID_PATH)],
+)
+def test_cache_policy_completed_pages_are_permanent(
+    cache_policy: UfcStatsCachePolicy, url: str, path: Path
+) -> None:
+    request = Request(url)
+    response = cached_response(url, TEN_YEARS_SECS, path.read_bytes())
+
+    assert cache_policy.should_cache_response(response, request)
+    assert cache_policy.is_cached_response_fresh(response, request)
+
+
+@pytest.mark.parametrize(
+    "url, body",
+    [(FIGHT_URL, upcoming_fight_body()), (EVENT_URL, ongoing_event_body())],
+    ids=["upcoming_fight", "ongoing_event"],
+)
+def test_cache_policy_pages_without_results_expire(
+    cache_policy: UfcStatsCachePolicy, url: str, body: bytes
+) -> None:
+    fresh_response = cached_response(url, TTL_SECS // 2, body)
+    stale_response = cached_response(url, TTL_SECS * 2, body)
+
+    assert cache_policy.should_cache_response(stale_response, Request(url))
+    assert cache_policy.is_cached_response_fresh(fresh_response, Request(url))
+    assert not cache_policy.is_cached_response_fresh(stale_response, Request(url))
+
+
+def test_cache_policy_reads_completed_flag_without_parsing(
+    cache_policy: UfcStatsCachePolicy, mocker: MockerFixture
+) -> None:
+    request = Request(FIGHT_URL)
+    response = cached_response(
+        FIGHT_URL, TEN_YEARS_SECS, FIGHT_RESPONSE_VALID_PATH.read_bytes()
+    )
+    cache_policy.should_cache_response(response, request)
+    assert response.headers[COMPLETED_PAGE_HEADER] == b"1"
+
+    is_completed_page = mocker.patch("ufcstats.httpcache.is_completed_page")
+    assert cache_policy.is_cached_response_fresh(response, request)
+    is_completed_page.assert_not_called()
+
+
+def test_cache_policy_revalidates_pages_cached_without_flag(
+    cache_policy: UfcStatsCachePolicy,
+) -> None:
+    response = cached_response(
+        FIGHT_URL, TTL_SECS * 2, FIGHT_RESPONSE_VALID_PATH.read_bytes()
+    )
+
+    assert not cache_policy.is_cached_response_fresh(response, Request(FIGHT_URL))
+
+
+def test_cache_policy_completed_flag_is_stored_with_response(
+    cache_policy: UfcStatsCachePolicy, tmp_path: Path
+) -> None:
+    settings = Settings({"HTTPCACHE_DIR": str(tmp_path / "httpcache")})
+    storage = SqliteCacheStorage(settings)
+    spider = Spider(name="crawl_fight_pages")
+    spider.crawler = Crawler(Spider, settings)
+    spider.crawler.request_fingerprinter = RequestFingerprinter()
+    storage.open_spider(spider)
+    request = Request(FIGHT_URL)
+    response = cached_response(FIGHT_URL, 0, FIGHT_RESPONSE_VALID_PATH.read_bytes())
+
+    assert cache_policy.should_cache_response(response, request)
+    storage.store_response(spider, request, response)
+    stored_response = storage.retrieve_response(spider, request)
+    storage.close_spider(spider)
+
+    assert stored_response is not None
+    assert stored_response.headers[COMPLETED_PAGE_HEADER] == b"1"
+
+
+def test_cache_policy_fighter_pages_fresh_within_ttl(
+    cache_policy: UfcStatsCachePolicy,
+) -> None:
+    url = "http://www.ufcstats.com/fighter-details/d661ce4da776fc20"
+    request = Request(url)
+    response = cached_response(url, age_secs=TTL_SECS // 2)
+
+    assert cache_policy.is_cached_response_fresh(response, request)
+
+
+def test_cache_policy_fighter_pages_revalidated_after_ttl(
+    cache_policy: UfcStatsCachePolicy,
+) -> None:
+    url = "http://www.ufcstats.com/fighter-details/d661ce4da776fc20"
+    request = Request(url)
+    response = cached_response(
+        url,
+        age_secs=TTL_SECS * 2,
+        ETag='"abc123"',
+        **{"Last-Modified": "Sat, 26 Oct 2024 00:00:00 GMT"},
+    )
+
+    assert not cache_policy.is_cached_response_fresh(response, request)
+    assert request.headers[b"If-None-Match"] == b'"abc123"'
+    assert request.headers[b"If-Modified-Since"] == b"Sat, 26 Oct 2024 00:00:00 GMT"
+
+    not_modified = HtmlResponse(url=url, status=304, body=b"")
+    assert cache_policy.is_cached_response_valid(response, not_modified, request)
+
+
+def test_cache_policy_errors_not_cached(cache_policy: UfcStatsCachePolicy) -> None:
+    url = "http://www.ufcstats.com/statistics/events/completed?page=all"
+    request = Request(url)
+    response = HtmlResponse(url=url, status=500, body=b"")
+
+    assert not cache_policy.should_cache_response(response, request)
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.http import HtmlResponse
+
+from ufcstats.crawl_state import CrawlStateStore
+from ufcstats.middlewares import FighterChangeDetectionMiddleware, skip_unchanged_page
+from tests import FIGHTER_RESPONSE_VALID_PATH
+
+FIGHTER_URL = "http://www.ufcstats.com/fighter-details/07f72a2a7591b409"
+
+
+@pytest.fixture
+def spider() -> Spider:
+    return Spider(name="crawl_fighters")
+
+
+@pytest.fixture
+def middleware(
+    tmp_path: Path, mocker: MockerFixture
+) -> FighterChangeDetectionMiddleware:
+    state_store = CrawlStateStore(tmp_path / "crawl_state.db")
+    return FighterChangeDetectionMiddleware(state_store, mocker.Mock())
+
+
+def fetch_fighter(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider, body: bytes
+) -> HtmlResponse:
+    request = Request(FIGHTER_URL, callback=spider.parse)
+    response = HtmlResponse(url=FIGHTER_URL, body=body)
+
+    processed_response = middleware.process_response(request, response, spider)
+    if processed_response.request is None:
+        processed_response.request = request
+
+    return processed_response
+
+
+def scrape_fighter(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider, body: bytes
+) -> HtmlResponse:
+    response = fetch_fighter(middleware, spider, body)
+    if response.request.callback is not skip_unchanged_page:  # type: ignore[union-attr]
+        middleware.item_scraped({"fighter_url": FIGHTER_URL}, response, spider)
+
+    return response
+
+
+def test_unchanged_fighter_page_is_skipped(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider
+) -> None:
+    body = FIGHTER_RESPONSE_VALID_PATH.read_bytes()
+
+    first_response = scrape_fighter(middleware, spider, body)
+    second_response = scrape_fighter(middleware, spider, body)
+
+    assert first_response.request.callback == spider.parse  # type: ignore[union-attr]
+    assert (
+        second_response.request.callback  # type: ignore[union-attr]
+        is skip_unchanged_page
+    )
+    assert second_response.body == body
+    assert skip_unchanged_page(second_response) == []
+    middleware._stats.inc_value.assert_any_call(  # type: ignore[attr-defined]
+        "change_detection/changed", spider=spider
+    )
+    middleware._stats.inc_value.assert_any_call(  # type: ignore[attr-defined]
+        "change_detection/unchanged", spider=spider
+    )
+
+
+def test_changed_fighter_page_is_parsed(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider
+) -> None:
+    body = FIGHTER_RESPONSE_VALID_PATH.read_bytes()
+    changed_body = body.replace(b"Record: 27-9-0", b"Record: 28-9-0")
+    assert changed_body != body
+    scrape_fighter(middleware, spider, body)
+
+    response = scrape_fighter(middleware, spider, changed_body)
+
+    assert response.request.callback == spider.parse  # type: ignore[union-attr]
+
+
+def test_changes_outside_content_section_are_ignored(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider
+) -> None:
+    body = FIGHTER_RESPONSE_VALID_PATH.read_bytes()
+    scrape_fighter(middleware, spider, body)
+    changed_footer_body = body.replace(b"</footer>", b"x</footer>")
+
+    response = fetch_fighter(middleware, spider, changed_footer_body)
+
+    assert response.request.callback is skip_unchanged_page  # type: ignore[union-attr]
+
+
+def test_fighter_page_is_parsed_again_until_scraped(
+    middleware: FighterChangeDetectionMiddleware, spider: Spider
+) -> None:
+    body = FIGHTER_RESPONSE_VALID_PATH.read_bytes()
+    fetch_fighter(middleware, spider, body)
+
+    response = fetch_fighter(middleware, spider, body)
+
+    assert response.request.callback == spider.parse  # type: ignore[union-attr]
@@ -0,0 +1,121 @@
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.http import HtmlResponse
+
+from ufcstats.crawl_state import CrawlStateStore
+from ufcstats.middlewares import IncrementalCrawlMiddleware
+from tests import FIGHT_RESPONSE_VALID_PATH
+
+EVENT_URL = "http://www.ufcstats.com/event-details/e955046551f8c7dd"
+FIGHT_URLS = [
+    "http://www.ufcstats.com/fight-details/ebf7cea27b83c432",
+    "http://www.ufcstats.com/fight-details/b8bf186f884678ea",
+]
+
+
+@pytest.fixture
+def spider() -> Spider:
+    return Spider(name="crawl_fights")
+
+
+@pytest.fixture
+def state_store(tmp_path: Path) -> CrawlStateStore:
+    return CrawlStateStore(tmp_path / "crawl_state.db")
+
+
+@pytest.fixture
+def middleware(
+    state_store: CrawlStateStore, mocker: MockerFixture
+) -> IncrementalCrawlMiddleware:
+    return IncrementalCrawlMiddleware(state_store, mocker.Mock())
+
+
+def crawl_event(
+    middleware: IncrementalCrawlMiddleware, spider: Spider
+) -> list[Request]:
+    event_response = HtmlResponse(url=EVENT_URL, body=b"")
+    fight_requests = [Request(url) for url in FIGHT_URLS]
+
+    return list(
+        middleware.process_spider_output(event_response, fight_requests, spider)
+    )
+
+
+def crawl_fight(
+    middleware: IncrementalCrawlMiddleware, spider: Spider, url: str, parsed_ok: bool
+) -> None:
+    fight_response = HtmlResponse(url=url, body=b"")
+
+    def fight_callback_output() -> Iterator[dict[str, str]]:
+        if not parsed_ok:
+            raise ValueError(f"No result for query on {url}")
+        yield {"fight_url": url}
+
+    with pytest.raises(ValueError) if not parsed_ok else nullcontext():
+        list(
+            middleware.process_spider_output(
+                fight_response, fight_callback_output(), spider
+            )
+        )
+
+
+def test_incremental_crawl_skips_complete_event(
+    middleware: IncrementalCrawlMiddleware,
+    state_store: CrawlStateStore,
+    spider: Spider,
+) -> None:
+    crawl_event(middleware, spider)
+    for fight_url in FIGHT_URLS:
+        crawl_fight(middleware, spider, fight_url, parsed_ok=True)
+
+    assert state_store.is_complete(spider.name, EVENT_URL)
+    assert not state_store.is_complete("crawl_fight_stats", EVENT_URL)
+
+
+def test_incremental_crawl_refetches_failed_fights(
+    middleware: IncrementalCrawlMiddleware,
+    state_store: CrawlStateStore,
+    spider: Spider,
+) -> None:
+    crawl_event(middleware, spider)
+    crawl_fight(middleware, spider, FIGHT_URLS[0], parsed_ok=True)
+    crawl_fight(middleware, spider, FIGHT_URLS[1], parsed_ok=False)
+
+    assert not state_store.is_complete(spider.name, EVENT_URL)
+
+    requests = crawl_event(middleware, spider)
+
+    assert [request.url for request in requests] == [FIGHT_URLS[1]]
+
+
+def test_incremental_crawl_refreshes_fighters_from_new_fights(
+    middleware: IncrementalCrawlMiddleware,
+    state_store: CrawlStateStore,
+) -> None:
+    fighters_spider = Spider(name="crawl_fighters")
+    fighter_url = "http://www.ufcstats.com/fighter-details/d661ce4da776fc20"
+    unchanged_fighter_url = "http://www.ufcstats.com/fighter-details/1338e2c7480bdf9e"
+    for url in fighter_url, unchanged_fighter_url:
+        state_store.record_fetched(fighters_spider.name, url, parsed_ok=True)
+
+    with open(FIGHT_RESPONSE_VALID_PATH, "rb") as file:
+        fight_response = HtmlResponse(url=FIGHT_URLS[0], body=file.read())
+    list(middleware.process_spider_output(fight_response, [], Spider("crawl_fights")))
+
+    listing_response = HtmlResponse(
+        url="http://ufcstats.com/statistics/fighters?char=a&page=all", body=b""
+    )
+    fighter_requests = [Request(fighter_url), Request(unchanged_fighter_url)]
+    requests = list(
+        middleware.process_spider_output(
+            listing_response, fighter_requests, fighters_spider
+        )
+    )
+
+    assert [request.url for request in requests] == [fighter_url]
+    assert requests[0].headers[b"Cache-Control"] == b"no-cache"
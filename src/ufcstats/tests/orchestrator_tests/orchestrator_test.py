@@ -0,0 +1,251 @@
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.http import HtmlResponse, Response
+from twisted.internet import defer
+
+from orchestrator import (
+    create_crawlers,
+    get_job_dir,
+    get_project_settings,
+    parse_key_values,
+    parse_spider_names,
+    SharedDownloadMiddleware,
+)
+
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+HOST_DELAY = 2.0
+# The spiders make orchestrate runs, see ORCHESTRATE_LIST in the Makefile
+ORCHESTRATE_LIST = [
+    ("ufcstats", "crawl_fight_pages"),
+    ("ufcstats", "crawl_fighters"),
+    ("fightodds", "crawl_events"),
+    ("fightodds", "crawl_fight_betting_odds"),
+    ("fightodds", "crawl_fighters"),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state() -> Iterator[None]:
+    yield
+    SharedDownloadMiddleware._in_flight.clear()
+    SharedDownloadMiddleware._downloaded.clear()
+    SharedDownloadMiddleware._next_download_at.clear()
+
+
+@pytest.fixture
+def middleware(mocker: MockerFixture) -> SharedDownloadMiddleware:
+    middleware = SharedDownloadMiddleware(HOST_DELAY)
+    mocker.patch.object(
+        middleware, "_wait_for_host", side_effect=lambda request: defer.succeed(None)
+    )
+    return middleware
+
+
+def get_result(deferred: defer.Deferred[Optional[Response]]) -> List[Any]:
+    results: List[Any] = []
+    deferred.addCallback(results.append)
+
+    return results
+
+
+def test_parse_spider_names() -> None:
+    assert parse_spider_names(
+        ["ufcstats:crawl_fight_pages", "fightodds:crawl_fighters"]
+    ) == [("ufcstats", "crawl_fight_pages"), ("fightodds", "crawl_fighters")]
+    for spider_name in ["crawl_fighters", "other:crawl_fighters", "ufcstats:"]:
+        with pytest.raises(ValueError):
+            parse_spider_names([spider_name])
+
+
+def test_parse_key_values() -> None:
+    assert parse_key_values(["output_format=csv", "A=b=c"]) == {
+        "output_format": "csv",
+        "A": "b=c",
+    }
+
+
+def test_get_job_dir() -> None:
+    assert get_job_dir(None, "ufcstats", "crawl_fighters") is None
+    assert get_job_dir("jobs", "ufcstats", "crawl_fighters") == str(
+        Path("jobs") / "ufcstats_crawl_fighters"
+    )
+
+
+def test_get_project_settings_adds_shared_download_middleware() -> None:
+    settings = get_project_settings("ufcstats", {"DOWNLOAD_DELAY": "5"})
+
+    downloader_middlewares = settings.getdict("DOWNLOADER_MIDDLEWARES")
+    assert downloader_middlewares["orchestrator.SharedDownloadMiddleware"] == 950
+    assert "response_archive.ResponseArchiveMiddleware" in downloader_middlewares
+    assert settings.getfloat("DOWNLOAD_DELAY") == 5
+    assert settings.getfloat("ORCHESTRATOR_HOST_DELAY") == 5
+
+
+def test_every_orchestrated_crawler_has_a_feed() -> None:
+    spider_args = {"output_format": "csv"}
+    crawlers = create_crawlers(ORCHESTRATE_LIST, spider_args, {})
+
+    feeds = []
+    for (project, name), crawler in zip(ORCHESTRATE_LIST, crawlers):
+        crawler.spidercls.from_crawler(crawler, **spider_args)
+        crawler_feeds = crawler.settings.getdict("FEEDS")
+        assert crawler_feeds, f"{project}:{name} has no feed"
+        assert all(feed["format"] == "csv" for feed in crawler_feeds.values())
+        feeds.extend(crawler_feeds)
+
+    assert "data/fightodds_crawl_fighters.csv" in feeds
+    assert "data/ufcstats_crawl_fighters.csv" in feeds
+    # crawl_fight_pages writes a feed per entity type instead
+    assert "data/fights.csv" in feeds
+    assert len(feeds) == len(set(feeds))
+
+
+def test_resumed_crawlers_append_to_their_feeds() -> None:
+    (crawler,) = create_crawlers(
+        [("fightodds", "crawl_fighters")], {"output_format": "jsonl"}, {}, "jobs"
+    )
+
+    assert crawler.settings.getdict("FEEDS") == {
+        "data/fightodds_crawl_fighters.jsonl": {"format": "jsonl", "overwrite": False}
+    }
+    assert crawler.settings.get("JOBDIR") == str(
+        Path("jobs") / "fightodds_crawl_fighters"
+    )
+
+
+def test_crawlers_without_output_format_have_no_feed() -> None:
+    (crawler,) = create_crawlers([("ufcstats", "crawl_fighters")], {}, {})
+
+    assert crawler.settings.getdict("FEEDS") == {}
+
+
+def test_in_flight_request_reuses_download(
+    middleware: SharedDownloadMiddleware,
+) -> None:
+    spider = Spider(name="crawl_fights")
+    request = Request(FIGHT_URL)
+    other_request = Request(FIGHT_URL)
+
+    assert get_result(middleware.process_request(request, spider)) == [None]
+    shared_response = get_result(middleware.process_request(other_request, spider))
+    assert shared_response == []
+
+    response = HtmlResponse(url=FIGHT_URL, body=b"<html>fight</html>")
+    assert middleware.process_response(request, response, spider) is response
+
+    assert shared_response[0].body == b"<html>fight</html>"
+    assert shared_response[0].request is other_request
+
+
+def test_downloaded_request_reuses_response(
+    middleware: SharedDownloadMiddleware,
+) -> None:
+    spider = Spider(name="crawl_fights")
+    request = Request(FIGHT_URL)
+    middleware.process_request(request, spider)
+    response = HtmlResponse(url=FIGHT_URL, body=b"<html>fight</html>")
+    middleware.process_response(request, response, spider)
+
+    other_request = Request(FIGHT_URL)
+    (downloaded_response,) = get_result(
+        middleware.process_request(other_request, Spider(name="crawl_fight_stats"))
+    )
+
+    assert isinstance(downloaded_response, HtmlResponse)
+    assert downloaded_response.body == response.body
+    assert downloaded_response.request is other_request
+    assert middleware._wait_for_host.call_count == 1  # type: ignore[attr-defined]
+
+
+def test_least_recently_used_responses_are_dropped(
+    mocker: MockerFixture,
+) -> None:
+    middleware = SharedDownloadMiddleware(HOST_DELAY, max_downloaded=2)
+    mocker.patch.object(
+        middleware, "_wait_for_host", side_effect=lambda request: defer.succeed(None)
+    )
+    spider = Spider(name="crawl_fights")
+    urls = [f"{FIGHT_URL}{index}" for index in range(3)]
+    for url in urls[:2]:
+        request = Request(url)
+        middleware.process_request(request, spider)
+        middleware.process_response(
+            request, HtmlResponse(url=url, body=b"<html></html>"), spider
+        )
+    # Reusing the first response makes the second the least recently used
+    middleware.process_request(Request(urls[0]), spider)
+    request = Request(urls[2])
+    middleware.process_request(request, spider)
+    middleware.process_response(
+        request, HtmlResponse(url=urls[2], body=b"<html></html>"), spider
+    )
+
+    assert len(SharedDownloadMiddleware._downloaded) == 2
+    assert get_result(middleware.process_request(Request(urls[1]), spider)) == [None]
+    (reused_response,) = get_result(
+        middleware.process_request(Request(urls[0]), spider)
+    )
+    assert reused_response.url == urls[0]
+
+
+@pytest.mark.parametrize(
+    "refetch_request",
+    [
+        Request(FIGHT_URL, dont_filter=True),
+        Request(FIGHT_URL, headers={"Cache-Control": "no-cache"}),
+    ],
+    ids=["dont_filter", "no_cache"],
+)
+def test_refetch_request_downloads_again(
+    middleware: SharedDownloadMiddleware, refetch_request: Request
+) -> None:
+    spider = Spider(name="crawl_live_event")
+    request = Request(FIGHT_URL)
+    middleware.process_request(request, spider)
+    middleware.process_response(
+        request, HtmlResponse(url=FIGHT_URL, body=b"<html></html>"), spider
+    )
+
+    assert get_result(middleware.process_request(refetch_request, spider)) == [None]
+    assert middleware._wait_for_host.call_count == 2  # type: ignore[attr-defined]
+
+
+def test_failed_responses_are_not_reused(
+    middleware: SharedDownloadMiddleware,
+) -> None:
+    spider = Spider(name="crawl_fights")
+    request = Request(FIGHT_URL)
+    other_request = Request(FIGHT_URL)
+    middleware.process_request(request, spider)
+    waiting = get_result(middleware.process_request(other_request, spider))
+
+    middleware.process_exception(request, TimeoutError(), spider)
+
+    # The waiting request is downloaded by its own spider
+    assert waiting == [None]
+    middleware.process_request(request, spider)
+    middleware.process_response(
+        request, HtmlResponse(url=FIGHT_URL, status=500, body=b""), spider
+    )
+    assert get_result(middleware.process_request(Request(FIGHT_URL), spider)) == [None]
+
+
+def test_downloads_from_one_host_are_spaced(mocker: MockerFixture) -> None:
+    mocker.patch("orchestrator.time", return_value=100.0)
+    defer_later = mocker.patch("orchestrator.deferLater")
+    middleware = SharedDownloadMiddleware(HOST_DELAY)
+    spider = Spider(name="crawl_fights")
+
+    for url in [
+        FIGHT_URL,
+        "http://ufcstats.com/fight-details/b8bf186f884678ea",
+        "https://api.fightodds.io/gql",
+    ]:
+        middleware.process_request(Request(url), spider)
+
+    delays = [call.args[1] for call in defer_later.call_args_list]
+    assert delays == [0.0, HOST_DELAY, 0.0]
@@ -0,0 +1,100 @@
+from concurrent.futures import Future
+from dataclasses import replace
+from threading import Event
+from typing import Any, Iterator, List
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy.http import HtmlResponse
+from twisted.internet import defer
+
+from ufcstats.parser_pool import ParserPool
+from ufcstats.spiders.fight_pages import parse_fight_page
+from tests import FIGHT_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+
+
+@pytest.fixture
+def fight_response() -> HtmlResponse:
+    return load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH)
+
+
+@pytest.fixture
+def parser_pool() -> Iterator[ParserPool]:
+    parser_pool = ParserPool(max_workers=1)
+    yield parser_pool
+    parser_pool.close()
+
+
+def without_scraped_at(entities: List[Any]) -> List[Any]:
+    return [replace(entity, scraped_at="") for entity in entities]
+
+
+def test_parser_pool_disabled_parses_inline(fight_response: HtmlResponse) -> None:
+    parser_pool = ParserPool(max_workers=None)
+    parsed: List[List[Any]] = []
+
+    parser_pool.parse(parse_fight_page, fight_response).addCallback(parsed.append)
+
+    assert not parser_pool.enabled
+    assert without_scraped_at(parsed[0]) == without_scraped_at(
+        parse_fight_page(fight_response)
+    )
+
+
+def test_parser_pool_parses_in_worker_process(
+    parser_pool: ParserPool, fight_response: HtmlResponse, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "twisted.internet.reactor.callFromThread",
+        side_effect=lambda function, *args: function(*args),
+    )
+    fired = Event()
+    parsed: List[List[Any]] = []
+
+    deferred = parser_pool.parse(parse_fight_page, fight_response)
+    deferred.addCallback(parsed.append)
+    deferred.addBoth(lambda _: fired.set())
+
+    assert fired.wait(timeout=60)
+    assert without_scraped_at(parsed[0]) == without_scraped_at(
+        parse_fight_page(fight_response)
+    )
+
+
+def test_parser_pool_propagates_parse_errors(
+    parser_pool: ParserPool, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "twisted.internet.reactor.callFromThread",
+        side_effect=lambda function, *args: function(*args),
+    )
+    fired = Event()
+    failures: List[Any] = []
+    empty_response = HtmlResponse(
+        url="http://www.ufcstats.com/fight-details/empty", body=b"<html></html>"
+    )
+
+    deferred = parser_pool.parse(parse_fight_page, empty_response)
+    deferred.addErrback(failures.append)
+    deferred.addBoth(lambda _: fired.set())
+
+    assert fired.wait(timeout=60)
+    assert failures[0].check(ValueError)
+
+
+def test_parser_pool_cancelled_parse_fails(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "twisted.internet.reactor.callFromThread",
+        side_effect=lambda function, *args: function(*args),
+    )
+    failures: List[Any] = []
+    # As cancelled by close while waiting for a worker
+    cancelled: Future[List[Any]] = Future()
+    cancelled.cancel()
+    deferred: defer.Deferred[List[Any]] = defer.Deferred()
+    deferred.addErrback(failures.append)
+
+    ParserPool._fire_from_thread(deferred, cancelled)
+
+    assert failures[0].check(defer.CancelledError)
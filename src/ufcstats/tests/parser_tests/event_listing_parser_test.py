@@ -0,0 +1,71 @@
+from freezegun import freeze_time
+import pytest
+
+from entities.event import Event
+from ufcstats.parsers.event_listing_parser import EventListingParser
+from tests import EVENTS_LISTING_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+from utils import get_uuid_string
+
+
+@pytest.fixture
+def event_listing_parser_valid() -> EventListingParser:
+    events_listing_response = load_html_response_from_file(
+        EVENTS_LISTING_RESPONSE_VALID_PATH
+    )
+
+    return EventListingParser(events_listing_response)
+
+
+@freeze_time("2000-01-01 00:00:00", tz_offset=0)
+def test_event_listing_parse_response_valid(
+    event_listing_parser_valid: EventListingParser,
+) -> None:
+    parsed_response = list(event_listing_parser_valid.parse_response())
+
+    expected_response = [
+        Event(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            event_id=get_uuid_string(
+                "http://ufcstats.com/event-details/ad99fa5325519169"
+            ),
+            url="http://www.ufcstats.com/event-details/ad99fa5325519169",
+            name="UFC 309: Jones vs. Miocic",
+            date="November 16, 2024",
+            date_formatted="2024-11-16",
+            city="New York City",
+            state="New York",
+            country="USA",
+            fights=None,
+        ),
+        Event(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            event_id=get_uuid_string(
+                "http://ufcstats.com/event-details/6e380a4d73ab4f0e"
+            ),
+            url="http://www.ufcstats.com/event-details/6e380a4d73ab4f0e",
+            name="UFC Fight Night: Moreno vs. Albazi",
+            date="November 02, 2024",
+            date_formatted="2024-11-02",
+            city="Edmonton",
+            state="",
+            country="Canada",
+            fights=None,
+        ),
+        Event(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            event_id=get_uuid_string(
+                "http://ufcstats.com/event-details/e955046551f8c7dd"
+            ),
+            url="http://www.ufcstats.com/event-details/e955046551f8c7dd",
+            name="UFC 308: Topuria vs. Holloway",
+            date="October 26, 2024",
+            date_formatted="2024-10-26",
+            city="Abu Dhabi",
+            state="Abu Dhabi",
+            country="United Arab Emirates",
+            fights=None,
+        ),
+    ]
+
+    assert parsed_response == expected_response
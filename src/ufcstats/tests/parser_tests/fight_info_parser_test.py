@@ -1,5 +1,6 @@
 from freezegun import freeze_time
 import pytest
+from scrapy.http import HtmlResponse
 
 from entities import Fight
 from ufc_scraper.parsers.fight_info_parser import FightInfoParser
@@ -55,3 +56,46 @@ def test_fight_info_parse_response_valid(
     )
 
     assert parsed_response == expected_response
+
+
+def test_fight_info_label_values_valid(
+    fight_info_parser_valid: FightInfoParser,
+) -> None:
+    assert fight_info_parser_valid._label_values == {
+        "Method": "Decision - Unanimous",
+        "Round": "5",
+        "Time": "5:00",
+        "Time format": "5 Rnd (5-5-5-5-5)",
+        "Referee": "Mike Beltran",
+    }
+
+
+def test_fight_info_label_values_finish_details() -> None:
+    body = b"""
+    <p class="b-fight-details__text">
+      <i class="b-fight-details__text-item_first">
+        <i class="b-fight-details__label">Method:</i>
+        <i style="font-style: normal"> KO/TKO </i>
+      </i>
+      <i class="b-fight-details__text-item">
+        <i class="b-fight-details__label">Round:</i> 2
+      </i>
+    </p>
+    <p class="b-fight-details__text">
+      <i class="b-fight-details__text-item_first">
+        <i class="b-fight-details__label">Details:</i>
+      </i>
+      Punch to Head At Distance
+    </p>
+    """
+    response = HtmlResponse(url="http://www.ufcstats.com/fight-details/1", body=body)
+    fight_info_parser = FightInfoParser(response)
+
+    assert fight_info_parser._label_values == {
+        "Method": "KO/TKO",
+        "Round": "2",
+        "Details": "Punch to Head At Distance",
+    }
+
+    with pytest.raises(ValueError, match="No value for label Referee"):
+        fight_info_parser._get_referee()
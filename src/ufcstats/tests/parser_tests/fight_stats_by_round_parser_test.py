@@ -1,9 +1,13 @@
 from freezegun import freeze_time
 import pytest
+from pytest_mock import MockerFixture
 
 
 from entities import FightStatsByRound
-from ufc_scraper.parsers.fight_stat_parser import FightStatByRoundParser
+from ufc_scraper.parsers.fight_stat_parser import (
+    FightStatByRoundParser,
+    FightStatParser,
+)
 from tests import FIGHT_RESPONSE_VALID_PATH
 from tests.utils import load_html_response_from_file
 from utils import get_uuid_string
@@ -359,3 +363,23 @@ def test_fight_stat_by_round_parse_response_valid(
     assert parsed_response[7] == expected_response_fighter_2_round_3
     assert parsed_response[8] == expected_response_fighter_2_round_4
     assert parsed_response[9] == expected_response_fighter_2_round_5
+
+
+@freeze_time("2000-01-01 00:00:00", tz_offset=0)
+def test_fight_stat_by_round_parse_response_shared_tables(
+    mocker: MockerFixture,
+) -> None:
+    fight_response = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH)
+    expected_response = list(FightStatByRoundParser(fight_response).parse_response())
+
+    fight_stat_parser = FightStatParser(fight_response)
+    list(fight_stat_parser.parse_response())
+    get_fight_stat_values_spy = mocker.spy(FightStatParser, "_get_fight_stat_values")
+
+    fight_stat_by_round_parser = FightStatByRoundParser(
+        fight_response, fight_stat_parser.fight_stat_tables
+    )
+    parsed_response = list(fight_stat_by_round_parser.parse_response())
+
+    assert get_fight_stat_values_spy.call_count == 0
+    assert parsed_response == expected_response
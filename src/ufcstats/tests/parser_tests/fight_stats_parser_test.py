@@ -1,8 +1,12 @@
 from freezegun import freeze_time
 import pytest
+from pytest_mock import MockerFixture
 
 from entities import FightStats
-from ufc_scraper.parsers.fight_stat_parser import FightStatParser
+from ufc_scraper.parsers.fight_stat_parser import (
+    FightStatParser,
+    decode_fight_stat_values,
+)
 from tests import FIGHT_RESPONSE_VALID_PATH
 from tests.utils import load_html_response_from_file
 from utils import get_uuid_string
@@ -95,3 +99,63 @@ def test_fight_stat_parse_response_valid(
 
     assert parsed_response[0] == expected_response_fighter_1
     assert parsed_response[1] == expected_response_fighter_2
+
+
+def test_fight_stat_parse_response_extracts_tables_once(
+    fight_stat_parser_valid: FightStatParser,
+    mocker: MockerFixture,
+) -> None:
+    get_fight_stat_values_spy = mocker.spy(
+        fight_stat_parser_valid, "_get_fight_stat_values"
+    )
+
+    list(fight_stat_parser_valid.parse_response())
+    fight_stat_parser_valid.fight_stat_tables
+
+    assert get_fight_stat_values_spy.call_count == 1
+
+
+def test_decode_fight_stat_values_valid() -> None:
+    headers = ["KD", "Sig. str.", "Sig. str. %", "Ctrl", "Td_round_1"]
+    fighter_stat_values = {
+        "fighter_1": ["1", "12 of 30", "40%", "3:05", "2 of 8"],
+        "fighter_2": ["0", "9 of 25", "36%", "0:00", "0 of 0"],
+    }
+
+    decoded_stats = decode_fight_stat_values(
+        headers, fighter_stat_values, "http://ufcstats.com/fight-details/1"
+    )
+
+    assert decoded_stats == {
+        "fighter_1": {
+            "KD": (1,),
+            "Sig. str.": (12, 30),
+            "Ctrl": (3, 5),
+            "Td_round_1": (2, 8),
+        },
+        "fighter_2": {
+            "KD": (0,),
+            "Sig. str.": (9, 25),
+            "Ctrl": (0, 0),
+            "Td_round_1": (0, 0),
+        },
+    }
+
+
+def test_decode_fight_stat_values_reports_every_invalid_cell() -> None:
+    headers = ["KD", "Sig. str.", "Ctrl_round_2"]
+    fighter_stat_values = {
+        "fighter_1": ["1", "12 of", "3:05"],
+        "fighter_2": ["0", "9 of 25", "--"],
+    }
+
+    with pytest.raises(ValueError) as exc_info:
+        decode_fight_stat_values(
+            headers, fighter_stat_values, "http://ufcstats.com/fight-details/1"
+        )
+
+    assert str(exc_info.value) == (
+        "Invalid fight stat values on http://ufcstats.com/fight-details/1: "
+        "Sig. str.='12 of' (fighter fighter_1), "
+        "Ctrl_round_2='--' (fighter fighter_2)"
+    )
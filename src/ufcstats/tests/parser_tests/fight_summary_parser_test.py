@@ -0,0 +1,114 @@
+from freezegun import freeze_time
+import pytest
+from scrapy.http import HtmlResponse
+
+from entities.fight_summary import FightSummary
+from ufcstats.parsers.fight_summary_parser import FightSummaryParser
+from tests import EVENT_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+from utils import get_uuid_string
+
+
+@pytest.fixture
+def event_response() -> HtmlResponse:
+    return load_html_response_from_file(EVENT_RESPONSE_VALID_PATH)
+
+
+@freeze_time("2000-01-01 00:00:00", tz_offset=0)
+def test_fight_summary_parse_response_valid(event_response: HtmlResponse) -> None:
+    parsed_response = list(FightSummaryParser(event_response).parse_response())
+
+    event_id = get_uuid_string("http://ufcstats.com/event_response_valid")
+    expected_main_event = FightSummary(
+        scraped_at="2000-01-01 00:00:00 UTC",
+        fight_id=get_uuid_string("http://ufcstats.com/fight-details/ebf7cea27b83c432"),
+        event_id=event_id,
+        url="http://www.ufcstats.com/fight-details/ebf7cea27b83c432",
+        fighter_1_id=get_uuid_string(
+            "http://ufcstats.com/fighter-details/54f64b5e283b0ce7"
+        ),
+        fighter_2_id=get_uuid_string(
+            "http://ufcstats.com/fighter-details/150ff4cc642270b9"
+        ),
+        fighter_1_outcome="W",
+        fighter_2_outcome="L",
+        fighter_1_knockdowns=1,
+        fighter_2_knockdowns=0,
+        fighter_1_significant_strikes_landed=75,
+        fighter_2_significant_strikes_landed=79,
+        fighter_1_takedowns_landed=2,
+        fighter_2_takedowns_landed=0,
+        fighter_1_submissions_attempted=0,
+        fighter_2_submissions_attempted=0,
+        weight_class="Featherweight",
+        title_bout=True,
+        finish_method="KO/TKO",
+        finish_method_details="Punch",
+        finish_round=3,
+        finish_time_minute=1,
+        finish_time_second=34,
+    )
+
+    assert len(parsed_response) == 13
+    assert parsed_response[0] == expected_main_event
+    assert all(summary.event_id == event_id for summary in parsed_response)
+
+
+def test_fight_summary_parse_response_decision(event_response: HtmlResponse) -> None:
+    decision = list(FightSummaryParser(event_response).parse_response())[2]
+
+    assert decision.weight_class == "Light Heavyweight"
+    assert not decision.title_bout
+    assert decision.finish_method == "U-DEC"
+    assert decision.finish_method_details == ""
+    assert (
+        decision.finish_round,
+        decision.finish_time_minute,
+        decision.finish_time_second,
+    ) == (3, 5, 0)
+
+
+def test_fight_summary_parse_response_no_contest(event_response: HtmlResponse) -> None:
+    no_contest_response = event_response.replace(
+        body=event_response.body.replace(b">win<", b">nc<", 1)
+    )
+
+    no_contest = next(FightSummaryParser(no_contest_response).parse_response())
+
+    assert (no_contest.fighter_1_outcome, no_contest.fighter_2_outcome) == (
+        "NC",
+        "NC",
+    )
+
+
+def test_fight_summary_parse_response_skips_upcoming_fights(
+    event_response: HtmlResponse,
+) -> None:
+    upcoming_response = event_response.replace(
+        body=event_response.body.replace(b">win<", b"><")
+    )
+
+    assert list(FightSummaryParser(upcoming_response).parse_response()) == []
+
+
+def test_fight_summary_parse_response_unknown_outcome(
+    event_response: HtmlResponse,
+) -> None:
+    unknown_response = event_response.replace(
+        body=event_response.body.replace(b">win<", b">tbd<", 1)
+    )
+
+    with pytest.raises(ValueError, match="Unknown fight outcome tbd"):
+        list(FightSummaryParser(unknown_response).parse_response())
+
+
+def test_fight_summary_parse_response_skips_next_fight(
+    event_response: HtmlResponse,
+) -> None:
+    next_fight_response = event_response.replace(
+        body=event_response.body.replace(b">win<", b">next<", 1)
+    )
+
+    parsed_response = list(FightSummaryParser(next_fight_response).parse_response())
+
+    assert len(parsed_response) == 12
@@ -0,0 +1,133 @@
+from freezegun import freeze_time
+import pytest
+
+from entities.fighter import Fighter
+from ufcstats.parsers.fighter_listing_parser import FighterListingParser
+from tests import FIGHTERS_LISTING_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+from utils import get_uuid_string
+
+
+@pytest.fixture
+def fighter_listing_parser_valid() -> FighterListingParser:
+    fighters_listing_response = load_html_response_from_file(
+        FIGHTERS_LISTING_RESPONSE_VALID_PATH
+    )
+
+    return FighterListingParser(fighters_listing_response)
+
+
+@freeze_time("2000-01-01 00:00:00", tz_offset=0)
+def test_fighter_listing_parse_response_valid(
+    fighter_listing_parser_valid: FighterListingParser,
+) -> None:
+    parsed_response = list(fighter_listing_parser_valid.parse_response())
+
+    expected_response = [
+        Fighter(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            fighter_id=get_uuid_string(
+                "http://ufcstats.com/fighter-details/7a4bb1d2e3f5c6a8"
+            ),
+            url="http://ufcstats.com/fighter-details/7a4bb1d2e3f5c6a8",
+            full_name="Robert Whittaker",
+            first_name="Robert",
+            last_names="Whittaker",
+            nickname="The Reaper",
+            height_ft=6,
+            height_in=0,
+            height_cm=182.88,
+            weight_lbs=185,
+            reach_in=73,
+            reach_cm=185,
+            stance="Orthodox",
+            dob=None,
+            dob_formatted=None,
+            record="27-9-0",
+            wins=27,
+            losses=9,
+            draws=0,
+            no_contests=0,
+            fight_ids=None,
+        ),
+        Fighter(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            fighter_id=get_uuid_string(
+                "http://ufcstats.com/fighter-details/1338e2c7480bdf9e"
+            ),
+            url="http://ufcstats.com/fighter-details/1338e2c7480bdf9e",
+            full_name="Ji Yeon Kim",
+            first_name="Ji",
+            last_names="Yeon Kim",
+            nickname="",
+            height_ft=5,
+            height_in=4,
+            height_cm=162.56,
+            weight_lbs=125,
+            reach_in=68,
+            reach_cm=172,
+            stance="Orthodox",
+            dob=None,
+            dob_formatted=None,
+            record="10-7-2",
+            wins=10,
+            losses=7,
+            draws=2,
+            no_contests=0,
+            fight_ids=None,
+        ),
+        Fighter(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            fighter_id=get_uuid_string(
+                "http://ufcstats.com/fighter-details/e1147d3d2cabe1ce"
+            ),
+            url="http://ufcstats.com/fighter-details/e1147d3d2cabe1ce",
+            full_name="Abdul Razak Alhassan",
+            first_name="Abdul",
+            last_names="Razak Alhassan",
+            nickname="Mr. Sonnenschein",
+            height_ft=None,
+            height_in=None,
+            height_cm=None,
+            weight_lbs=170,
+            reach_in=None,
+            reach_cm=None,
+            stance="",
+            dob=None,
+            dob_formatted=None,
+            record="11-6-0",
+            wins=11,
+            losses=6,
+            draws=0,
+            no_contests=0,
+            fight_ids=None,
+        ),
+        Fighter(
+            scraped_at="2000-01-01 00:00:00 UTC",
+            fighter_id=get_uuid_string(
+                "http://ufcstats.com/fighter-details/07f72a2a7591b409"
+            ),
+            url="http://ufcstats.com/fighter-details/07f72a2a7591b409",
+            full_name="Jon Jones",
+            first_name="Jon",
+            last_names="Jones",
+            nickname="Bones",
+            height_ft=6,
+            height_in=4,
+            height_cm=193.04,
+            weight_lbs=248,
+            reach_in=84,
+            reach_cm=213,
+            stance="Orthodox",
+            dob=None,
+            dob_formatted=None,
+            record="28-1-0",
+            wins=28,
+            losses=1,
+            draws=0,
+            no_contests=0,
+            fight_ids=None,
+        ),
+    ]
+
+    assert parsed_response == expected_response
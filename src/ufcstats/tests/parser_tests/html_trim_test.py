@@ -0,0 +1,116 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy.http import HtmlResponse
+
+from ufcstats.parser_pool import run_page_parser
+from ufcstats.parsers.html_trim import set_html_trim, trim_html, trim_response
+from ufcstats.parsers.parser_backends import set_parser_backend
+from ufcstats.spiders.fight_pages import parse_fight_page
+from ufcstats.spiders.fighters import parse_fighter_page
+from tests import (
+    EVENTS_LISTING_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+    FIGHTER_RESPONSE_VALID_PATH,
+)
+from tests.utils import load_html_response_from_file
+
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+FIGHTER_URL = "http://www.ufcstats.com/fighter-details/07f72a2a7591b409"
+PAGES = [
+    (FIGHT_RESPONSE_VALID_PATH, FIGHT_URL, parse_fight_page),
+    (FIGHTER_RESPONSE_VALID_PATH, FIGHTER_URL, parse_fighter_page),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_parser_settings() -> Iterator[None]:
+    yield
+    set_parser_backend("parsel")
+    set_html_trim(False)
+
+
+def load_page(path: Path, url: str) -> HtmlResponse:
+    return load_html_response_from_file(path).replace(url=url)
+
+
+def without_scraped_at(entities: List[Any]) -> List[Any]:
+    return [replace(entity, scraped_at="") for entity in entities]
+
+
+def test_trim_html_drops_markup_outside_content_section() -> None:
+    body = FIGHT_RESPONSE_VALID_PATH.read_bytes()
+
+    trimmed_body = trim_html(body)
+
+    assert len(trimmed_body) < len(body)
+    assert trimmed_body.startswith(
+        b'<html><body><section class="b-statistics__section_details">'
+    )
+    assert b"<head" not in trimmed_body
+    assert b"<footer" not in trimmed_body
+    assert b"b-fight-details__charts" not in trimmed_body
+
+
+def test_trim_html_keeps_pages_without_content_section() -> None:
+    body = EVENTS_LISTING_RESPONSE_VALID_PATH.read_bytes()
+
+    assert trim_html(body) is body
+
+
+def test_trim_html_keeps_pages_without_sections_before_charts() -> None:
+    body = (
+        b'<html><head></head><body><section class="b-statistics__section_details">'
+        b'<div class="b-fight-details__charts"></div></section><footer></footer>'
+        b"</body></html>"
+    )
+
+    assert trim_html(body) is body
+
+
+def test_trim_response_only_trims_fight_and_fighter_pages() -> None:
+    event_response = load_page(
+        FIGHT_RESPONSE_VALID_PATH,
+        "http://www.ufcstats.com/event-details/6e380a4d73ab4f0e",
+    )
+    fight_response = load_page(FIGHT_RESPONSE_VALID_PATH, FIGHT_URL)
+
+    trimmed_response = trim_response(fight_response)
+
+    assert trim_response(event_response) is event_response
+    assert trimmed_response.body == trim_html(fight_response.body)
+    assert trimmed_response.url == fight_response.url
+    assert trimmed_response.encoding == fight_response.encoding
+
+
+@pytest.mark.parametrize("parser_backend", ["parsel", "lxml"])
+@pytest.mark.parametrize("path, url, parse_page", PAGES)
+def test_trimmed_pages_parse_like_whole_pages(
+    parser_backend: str, path: Path, url: str, parse_page: Any
+) -> None:
+    set_parser_backend(parser_backend)
+    response = load_page(path, url)
+
+    assert without_scraped_at(parse_page(trim_response(response))) == (
+        without_scraped_at(parse_page(response))
+    )
+
+
+def test_run_page_parser_trims_pages_when_enabled(mocker: MockerFixture) -> None:
+    response = load_page(FIGHT_RESPONSE_VALID_PATH, FIGHT_URL)
+    parse_page = mocker.Mock(return_value=[])
+    parse_page.__module__ = "tests"
+    parse_page.__qualname__ = "parse_page"
+
+    run_page_parser(parse_page, response)
+    set_html_trim(True)
+    run_page_parser(parse_page, response)
+
+    whole_response, trimmed_response = [
+        call.args[0] for call in parse_page.call_args_list
+    ]
+    assert whole_response is response
+    assert trimmed_response.body == trim_html(response.body)
@@ -0,0 +1,112 @@
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from freezegun import freeze_time
+import pytest
+
+from ufcstats.parsers.base_parser import CssQueries
+from ufcstats.parsers.event_info_parser import EventInfoParser
+from ufcstats.parsers.fight_info_parser import FightInfoParser
+from ufcstats.parsers.fight_stat_parser import FightStatByRoundParser, FightStatParser
+from ufcstats.parsers.fight_summary_parser import FightSummaryParser
+from ufcstats.parsers.fighter_info_parser import FighterInfoParser
+from ufcstats.parsers.parser_backends import (
+    LxmlBackend,
+    ParselBackend,
+    set_parser_backend,
+)
+from tests import (
+    EVENT_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+    FIGHTER_RESPONSE_VALID_PATH,
+)
+from tests.utils import load_html_response_from_file
+
+RESPONSE_PATHS = [
+    EVENT_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+    FIGHTER_RESPONSE_VALID_PATH,
+]
+CSS_QUERIES = {
+    name: query
+    for name, query in asdict(CssQueries()).items()
+    if not name.endswith("_xpath")
+}
+CSS_XPATH_QUERIES = [
+    (CssQueries.judges_query, CssQueries.span_text_xpath),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_parser_backend() -> Iterator[None]:
+    yield
+    set_parser_backend("parsel")
+
+
+@pytest.mark.parametrize("response_path", RESPONSE_PATHS)
+@pytest.mark.parametrize("query", CSS_QUERIES.values(), ids=CSS_QUERIES.keys())
+def test_lxml_backend_matches_parsel_backend(response_path: Path, query: str) -> None:
+    response = load_html_response_from_file(response_path)
+    parsel_backend = ParselBackend(response)
+    lxml_backend = LxmlBackend(response)
+
+    assert lxml_backend.get_all(query) == parsel_backend.get_all(query)
+    assert lxml_backend.get(query) == parsel_backend.get(query)
+
+
+@pytest.mark.parametrize("query, xpath", CSS_XPATH_QUERIES)
+def test_lxml_backend_matches_parsel_backend_with_xpath(query: str, xpath: str) -> None:
+    response = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH)
+    parsel_backend = ParselBackend(response)
+    lxml_backend = LxmlBackend(response)
+
+    assert lxml_backend.get_all(query, xpath) == parsel_backend.get_all(query, xpath)
+    assert lxml_backend.get(query, xpath) == parsel_backend.get(query, xpath)
+
+
+def test_lxml_backend_matches_parsel_backend_elements() -> None:
+    response = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH)
+    query = CssQueries.fight_details_label_query
+
+    assert LxmlBackend(response).get_elements(query) == ParselBackend(
+        response
+    ).get_elements(query)
+
+
+@freeze_time("2000-01-01 00:00:00", tz_offset=0)
+@pytest.mark.parametrize(
+    "response_path, parse",
+    [
+        (EVENT_RESPONSE_VALID_PATH, lambda r: EventInfoParser(r).parse_response()),
+        (FIGHT_RESPONSE_VALID_PATH, lambda r: FightInfoParser(r).parse_response()),
+        (
+            FIGHT_RESPONSE_VALID_PATH,
+            lambda r: list(FightStatParser(r).parse_response()),
+        ),
+        (
+            FIGHT_RESPONSE_VALID_PATH,
+            lambda r: list(FightStatByRoundParser(r).parse_response()),
+        ),
+        (FIGHTER_RESPONSE_VALID_PATH, lambda r: FighterInfoParser(r).parse_response()),
+        (
+            EVENT_RESPONSE_VALID_PATH,
+            lambda r: list(FightSummaryParser(r).parse_response()),
+        ),
+    ],
+)
+def test_parsers_output_same_with_lxml_backend(
+    response_path: Path, parse: Callable[[Any], Any]
+) -> None:
+    response = load_html_response_from_file(response_path)
+    parsel_output = parse(response)
+
+    set_parser_backend("lxml")
+    lxml_output = parse(response)
+
+    assert lxml_output == parsel_output
+
+
+def test_set_parser_backend_unknown() -> None:
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        set_parser_backend("html5lib")
@@ -0,0 +1,204 @@
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+from scrapy.http import HtmlResponse, Response, TextResponse
+from scrapy.settings import Settings
+from scrapy.utils.request import RequestFingerprinter
+
+from ufcstats.entity_feeds import EntityFeedWriter
+from ufcstats.httpcache import SqliteCacheStorage
+from ufcstats.reparse import (
+    FIGHTODDS_ENTITY_FEEDS,
+    iter_archived_pages,
+    iter_cached_pages,
+    parse_stored_page,
+    reparse_pages,
+)
+from ufcstats.spiders.constants import UFCSTATS_ALL_ENTITY_FEEDS
+from response_archive import ResponseArchive
+from tests import (
+    EVENT_RESPONSE_VALID_PATH,
+    FIGHT_ODDS_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+)
+
+EVENT_URL = "http://www.ufcstats.com/event-details/b8e2f10efb6eca85"
+FIGHT_URL = "http://www.ufcstats.com/fight-details/ebf7cea27b83c432"
+EVENTS_LISTING_URL = "http://www.ufcstats.com/statistics/events/completed?page=all"
+FIGHTODDS_URL = "https://api.fightodds.io/gql"
+
+
+def store_responses(
+    cache_dir: Path, spider_name: str, responses: List[Response], gzip: bool = False
+) -> None:
+    settings = Settings({"HTTPCACHE_DIR": str(cache_dir), "HTTPCACHE_GZIP": gzip})
+    spider = Spider(name=spider_name)
+    spider.crawler = Crawler(Spider, settings)
+    spider.crawler.request_fingerprinter = RequestFingerprinter()
+    storage = FilesystemCacheStorage(settings)
+    storage.open_spider(spider)
+    for response in responses:
+        storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+
+
+def html_response(url: str, path: Path, status: int = 200) -> HtmlResponse:
+    return HtmlResponse(
+        url=url, request=Request(url), body=path.read_bytes(), status=status
+    )
+
+
+def fightodds_response(operation_name: str) -> TextResponse:
+    request = Request(
+        FIGHTODDS_URL,
+        method="POST",
+        body=json.dumps({"operationName": operation_name, "variables": {}}),
+    )
+    return TextResponse(
+        url=FIGHTODDS_URL,
+        request=request,
+        body=FIGHT_ODDS_RESPONSE_VALID_PATH.read_bytes(),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    cache_dir = tmp_path / "httpcache"
+    store_responses(
+        cache_dir,
+        "crawl_fights",
+        [
+            html_response(EVENT_URL, EVENT_RESPONSE_VALID_PATH),
+            html_response(FIGHT_URL, FIGHT_RESPONSE_VALID_PATH),
+            html_response(EVENTS_LISTING_URL, EVENT_RESPONSE_VALID_PATH, status=500),
+        ],
+    )
+    store_responses(
+        cache_dir,
+        "crawl_fight_pages",
+        [html_response(EVENT_URL, EVENT_RESPONSE_VALID_PATH)],
+        gzip=True,
+    )
+    store_responses(
+        cache_dir, "crawl_fight_betting_odds", [fightodds_response("FightOddsQuery")]
+    )
+
+    return cache_dir
+
+
+def test_iter_cached_pages_keeps_latest_successful_response(cache_dir: Path) -> None:
+    pages = list(iter_cached_pages(cache_dir))
+
+    assert sorted(page.url for page in pages) == sorted(
+        [EVENT_URL, FIGHT_URL, FIGHTODDS_URL]
+    )
+    event_page = next(page for page in pages if page.url == EVENT_URL)
+    assert event_page.body_path.parent.parent.parent.name == "crawl_fight_pages"
+
+
+def test_iter_cached_pages_of_spider(cache_dir: Path) -> None:
+    pages = list(iter_cached_pages(cache_dir, "crawl_fight_betting_odds"))
+
+    assert [page.url for page in pages] == [FIGHTODDS_URL]
+    assert json.loads(pages[0].request_body)["operationName"] == "FightOddsQuery"
+
+
+def test_parse_stored_page_runs_every_matching_parser(cache_dir: Path) -> None:
+    pages = {page.url: page for page in iter_cached_pages(cache_dir)}
+
+    event_entities, event_errors = parse_stored_page(pages[EVENT_URL])
+    fight_entities, fight_errors = parse_stored_page(pages[FIGHT_URL])
+    odds_entities, odds_errors = parse_stored_page(pages[FIGHTODDS_URL])
+
+    assert not event_errors and not fight_errors and not odds_errors
+    assert {type(entity).__name__ for entity in event_entities} == {
+        "Event",
+        "FightSummary",
+    }
+    assert {type(entity).__name__ for entity in fight_entities} == {
+        "Fight",
+        "FightStats",
+        "FightStatsByRound",
+    }
+    assert odds_entities
+    assert {type(entity).__name__ for entity in odds_entities} == {"FightOdds"}
+
+
+def test_parse_stored_page_reports_failing_parser(tmp_path: Path) -> None:
+    broken_response = HtmlResponse(
+        url=FIGHT_URL, request=Request(FIGHT_URL), body=b"<html><body></body></html>"
+    )
+    store_responses(tmp_path, "crawl_fight_pages", [broken_response])
+
+    entities, errors = parse_stored_page(next(iter_cached_pages(tmp_path)))
+
+    assert entities == []
+    assert len(errors) == 1
+    assert FIGHT_URL in errors[0] and "FightStatParser" in errors[0]
+
+
+def test_reparse_pages_writes_feeds(cache_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "data"
+    pages = list(iter_cached_pages(cache_dir))
+
+    with EntityFeedWriter(
+        output_dir,
+        "jsonl",
+        overwrite=True,
+        entity_feeds={**UFCSTATS_ALL_ENTITY_FEEDS, **FIGHTODDS_ENTITY_FEEDS},
+    ) as feed_writer:
+        num_entities, errors = reparse_pages(pages, feed_writer, max_workers=2)
+
+    assert errors == []
+    num_rows = sum(
+        len(path.read_text().splitlines()) for path in output_dir.glob("*.jsonl")
+    )
+    assert num_rows == num_entities
+    assert (output_dir / "fights.jsonl").exists()
+    assert (output_dir / "fight_summaries.jsonl").exists()
+    assert (output_dir / "fightodds_fight_betting_odds.jsonl").exists()
+
+
+def test_iter_archived_pages_reads_latest_responses(tmp_path: Path) -> None:
+    archive = ResponseArchive(tmp_path / "archive")
+    for response in [
+        html_response(FIGHT_URL, FIGHT_RESPONSE_VALID_PATH),
+        fightodds_response("FightOddsQuery"),
+    ]:
+        archive.add(response.request, response)  # type: ignore[arg-type]
+    archive.close()
+
+    pages = {page.url: page for page in iter_archived_pages(tmp_path / "archive")}
+    fight_entities, fight_errors = parse_stored_page(pages[FIGHT_URL])
+    odds_entities, odds_errors = parse_stored_page(pages[FIGHTODDS_URL])
+
+    assert not fight_errors and not odds_errors
+    assert len(fight_entities) > 1
+    assert {type(entity).__name__ for entity in odds_entities} == {"FightOdds"}
+
+
+def test_iter_cached_pages_reads_sqlite_cache(tmp_path: Path) -> None:
+    settings = Settings({"HTTPCACHE_DIR": str(tmp_path / "httpcache")})
+    storage = SqliteCacheStorage(settings)
+    spider = Spider(name="crawl_fight_pages")
+    spider.crawler = Crawler(Spider, settings)
+    spider.crawler.request_fingerprinter = RequestFingerprinter()
+    storage.open_spider(spider)
+    for response in [
+        html_response(FIGHT_URL, FIGHT_RESPONSE_VALID_PATH),
+        html_response(EVENTS_LISTING_URL, EVENT_RESPONSE_VALID_PATH, status=500),
+    ]:
+        storage.store_response(spider, response.request, response)  # type: ignore[arg-type]
+    storage.close_spider(spider)
+
+    pages = list(iter_cached_pages(tmp_path / "httpcache.db"))
+    entities, errors = parse_stored_page(pages[0])
+
+    assert [page.url for page in pages] == [FIGHT_URL]
+    assert not errors
+    assert len(entities) > 1
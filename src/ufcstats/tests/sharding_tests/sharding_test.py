@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request, Spider
+from scrapy.http import HtmlResponse
+
+from entities.event import Event
+from ufcstats.middlewares import ShardMiddleware
+from ufcstats.sharding import (
+    get_shard,
+    get_spider_shard,
+    merge_partitions,
+    merge_rows,
+)
+
+EVENTS_URL = "http://www.ufcstats.com/statistics/events/completed?page=all"
+EVENT_URLS = [
+    f"http://www.ufcstats.com/event-details/{event_index:016x}"
+    for event_index in range(20)
+]
+NUM_SHARDS = 3
+
+
+def test_get_shard_ignores_www() -> None:
+    for event_url in EVENT_URLS:
+        assert get_shard(event_url, NUM_SHARDS) == get_shard(
+            event_url.replace("www.", ""), NUM_SHARDS
+        )
+
+
+def test_get_spider_shard() -> None:
+    assert get_spider_shard(Spider(name="crawl_fights")) is None
+    assert get_spider_shard(Spider(name="crawl_fights", shard="1", num_shards="3")) == (
+        1,
+        3,
+    )
+
+
+@pytest.mark.parametrize(
+    "spider_args",
+    [{"shard": "1"}, {"num_shards": "3"}, {"shard": "3", "num_shards": "3"}],
+)
+def test_get_spider_shard_invalid(spider_args: dict[str, str]) -> None:
+    with pytest.raises(ValueError):
+        get_spider_shard(Spider(name="crawl_fights", **spider_args))
+
+
+def test_shard_middleware_partitions_events(mocker: MockerFixture) -> None:
+    middleware = ShardMiddleware(mocker.Mock())
+    response = HtmlResponse(url=EVENTS_URL, body=b"")
+
+    followed_urls = []
+    for shard in range(NUM_SHARDS):
+        spider = Spider(name="crawl_fights", shard=shard, num_shards=NUM_SHARDS)
+        requests = [Request(event_url) for event_url in EVENT_URLS]
+        followed_urls.append(
+            [
+                request.url
+                for request in middleware.process_spider_output(
+                    response, requests, spider
+                )
+            ]
+        )
+
+    assert sorted(sum(followed_urls, [])) == EVENT_URLS
+    assert all(followed_urls)
+
+
+def test_shard_middleware_keeps_unsharded_output(mocker: MockerFixture) -> None:
+    middleware = ShardMiddleware(mocker.Mock())
+    response = HtmlResponse(url=EVENT_URLS[0], body=b"")
+    fight_requests = [
+        Request(f"http://www.ufcstats.com/fight-details/{fight_index:016x}")
+        for fight_index in range(10)
+    ]
+
+    for spider in [
+        Spider(name="crawl_fights"),
+        Spider(name="crawl_fights", shard=0, num_shards=NUM_SHARDS),
+    ]:
+        assert (
+            list(middleware.process_spider_output(response, fight_requests, spider))
+            == fight_requests
+        )
+
+
+def test_shard_middleware_drops_listing_items_in_other_shards(
+    mocker: MockerFixture,
+) -> None:
+    middleware = ShardMiddleware(mocker.Mock())
+    response = HtmlResponse(url=EVENTS_URL, body=b"")
+    events = [mocker.Mock(spec=Event, url=event_url) for event_url in EVENT_URLS]
+    spider = Spider(name="crawl_events", shard=0, num_shards=NUM_SHARDS)
+
+    assert list(middleware.process_spider_output(response, events, spider)) == [
+        event for event in events if get_shard(event.url, NUM_SHARDS) == 0
+    ]
+
+
+def test_merge_rows_keeps_latest_row_per_entity() -> None:
+    partitions = [
+        [
+            {"scraped_at": "2000-01-01T00:00:00", "fighter_id": "a", "wins": 1},
+            {"scraped_at": "2000-01-01T00:00:00", "fighter_id": "b", "wins": 2},
+        ],
+        [{"scraped_at": "2000-01-02T00:00:00", "fighter_id": "a", "wins": 3}],
+    ]
+
+    assert merge_rows(partitions, "fighter_id") == [
+        {"scraped_at": "2000-01-02T00:00:00", "fighter_id": "a", "wins": 3},
+        {"scraped_at": "2000-01-01T00:00:00", "fighter_id": "b", "wins": 2},
+    ]
+
+
+def write_partition(path: Path, rows: list[dict[str, str]]) -> None:
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+
+def test_merge_partitions(tmp_path: Path) -> None:
+    write_partition(
+        tmp_path / "fights.shard-0-of-2.jsonl",
+        [{"scraped_at": "2000-01-01T00:00:00", "fight_id": "a"}],
+    )
+    write_partition(
+        tmp_path / "fights.shard-1-of-2.jsonl",
+        [
+            {"scraped_at": "2000-01-01T00:00:00", "fight_id": "b"},
+            {"scraped_at": "2000-01-01T00:00:00", "fight_id": "a"},
+        ],
+    )
+
+    merged_paths = merge_partitions(tmp_path, remove_partitions=True)
+
+    assert merged_paths == [tmp_path / "fights.jsonl"]
+    assert [
+        json.loads(line)["fight_id"]
+        for line in merged_paths[0].read_text().splitlines()
+    ] == ["a", "b"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fights.jsonl"]
+
+
+def test_merge_partitions_missing_shard(tmp_path: Path) -> None:
+    write_partition(tmp_path / "fights.shard-0-of-2.jsonl", [])
+
+    with pytest.raises(ValueError, match="Missing partitions of fights for shards 1"):
+        merge_partitions(tmp_path)
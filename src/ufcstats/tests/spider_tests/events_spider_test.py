@@ -0,0 +1,108 @@
+from pathlib import Path
+from typing import Any, List
+
+from freezegun import freeze_time
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+from twisted.internet import defer
+
+# Awaiting the parser pool needs an installed reactor to check its type
+import twisted.internet.reactor  # noqa: F401
+
+from entities.event import Event
+from ufcstats.crawl_state import CrawlStateStore
+from ufcstats.spiders.events import CrawlEvents
+from tests import EVENT_RESPONSE_VALID_PATH, EVENTS_LISTING_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+
+UFC_308_URL = "http://www.ufcstats.com/event-details/e955046551f8c7dd"
+
+
+@pytest.fixture
+def spider(tmp_path: Path, mocker: MockerFixture) -> CrawlEvents:
+    settings = Settings(
+        {"LISTING_FAST_PATH": True, "CRAWL_STATE_DB": tmp_path / "crawl_state.db"}
+    )
+    crawler = Crawler(CrawlEvents, settings)
+    crawler.stats = mocker.Mock()
+
+    return CrawlEvents.from_crawler(crawler)
+
+
+def run_callback(result: Any) -> List[Any]:
+    outputs: List[Any] = []
+    defer.ensureDeferred(result).addCallback(outputs.extend)
+
+    return outputs
+
+
+def crawl_listing(spider: CrawlEvents) -> List[Any]:
+    listing_response = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH)
+    return run_callback(spider.parse(listing_response))
+
+
+def fetch_event(spider: CrawlEvents, request: Request) -> List[Any]:
+    event_body = load_html_response_from_file(EVENT_RESPONSE_VALID_PATH).body
+    event_response = HtmlResponse(url=request.url, body=event_body, request=request)
+
+    return run_callback(request.callback(event_response, **request.cb_kwargs))
+
+
+@freeze_time("2024-11-10")
+def test_listing_fast_path_fetches_new_events(spider: CrawlEvents) -> None:
+    outputs = crawl_listing(spider)
+
+    assert all(isinstance(output, Request) for output in outputs)
+    assert len(outputs) == 3
+
+
+@freeze_time("2024-11-10")
+def test_listing_fast_path_skips_unchanged_events(spider: CrawlEvents) -> None:
+    ufc_308_request = next(
+        output for output in crawl_listing(spider) if output.url == UFC_308_URL
+    )
+    (event,) = fetch_event(spider, ufc_308_request)
+    assert event.fights
+
+    outputs = crawl_listing(spider)
+
+    events = [output for output in outputs if isinstance(output, Event)]
+    requests = [output for output in outputs if isinstance(output, Request)]
+    assert [event.url for event in events] == [UFC_308_URL]
+    assert events[0].fights == event.fights
+    # The upcoming event is always fetched, and the other event is new
+    assert len(requests) == 2
+
+
+@freeze_time("2024-11-10")
+def test_listing_fast_path_refetches_changed_events(
+    spider: CrawlEvents, tmp_path: Path
+) -> None:
+    CrawlStateStore(tmp_path / "crawl_state.db").record_fingerprint(
+        spider.name, UFC_308_URL, "outdated fingerprint"
+    )
+
+    outputs = crawl_listing(spider)
+
+    assert UFC_308_URL in [output.url for output in outputs]
+    assert all(isinstance(output, Request) for output in outputs)
+
+
+@freeze_time("2024-11-10")
+def test_listing_fast_path_refetches_events_without_recorded_fights(
+    spider: CrawlEvents, tmp_path: Path
+) -> None:
+    ufc_308_request = next(
+        output for output in crawl_listing(spider) if output.url == UFC_308_URL
+    )
+    CrawlStateStore(tmp_path / "crawl_state.db").record_fingerprint(
+        spider.name, UFC_308_URL, ufc_308_request.cb_kwargs["listing_fingerprint"]
+    )
+
+    outputs = crawl_listing(spider)
+
+    assert all(isinstance(output, Request) for output in outputs)
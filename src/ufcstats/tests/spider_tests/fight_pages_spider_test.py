@@ -0,0 +1,97 @@
+from typing import Any, List
+
+import pytest
+from scrapy import Request
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+from twisted.internet import defer
+
+# Awaiting the parser pool needs an installed reactor to check its type
+import twisted.internet.reactor  # noqa: F401
+
+from entities.event import Event
+from entities.fight import Fight
+from entities.fight_stats import FightStats
+from entities.fight_stats_by_round import FightStatsByRound
+from ufcstats.spiders.fight_pages import CrawlFightPages
+from tests import (
+    EVENT_RESPONSE_VALID_PATH,
+    EVENTS_LISTING_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+)
+from tests.utils import load_html_response_from_file
+
+
+@pytest.fixture
+def spider() -> CrawlFightPages:
+    crawler = Crawler(CrawlFightPages, Settings())
+    return CrawlFightPages.from_crawler(crawler, output_format="csv")
+
+
+def run_callback(result: Any) -> List[Any]:
+    outputs: List[Any] = []
+    defer.ensureDeferred(result).addCallback(outputs.extend)
+
+    return outputs
+
+
+def fetch(request: Request, body: bytes) -> List[Any]:
+    response = HtmlResponse(url=request.url, body=body, request=request)
+    return run_callback(request.callback(response, **request.cb_kwargs))
+
+
+def test_fight_pages_spider_follows_events_listing(spider: CrawlFightPages) -> None:
+    listing_response = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH)
+
+    event_requests = list(spider.parse(listing_response))
+
+    assert len(event_requests) == 3
+    assert all("event-details" in request.url for request in event_requests)
+    # Newest events first
+    priorities = [request.priority for request in event_requests]
+    assert priorities == sorted(priorities, reverse=True)
+
+
+def test_fight_pages_spider_yields_event_and_follows_its_fights(
+    spider: CrawlFightPages,
+) -> None:
+    listing_response = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH)
+    event_request = next(iter(spider.parse(listing_response)))
+
+    outputs = fetch(event_request, EVENT_RESPONSE_VALID_PATH.read_bytes())
+
+    events = [output for output in outputs if isinstance(output, Event)]
+    fight_requests = [output for output in outputs if isinstance(output, Request)]
+    assert len(events) == 1
+    assert len(fight_requests) == 13
+    assert all("fight-details" in request.url for request in fight_requests)
+    assert all(request.priority > event_request.priority for request in fight_requests)
+
+
+def test_fight_pages_spider_parses_every_fight_entity_once(
+    spider: CrawlFightPages,
+) -> None:
+    fight_request = Request(
+        "http://www.ufcstats.com/fight-details/ebf7cea27b83c432",
+        callback=spider._get_fight_entities,
+    )
+
+    outputs = fetch(fight_request, FIGHT_RESPONSE_VALID_PATH.read_bytes())
+
+    assert [type(output) for output in outputs[:3]] == [Fight, FightStats, FightStats]
+    assert all(isinstance(output, FightStatsByRound) for output in outputs[3:])
+    assert len(outputs) > 3
+    assert {output.fight_id for output in outputs[1:]} == {outputs[0].fight_id}
+
+
+def test_fight_pages_spider_writes_a_feed_per_entity(spider: CrawlFightPages) -> None:
+    feeds = spider.crawler.settings.getdict("FEEDS")
+
+    assert set(feeds) == {
+        "data/events.csv",
+        "data/fights.csv",
+        "data/fight_stats.csv",
+        "data/fight_stats_by_round.csv",
+    }
+    assert all(feed["overwrite"] for feed in feeds.values())
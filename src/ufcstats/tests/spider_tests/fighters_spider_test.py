@@ -0,0 +1,110 @@
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+from twisted.internet import defer
+
+# Awaiting the parser pool needs an installed reactor to check its type
+import twisted.internet.reactor  # noqa: F401
+
+from entities.fighter import Fighter
+from ufcstats.crawl_state import CrawlStateStore
+from ufcstats.parsers.fighter_listing_parser import FighterListingParser
+from ufcstats.spiders.fighters import CrawlFighters, get_listing_fingerprint
+from tests import FIGHTER_RESPONSE_VALID_PATH, FIGHTERS_LISTING_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+
+WHITTAKER_URL = "http://ufcstats.com/fighter-details/7a4bb1d2e3f5c6a8"
+
+
+@pytest.fixture
+def spider(tmp_path: Path, mocker: MockerFixture) -> CrawlFighters:
+    settings = Settings(
+        {"LISTING_FAST_PATH": True, "CRAWL_STATE_DB": tmp_path / "crawl_state.db"}
+    )
+    crawler = Crawler(CrawlFighters, settings)
+    crawler.stats = mocker.Mock()
+
+    return CrawlFighters.from_crawler(crawler)
+
+
+def run_callback(result: Any) -> List[Any]:
+    outputs: List[Any] = []
+    defer.ensureDeferred(result).addCallback(outputs.extend)
+
+    return outputs
+
+
+def crawl_listing(spider: CrawlFighters) -> List[Any]:
+    listing_response = load_html_response_from_file(
+        FIGHTERS_LISTING_RESPONSE_VALID_PATH
+    )
+    return run_callback(spider.parse(listing_response))
+
+
+def fetch_fighter(spider: CrawlFighters, request: Request) -> List[Any]:
+    fighter_body = load_html_response_from_file(FIGHTER_RESPONSE_VALID_PATH).body
+    fighter_response = HtmlResponse(url=request.url, body=fighter_body, request=request)
+
+    return run_callback(request.callback(fighter_response, **request.cb_kwargs))
+
+
+def test_listing_fast_path_fetches_new_fighters(spider: CrawlFighters) -> None:
+    outputs = crawl_listing(spider)
+
+    assert all(isinstance(output, Request) for output in outputs)
+    assert len(outputs) == 4
+
+
+def test_listing_fast_path_skips_unchanged_fighters(spider: CrawlFighters) -> None:
+    whittaker_request = next(
+        output for output in crawl_listing(spider) if output.url == WHITTAKER_URL
+    )
+    (fetched_fighter,) = fetch_fighter(spider, whittaker_request)
+
+    outputs = crawl_listing(spider)
+
+    fighters = [output for output in outputs if isinstance(output, Fighter)]
+    requests = [output for output in outputs if isinstance(output, Request)]
+    assert [fighter.url for fighter in fighters] == [WHITTAKER_URL]
+    assert len(requests) == 3
+    # Fields only shown on the fighter page are kept from when it was fetched
+    assert fighters[0].dob == fetched_fighter.dob == "Dec 20, 1990"
+    assert fighters[0].fight_ids == fetched_fighter.fight_ids
+    assert fighters[0].record == fetched_fighter.record
+
+
+def test_listing_fast_path_refetches_changed_fighters(
+    spider: CrawlFighters, tmp_path: Path
+) -> None:
+    CrawlStateStore(tmp_path / "crawl_state.db").record_fingerprint(
+        spider.name, WHITTAKER_URL, "outdated fingerprint", {"dob": None}
+    )
+
+    outputs = crawl_listing(spider)
+
+    assert WHITTAKER_URL in [output.url for output in outputs]
+    assert all(isinstance(output, Request) for output in outputs)
+
+
+def test_listing_fast_path_fetches_fighters_without_details(
+    spider: CrawlFighters, tmp_path: Path
+) -> None:
+    listing_response = load_html_response_from_file(
+        FIGHTERS_LISTING_RESPONSE_VALID_PATH
+    )
+    whittaker = next(FighterListingParser(listing_response).parse_response())
+    # Fingerprint recorded by a run that never fetched the fighter page
+    CrawlStateStore(tmp_path / "crawl_state.db").record_fingerprint(
+        spider.name, WHITTAKER_URL, get_listing_fingerprint(whittaker)
+    )
+
+    outputs = crawl_listing(spider)
+
+    assert WHITTAKER_URL in [output.url for output in outputs]
+    assert all(isinstance(output, Request) for output in outputs)
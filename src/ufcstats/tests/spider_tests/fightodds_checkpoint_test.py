@@ -0,0 +1,162 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from scrapy import Request, signals
+from scrapy.crawler import Crawler
+from scrapy.http import TextResponse
+from scrapy.settings import Settings
+
+from fightodds.checkpoint import CrawlCheckpoint
+from fightodds.spiders.fight_betting_odds import CrawlFightBettingOdds
+from tests import FIGHT_ODDS_RESPONSE_VALID_PATH
+
+
+def test_checkpoint_resumes_from_first_unfinished_page(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint = CrawlCheckpoint(checkpoint_path, save_every=1)
+    checkpoint.record_page("cursor_1", [1, 2])
+    checkpoint.record_page("cursor_2", [3])
+    checkpoint.record_requests(1, 2)
+    checkpoint.record_request_parsed(1)
+    checkpoint.record_requests(2, 0)
+    checkpoint.record_completed(3)
+
+    resumed_checkpoint = CrawlCheckpoint(checkpoint_path, save_every=1)
+
+    assert resumed_checkpoint.end_cursor == ""
+    assert not resumed_checkpoint.is_completed(1)
+    assert resumed_checkpoint.is_completed(2)
+    assert resumed_checkpoint.is_completed(3)
+
+    resumed_checkpoint.record_page("cursor_1", [1, 2])
+    resumed_checkpoint.record_requests(1, 2)
+    resumed_checkpoint.record_request_parsed(1)
+    resumed_checkpoint.record_request_parsed(1)
+    # Keys of finished pages are never read again
+    saved_checkpoint = CrawlCheckpoint(checkpoint_path)
+    assert saved_checkpoint.end_cursor == "cursor_1"
+    assert saved_checkpoint.completed_keys == {3}
+
+    resumed_checkpoint.record_page("cursor_2", [3])
+    saved_checkpoint = CrawlCheckpoint(checkpoint_path)
+    assert saved_checkpoint.end_cursor == "cursor_2"
+    assert saved_checkpoint.completed_keys == set()
+
+
+def test_checkpoint_saves_in_batches_within_a_page(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint = CrawlCheckpoint(checkpoint_path, save_every=2)
+    checkpoint.record_page("cursor_1", [1, 2, 3])
+
+    checkpoint.record_completed(1)
+    assert CrawlCheckpoint(checkpoint_path).completed_keys == set()
+    checkpoint.record_completed(2)
+    assert CrawlCheckpoint(checkpoint_path).completed_keys == {1, 2}
+    checkpoint.record_page("cursor_2", [4])
+    checkpoint.record_completed(3)
+    assert CrawlCheckpoint(checkpoint_path).end_cursor == "cursor_1"
+    checkpoint.record_completed(4)
+    checkpoint.save()
+
+    saved_checkpoint = CrawlCheckpoint(checkpoint_path)
+    assert saved_checkpoint.end_cursor == "cursor_2"
+    assert saved_checkpoint.completed_keys == set()
+
+
+def test_checkpoint_without_path_is_kept_in_memory(tmp_path: Path) -> None:
+    checkpoint = CrawlCheckpoint()
+    checkpoint.record_page("cursor_1", [1])
+    checkpoint.record_page("cursor_2", [2])
+    checkpoint.record_completed(2)
+
+    assert checkpoint.is_completed(2)
+    assert checkpoint.end_cursor == ""
+    checkpoint.record_completed(1)
+    assert checkpoint.end_cursor == "cursor_2"
+    assert list(tmp_path.iterdir()) == []
+
+
+def create_spider(job_dir: Path) -> CrawlFightBettingOdds:
+    # Saved on every completed event, as a killed crawl is never closed
+    settings = Settings({"JOBDIR": str(job_dir), "CHECKPOINT_SAVE_EVERY": 1})
+    crawler = Crawler(CrawlFightBettingOdds, settings)
+    return CrawlFightBettingOdds.from_crawler(crawler)
+
+
+def fetch(request: Request, body: Any) -> List[Any]:
+    response = TextResponse(
+        url=request.url,
+        body=body if isinstance(body, bytes) else json.dumps(body).encode(),
+        encoding="utf-8",
+        request=request,
+    )
+    return list(request.callback(response, **request.cb_kwargs))
+
+
+def events_page(event_pks: List[int], end_cursor: str, has_next_page: bool) -> Any:
+    edges = [{"node": {"pk": event_pk}} for event_pk in event_pks]
+    page_info = {"hasNextPage": has_next_page, "endCursor": end_cursor}
+    return {"data": {"promotion": {"events": {"edges": edges, "pageInfo": page_info}}}}
+
+
+def event_odds(fight_slugs: List[str]) -> Any:
+    edges = [{"node": {"slug": slug, "isCancelled": False}} for slug in fight_slugs]
+    return {"data": {"eventOfferTable": {"fightOffers": {"edges": edges}}}}
+
+
+def get_requests(outputs: List[Any]) -> Dict[Any, Request]:
+    # Event odds requests by event PK, and the next events page by its cursor
+    requests = {}
+    for request in outputs:
+        variables = json.loads(request.body)["variables"]
+        requests[variables.get("eventPk", variables.get("after"))] = request
+        assert request.dont_filter
+
+    return requests
+
+
+def test_killed_crawl_requests_unparsed_events_again(tmp_path: Path) -> None:
+    fight_odds_body = FIGHT_ODDS_RESPONSE_VALID_PATH.read_bytes()
+    spider = create_spider(tmp_path)
+    (first_page_request,) = spider.start_requests()
+    requests = get_requests(fetch(first_page_request, events_page([1, 2], "c1", True)))
+    (fight_request,) = fetch(requests[1], event_odds(["a-vs-b"]))
+    assert fetch(fight_request, fight_odds_body)
+    fight_requests = fetch(requests[2], event_odds(["c-vs-d", "e-vs-f"]))
+    fetch(fight_requests[0], fight_odds_body)
+    last_page_requests = get_requests(
+        fetch(requests["c1"], events_page([3], "c2", False))
+    )
+    assert fetch(last_page_requests[3], event_odds([])) == []
+    # Killed while the second fight of event 2 was being fetched
+    assert spider._checkpoint.end_cursor == ""
+
+    resumed_spider = create_spider(tmp_path)
+    (first_page_request,) = resumed_spider.start_requests()
+    assert json.loads(first_page_request.body)["variables"]["after"] == ""
+    resumed_requests = get_requests(
+        fetch(first_page_request, events_page([1, 2], "c1", True))
+    )
+    assert set(resumed_requests) == {2, "c1"}
+    for fight_request in fetch(resumed_requests[2], event_odds(["c-vs-d", "e-vs-f"])):
+        fetch(fight_request, fight_odds_body)
+    assert resumed_spider._checkpoint.end_cursor == "c1"
+    assert (
+        get_requests(fetch(resumed_requests["c1"], events_page([3], "c2", False))) == {}
+    )
+    assert resumed_spider._checkpoint.end_cursor == "c2"
+
+
+def test_checkpoint_is_saved_when_spider_closes(tmp_path: Path) -> None:
+    crawler = Crawler(CrawlFightBettingOdds, Settings({"JOBDIR": str(tmp_path)}))
+    spider = CrawlFightBettingOdds.from_crawler(crawler)
+    spider._checkpoint.record_page("c1", [1, 2])
+    spider._checkpoint.record_completed(1)
+    assert not (tmp_path / "checkpoint.json").exists()
+
+    crawler.signals.send_catch_log(
+        signals.spider_closed, spider=spider, reason="shutdown"
+    )
+
+    assert CrawlCheckpoint(tmp_path / "checkpoint.json").completed_keys == {1}
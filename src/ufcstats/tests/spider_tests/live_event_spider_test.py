@@ -0,0 +1,157 @@
+import re
+from typing import Any, List
+
+from freezegun import freeze_time
+import pytest
+from pytest_mock import MockerFixture
+from scrapy import Request
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+from twisted.internet import defer
+
+# Awaiting the parser pool needs an installed reactor to check its type
+import twisted.internet.reactor  # noqa: F401
+
+from entities.fight import Fight
+from ufcstats.spiders.live_event import CrawlLiveEvent
+from tests import (
+    EVENT_RESPONSE_VALID_PATH,
+    EVENTS_LISTING_RESPONSE_VALID_PATH,
+    FIGHT_RESPONSE_VALID_PATH,
+)
+from tests.utils import load_html_response_from_file
+
+EVENT_URL = "http://www.ufcstats.com/event-details/e955046551f8c7dd"
+
+
+def create_spider(mocker: MockerFixture, **kwargs: Any) -> CrawlLiveEvent:
+    settings = Settings({"LIVE_POLL_MIN_SECS": 60, "LIVE_POLL_MAX_SECS": 600})
+    crawler = Crawler(CrawlLiveEvent, settings)
+    crawler.stats = mocker.Mock()
+    crawler.engine = mocker.Mock()
+
+    return CrawlLiveEvent.from_crawler(crawler, **kwargs)
+
+
+@pytest.fixture
+def spider(mocker: MockerFixture) -> CrawlLiveEvent:
+    return create_spider(mocker, event_url=EVENT_URL)
+
+
+def run_callback(result: Any) -> List[Any]:
+    outputs: List[Any] = []
+    defer.ensureDeferred(result).addCallback(outputs.extend)
+
+    return outputs
+
+
+def poll_event(spider: CrawlLiveEvent, body: bytes | None = None) -> List[Request]:
+    request = spider._get_poll_request()
+    event_body = body or load_html_response_from_file(EVENT_RESPONSE_VALID_PATH).body
+    event_response = HtmlResponse(url=request.url, body=event_body, request=request)
+
+    return run_callback(request.callback(event_response))
+
+
+def fetch_fight(spider: CrawlLiveEvent, request: Request, body: bytes) -> List[Any]:
+    fight_response = HtmlResponse(url=request.url, body=body, request=request)
+    return run_callback(request.callback(fight_response, **request.cb_kwargs))
+
+
+def test_live_event_requests_finished_fights_once(spider: CrawlLiveEvent) -> None:
+    fight_requests = poll_event(spider)
+
+    assert len(fight_requests) == 13
+    assert all(request.meta["dont_cache"] for request in fight_requests)
+    assert poll_event(spider) == []
+
+
+def test_live_event_requests_fights_as_they_finish(spider: CrawlLiveEvent) -> None:
+    event_body = load_html_response_from_file(EVENT_RESPONSE_VALID_PATH).body
+    in_progress_body = event_body.replace(b">win<", b"><")
+
+    assert poll_event(spider, in_progress_body) == []
+    assert spider._poll_secs == 120
+    assert len(poll_event(spider, event_body)) == 13
+    assert spider._poll_secs == 60
+
+
+def test_live_event_finishes_once_every_fight_is_parsed(
+    spider: CrawlLiveEvent,
+) -> None:
+    fight_body = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH).body
+    fight_requests = poll_event(spider)
+
+    for fight_request in fight_requests[:-1]:
+        fight_entities = fetch_fight(spider, fight_request, fight_body)
+        assert isinstance(fight_entities[0], Fight)
+    assert not spider.is_finished
+
+    fetch_fight(spider, fight_requests[-1], fight_body)
+    assert spider.is_finished
+
+
+def test_live_event_retries_unparsable_fights(spider: CrawlLiveEvent) -> None:
+    fight_request = poll_event(spider)[0]
+
+    assert fetch_fight(spider, fight_request, b"<html></html>") == []
+    assert [request.url for request in poll_event(spider)] == [fight_request.url]
+
+
+def test_live_event_retries_fights_without_stats(spider: CrawlLiveEvent) -> None:
+    fight_body = load_html_response_from_file(FIGHT_RESPONSE_VALID_PATH).body
+    # Stats tables published with their headers and fighters but no values yet
+    no_stats_body = re.sub(
+        rb'(<p class="b-fight-details__table-text">)\s*[^<\s][^<]*(</p>)',
+        rb"\1\2",
+        fight_body,
+    )
+    fight_request = poll_event(spider)[0]
+
+    assert fetch_fight(spider, fight_request, no_stats_body) == []
+    assert fight_request.cb_kwargs["fight_id"] not in spider._requested_fight_ids
+    (retry_request,) = poll_event(spider)
+    assert retry_request.url == fight_request.url
+    assert isinstance(fetch_fight(spider, retry_request, fight_body)[0], Fight)
+
+
+def test_live_event_keeps_polling_while_idle(
+    spider: CrawlLiveEvent, mocker: MockerFixture
+) -> None:
+    call_later = mocker.patch("twisted.internet.reactor.callLater")
+    poll_event(spider)
+
+    with pytest.raises(DontCloseSpider):
+        spider._schedule_poll(spider)
+
+    call_later.assert_called_once_with(60, spider._poll)
+
+
+def test_live_event_closes_when_finished(
+    spider: CrawlLiveEvent, mocker: MockerFixture
+) -> None:
+    call_later = mocker.patch("twisted.internet.reactor.callLater")
+    spider._card_fight_ids = {"fight"}
+    spider._parsed_fight_ids = {"fight"}
+
+    spider._schedule_poll(spider)
+
+    call_later.assert_not_called()
+
+
+@freeze_time("2024-11-10")
+def test_live_event_follows_latest_started_event(mocker: MockerFixture) -> None:
+    spider = create_spider(mocker)
+    (listing_request,) = spider.start_requests()
+    listing_body = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH).body
+    listing_response = HtmlResponse(
+        url=listing_request.url, body=listing_body, request=listing_request
+    )
+
+    (poll_request,) = run_callback(listing_request.callback(listing_response))
+
+    # The upcoming event on the listing has not started yet
+    assert poll_request.url == "http://www.ufcstats.com/event-details/6e380a4d73ab4f0e"
+    assert poll_request.meta["dont_cache"]
@@ -0,0 +1,52 @@
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from ufcstats.priorities import follow_events, follow_fights
+from tests import EVENT_RESPONSE_VALID_PATH, EVENTS_LISTING_RESPONSE_VALID_PATH
+from tests.utils import load_html_response_from_file
+
+
+def test_follow_events_newest_first() -> None:
+    listing_response = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH)
+    event_urls = listing_response.css("a[href*='event-details']::attr(href)").getall()
+
+    event_requests = follow_events(listing_response, event_urls)
+
+    assert [request.url for request in event_requests] == event_urls
+    assert [request.priority for request in event_requests] == [0, -2, -4]
+
+
+def test_follow_fights_before_older_events() -> None:
+    listing_response = load_html_response_from_file(EVENTS_LISTING_RESPONSE_VALID_PATH)
+    event_urls = listing_response.css("a[href*='event-details']::attr(href)").getall()
+    newest_event_request, older_event_request, _ = follow_events(
+        listing_response, event_urls
+    )
+    event_body = load_html_response_from_file(EVENT_RESPONSE_VALID_PATH).body
+    event_response = HtmlResponse(
+        url=newest_event_request.url, body=event_body, request=newest_event_request
+    )
+
+    fight_requests = follow_fights(
+        event_response,
+        event_response.css("a[href*='fight-details']::attr(href)").getall(),
+    )
+
+    fight_priorities = {request.priority for request in fight_requests}
+    assert len(fight_requests) == 13
+    assert fight_priorities == {newest_event_request.priority + 1}
+    assert older_event_request.priority < newest_event_request.priority + 1
+
+
+def test_follow_fights_without_request() -> None:
+    event_response = HtmlResponse(
+        url="http://www.ufcstats.com/event-details/e955046551f8c7dd",
+        body=b"<html></html>",
+    )
+
+    (fight_request,) = follow_fights(
+        event_response, ["http://www.ufcstats.com/fight-details/ebf7cea27b83c432"]
+    )
+
+    assert isinstance(fight_request, Request)
+    assert fight_request.priority == 1
@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from utils import (
+    clean_string,
+    clean_strings,
+    format_date,
+    format_href,
+    get_strikes_landed_attempted,
+    get_uuid_string,
+    get_uuid_strings,
+)
+
+RAW_STRINGS = [
+    "",
+    "   ",
+    "Jon Jones",
+    "\n    12 of 30\n  ",
+    "Light\theavyweight \r\n Bout",
+    " Las Vegas, Nevada　USA\x1c",
+]
+URLS = [
+    "http://www.ufcstats.com/fighter-details/07f72a2a7591b409",
+    "http://ufcstats.com/fighter-details/07f72a2a7591b409",
+    "https://www.ufcstats.com/fight-details/ebf7cea27b83c432?www.x=1",
+]
+
+
+@pytest.mark.parametrize("raw_string", RAW_STRINGS)
+def test_clean_string_collapses_whitespace_like_regex(raw_string: str) -> None:
+    expected = re.sub(r"\s+", " ", raw_string).strip()
+
+    assert clean_string(raw_string) == expected
+    assert clean_string(expected) == expected
+
+
+def test_clean_strings_cleans_each_string() -> None:
+    assert clean_strings(RAW_STRINGS) == [clean_string(s) for s in RAW_STRINGS]
+    assert clean_strings(iter(["  a  b "])) == ["a b"]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_format_href_removes_www_like_regex(url: str) -> None:
+    assert format_href(url) == re.sub(r"(?<=://)www\.", "", url)
+
+
+def test_get_uuid_strings_matches_get_uuid_string() -> None:
+    assert get_uuid_strings(URLS) == [get_uuid_string(url) for url in URLS]
+    assert get_uuid_strings(URLS)[0] == get_uuid_strings(URLS)[1]
+
+
+def test_format_date() -> None:
+    assert format_date("October 26, 2024", "%B %d, %Y") == "2024-10-26"
+    assert format_date("Jul 19, 1987", "%b %d, %Y") == "1987-07-19"
+    with pytest.raises(ValueError):
+        format_date("--", "%b %d, %Y")
+
+
+def test_get_strikes_landed_attempted() -> None:
+    assert get_strikes_landed_attempted("\n 12  of\n30 ") == (12, 30)
+    for fight_stat in ["12 of", "12 of 30 of 40", "---", "1 out of 2"]:
+        with pytest.raises(ValueError):
+            get_strikes_landed_attempted(fight_stat)
@@ -0,0 +1,269 @@
+"""Persistent store of which ufcstats.com pages each spider has already crawled.
+
+Used by incremental crawls to skip event, fight and fighter pages that were
+fetched and parsed successfully on a previous run and have not gone stale,
+by listing fast paths to only fetch pages whose listing row has changed, and
+by change detection to only parse pages whose content has changed.
+"""
+
+from datetime import datetime, timezone
+from hashlib import sha1
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any, Dict, Optional
+
+from utils import format_href
+
+CRAWL_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_state (
+    spider TEXT NOT NULL,
+    url TEXT NOT NULL,
+    parent_url TEXT,
+    fetched_at TEXT,
+    parsed_ok INTEGER NOT NULL DEFAULT 0,
+    stale INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    details TEXT,
+    PRIMARY KEY (spider, url)
+);
+CREATE INDEX IF NOT EXISTS crawl_state_parent
+    ON crawl_state (spider, parent_url);
+CREATE TABLE IF NOT EXISTS content_hashes (
+    page_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+"""
+
+
+def get_fingerprint(*values: Optional[str]) -> str:
+    """Hash the values shown for a page on a listing, to detect when they change.
+
+    Args:
+        *values (Optional[str]): Values of the listing row, e.g. name and date.
+
+    Returns:
+        str: Hex digest identifying the values.
+
+    """
+    joined_values = "\x1f".join("" if value is None else value for value in values)
+    return sha1(joined_values.encode("utf-8")).hexdigest()
+
+
+class CrawlStateStore:
+    """SQLite-backed record of crawled event, fight and fighter URLs per spider.
+
+    Each row records a URL, the page it was discovered on, when it was last
+    fetched, whether parsing succeeded and a fingerprint of its listing row,
+    along with any values only shown on the page itself.
+    A page is complete once it has been parsed successfully, has not been
+    marked stale since, and every page discovered on it is complete too. So
+    an event is only skipped when all of its fights have been parsed, and a
+    fighter is fetched again once a new fight links to them.
+
+    Args:
+        path (str | Path): Path of the SQLite database file.
+
+    Attributes:
+        _connection (sqlite3.Connection): Open connection to the database.
+
+    """
+
+    def __init__(self, path: str | Path):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(CRAWL_STATE_SCHEMA)
+
+    def record_discovered(self, spider: str, url: str, parent_url: str) -> None:
+        """Record a URL found on a parent page, without overwriting its state.
+
+        Args:
+            spider (str): Name of the spider that discovered the URL.
+            url (str): The discovered URL.
+            parent_url (str): URL of the page the URL was discovered on.
+
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO crawl_state (spider, url, parent_url) VALUES (?, ?, ?) "
+                "ON CONFLICT (spider, url) DO UPDATE SET parent_url = excluded.parent_url",
+                (spider, format_href(url), format_href(parent_url)),
+            )
+
+    def record_fetched(self, spider: str, url: str, parsed_ok: bool) -> None:
+        """Record that a URL was fetched and whether it parsed successfully.
+
+        Args:
+            spider (str): Name of the spider that fetched the URL.
+            url (str): The fetched URL.
+            parsed_ok (bool): Whether the spider parsed the page without errors.
+
+        """
+        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO crawl_state (spider, url, fetched_at, parsed_ok) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (spider, url) DO UPDATE SET "
+                "fetched_at = excluded.fetched_at, parsed_ok = excluded.parsed_ok, "
+                "stale = 0",
+                (spider, format_href(url), fetched_at, int(parsed_ok)),
+            )
+
+    def mark_stale(self, url: str) -> None:
+        """Mark a URL as changed so every spider that crawled it fetches it again.
+
+        Args:
+            url (str): The URL whose page has changed.
+
+        """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE crawl_state SET stale = 1 WHERE url = ?", (format_href(url),)
+            )
+
+    def is_stale(self, spider: str, url: str) -> bool:
+        """Check whether a URL was marked stale after the spider last fetched it.
+
+        Args:
+            spider (str): Name of the spider to check the state for.
+            url (str): The URL to check.
+
+        Returns:
+            bool: True if the page has changed since it was last fetched.
+
+        """
+        row: Optional[tuple[int]] = self._connection.execute(
+            "SELECT stale FROM crawl_state WHERE spider = ? AND url = ?",
+            (spider, format_href(url)),
+        ).fetchone()
+
+        return row is not None and bool(row[0])
+
+    def is_complete(self, spider: str, url: str) -> bool:
+        """Check whether a URL and every page discovered on it parsed successfully.
+
+        Args:
+            spider (str): Name of the spider to check the state for.
+            url (str): The URL to check.
+
+        Returns:
+            bool: True if the URL does not need to be fetched again.
+
+        """
+        url_clean = format_href(url)
+        row: Optional[tuple[int, int]] = self._connection.execute(
+            "SELECT parsed_ok, stale FROM crawl_state WHERE spider = ? AND url = ?",
+            (spider, url_clean),
+        ).fetchone()
+        if row is None or not row[0] or row[1]:
+            return False
+
+        incomplete_child = self._connection.execute(
+            "SELECT 1 FROM crawl_state WHERE spider = ? AND parent_url = ? "
+            "AND (parsed_ok = 0 OR stale = 1) LIMIT 1",
+            (spider, url_clean),
+        ).fetchone()
+
+        return incomplete_child is None
+
+    def get_fingerprint(self, spider: str, url: str) -> Optional[str]:
+        """Get the listing row fingerprint recorded when a URL was last fetched.
+
+        Args:
+            spider (str): Name of the spider to get the fingerprint for.
+            url (str): The URL listed on the row.
+
+        Returns:
+            Optional[str]: The fingerprint, or None if none was recorded.
+
+        """
+        row: Optional[tuple[Optional[str]]] = self._connection.execute(
+            "SELECT fingerprint FROM crawl_state WHERE spider = ? AND url = ?",
+            (spider, format_href(url)),
+        ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def get_details(self, spider: str, url: str) -> Optional[Dict[str, Any]]:
+        """Get the values only shown on a page, recorded with its fingerprint.
+
+        Args:
+            spider (str): Name of the spider to get the values for.
+            url (str): The URL listed on the row.
+
+        Returns:
+            Optional[Dict[str, Any]]: The values, or None if none were recorded.
+
+        """
+        row: Optional[tuple[Optional[str]]] = self._connection.execute(
+            "SELECT details FROM crawl_state WHERE spider = ? AND url = ?",
+            (spider, format_href(url)),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+
+        details: Dict[str, Any] = json.loads(row[0])
+        return details
+
+    def record_fingerprint(
+        self,
+        spider: str,
+        url: str,
+        fingerprint: str,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record the fingerprint of the listing row of a fetched URL.
+
+        Args:
+            spider (str): Name of the spider that fetched the URL.
+            url (str): The URL listed on the row.
+            fingerprint (str): Fingerprint of the row, from get_fingerprint.
+            details (Optional[Dict[str, Any]]): JSON serialisable values only
+                shown on the fetched page, to combine with the row next time.
+
+        """
+        details_json = json.dumps(details) if details is not None else None
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO crawl_state (spider, url, fingerprint, details) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (spider, url) DO UPDATE SET "
+                "fingerprint = excluded.fingerprint, details = excluded.details",
+                (spider, format_href(url), fingerprint, details_json),
+            )
+
+    def get_content_hash(self, page_id: str) -> Optional[str]:
+        """Get the hash of a page's content when it was last parsed.
+
+        Args:
+            page_id (str): ID of the page's entity, e.g. a fighter_id.
+
+        Returns:
+            Optional[str]: The hash, or None if none was recorded.
+
+        """
+        row: Optional[tuple[str]] = self._connection.execute(
+            "SELECT content_hash FROM content_hashes WHERE page_id = ?", (page_id,)
+        ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def record_content_hash(self, page_id: str, content_hash: str) -> None:
+        """Record the hash of a page's content once it has been parsed.
+
+        Args:
+            page_id (str): ID of the page's entity, e.g. a fighter_id.
+            content_hash (str): Hash of the page's content.
+
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO content_hashes (page_id, content_hash) VALUES (?, ?) "
+                "ON CONFLICT (page_id) DO UPDATE SET "
+                "content_hash = excluded.content_hash",
+                (page_id, content_hash),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
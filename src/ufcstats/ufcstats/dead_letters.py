@@ -0,0 +1,239 @@
+"""Store of ufcstats.com pages the parsers failed on, and a command to parse them again.
+
+DeadLetterMiddleware keeps the body of every page a page parser raised on,
+e.g. a query with no result or an unexpected stats table header, with the
+parser that failed and its traceback. Once the parser is fixed, the pages
+are parsed again offline, and the entities written to the feeds in data/:
+
+    python -m ufcstats.dead_letters reparse --output-format jsonl
+
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+from traceback import format_exception
+from typing import Iterator, List, Optional, Tuple
+
+from scrapy.http import HtmlResponse, Response
+from scrapy.utils.misc import load_object
+
+from ufcstats.entity_feeds import EntityFeedWriter
+from ufcstats.parser_pool import get_response_encoding, run_page_parser
+
+DEAD_LETTER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    spider TEXT NOT NULL,
+    url TEXT NOT NULL,
+    page_parser TEXT NOT NULL,
+    parser_class TEXT,
+    body BLOB NOT NULL,
+    encoding TEXT NOT NULL,
+    traceback TEXT NOT NULL,
+    failed_at TEXT NOT NULL,
+    UNIQUE (url, page_parser)
+);
+"""
+
+
+@dataclass
+class DeadLetter:
+    """A page a page parser failed on.
+
+    Attributes:
+        id (int): ID of the dead letter in its store.
+        spider (str): Name of the spider that fetched the page.
+        url (str): URL of the page.
+        page_parser (str): Import path of the page parser function.
+        parser_class (Optional[str]): Name of the Parser subclass that raised,
+            or None if the exception was raised outside a parser.
+        body (bytes): Body of the response.
+        encoding (str): Encoding of the response body.
+        traceback (str): Formatted traceback of the last failure.
+        failed_at (str): When the page last failed to parse.
+
+    """
+
+    id: int
+    spider: str
+    url: str
+    page_parser: str
+    parser_class: Optional[str]
+    body: bytes
+    encoding: str
+    traceback: str
+    failed_at: str
+
+
+class DeadLetterStore:
+    """SQLite-backed store of pages that failed to parse, one per URL and page parser.
+
+    Args:
+        path (str | Path): Path of the SQLite database file.
+
+    Attributes:
+        _connection (sqlite3.Connection): Open connection to the database.
+
+    """
+
+    def __init__(self, path: str | Path):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(DEAD_LETTER_SCHEMA)
+
+    def add(
+        self,
+        spider: str,
+        response: Response,
+        page_parser: str,
+        exception: BaseException,
+    ) -> None:
+        """Store a page a page parser raised on, replacing any earlier failure.
+
+        Args:
+            spider (str): Name of the spider that fetched the page.
+            response (Response): The response that failed to parse.
+            page_parser (str): Import path of the page parser function.
+            exception (BaseException): The exception raised, with the
+                parser_class attribute set by run_page_parser.
+
+        """
+        failed_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO dead_letters (spider, url, page_parser, parser_class, "
+                "body, encoding, traceback, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url, page_parser) DO UPDATE SET "
+                "spider = excluded.spider, parser_class = excluded.parser_class, "
+                "body = excluded.body, encoding = excluded.encoding, "
+                "traceback = excluded.traceback, failed_at = excluded.failed_at",
+                (
+                    spider,
+                    response.url,
+                    page_parser,
+                    getattr(exception, "parser_class", None),
+                    response.body,
+                    get_response_encoding(response),
+                    "".join(format_exception(exception)),
+                    failed_at,
+                ),
+            )
+
+    def get_all(self) -> Iterator[DeadLetter]:
+        """Iterate over every stored page, oldest failure first."""
+        rows = self._connection.execute(
+            "SELECT id, spider, url, page_parser, parser_class, body, encoding, "
+            "traceback, failed_at FROM dead_letters ORDER BY failed_at, id"
+        ).fetchall()
+        for row in rows:
+            yield DeadLetter(*row)
+
+    def record_failure(self, dead_letter_id: int, exception: BaseException) -> None:
+        """Replace the traceback of a page that failed to parse again.
+
+        Args:
+            dead_letter_id (int): ID of the dead letter.
+            exception (BaseException): The exception raised this time.
+
+        """
+        failed_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        with self._connection:
+            self._connection.execute(
+                "UPDATE dead_letters SET parser_class = ?, traceback = ?, "
+                "failed_at = ? WHERE id = ?",
+                (
+                    getattr(exception, "parser_class", None),
+                    "".join(format_exception(exception)),
+                    failed_at,
+                    dead_letter_id,
+                ),
+            )
+
+    def remove(self, dead_letter_id: int) -> None:
+        """Remove a page that was parsed successfully."""
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM dead_letters WHERE id = ?", (dead_letter_id,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+def reparse_dead_letters(
+    store: DeadLetterStore, feed_writer: EntityFeedWriter
+) -> Tuple[int, int]:
+    """Parse every stored page again with the current page parsers.
+
+    Pages that parse are written to the feeds and removed from the store,
+    while pages that fail again keep their new traceback.
+
+    Args:
+        store (DeadLetterStore): The pages to parse again.
+        feed_writer (EntityFeedWriter): Writes the parsed entities.
+
+    Returns:
+        Tuple[int, int]: Number of pages parsed and of pages failing again.
+
+    """
+    num_parsed = 0
+    num_failed = 0
+    for dead_letter in store.get_all():
+        parse_page = load_object(dead_letter.page_parser)
+        response = HtmlResponse(
+            url=dead_letter.url, body=dead_letter.body, encoding=dead_letter.encoding
+        )
+        try:
+            entities = run_page_parser(parse_page, response)
+        except Exception as exception:
+            store.record_failure(dead_letter.id, exception)
+            num_failed += 1
+            continue
+
+        for entity in entities:
+            feed_writer.write(entity)
+        store.remove(dead_letter.id)
+        num_parsed += 1
+
+    return num_parsed, num_failed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """List the pages that failed to parse, or parse them again."""
+    arg_parser = argparse.ArgumentParser(description=main.__doc__)
+    arg_parser.add_argument("command", choices=["list", "reparse"])
+    arg_parser.add_argument(
+        "--db", default="dead_letters.db", help="Path of the dead letter store"
+    )
+    arg_parser.add_argument(
+        "--output-dir", type=Path, default=Path("data"), help="Directory of the feeds"
+    )
+    arg_parser.add_argument(
+        "--output-format", default="jsonl", help="Format of the feeds, jsonl or csv"
+    )
+    args = arg_parser.parse_args(argv)
+
+    store = DeadLetterStore(args.db)
+    try:
+        if args.command == "list":
+            for dead_letter in store.get_all():
+                error = dead_letter.traceback.strip().splitlines()[-1]
+                print(
+                    f"{dead_letter.failed_at} {dead_letter.url} "
+                    f"{dead_letter.parser_class or dead_letter.page_parser}: {error}"
+                )
+        else:
+            with EntityFeedWriter(args.output_dir, args.output_format) as feed_writer:
+                num_parsed, num_failed = reparse_dead_letters(store, feed_writer)
+            print(f"Parsed {num_parsed} pages, {num_failed} still fail to parse")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
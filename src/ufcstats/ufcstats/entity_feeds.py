@@ -0,0 +1,102 @@
+"""Write parsed entities to a feed per entity type outside of a Scrapy crawl.
+
+Used by commands that parse stored pages again, so their output has the same
+files and format as the feeds a crawl writes, e.g. data/fights.jsonl.
+"""
+
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, Type
+
+from scrapy.exporters import BaseItemExporter, CsvItemExporter, JsonLinesItemExporter
+
+from ufcstats.spiders.constants import UFCSTATS_ALL_ENTITY_FEEDS as ALL_ENTITY_FEEDS
+
+# Formats that can be appended to, so feeds written by a crawl can be extended
+ENTITY_FEED_EXPORTERS: Dict[str, Callable[..., BaseItemExporter]] = {
+    "jsonl": JsonLinesItemExporter,
+    "jsonlines": JsonLinesItemExporter,
+    "csv": CsvItemExporter,
+}
+
+
+class EntityFeedWriter:
+    """Writes entities to <output_dir>/<feed name>.<output_format> per entity type.
+
+    Feed files are opened when the first entity of their type is written.
+    Unless overwriting, entities are appended and a CSV header is only
+    written to new files.
+
+    Args:
+        output_dir (Path): Directory to write the feeds to.
+        output_format (str): A format in ENTITY_FEED_EXPORTERS.
+        overwrite (bool): Whether to replace existing feed files.
+        entity_feeds (Optional[Dict[str, str]]): Feed name of each entity
+            dataclass by import path, ALL_ENTITY_FEEDS by default.
+
+    Raises:
+        ValueError: If the output format cannot be appended to.
+
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        output_format: str,
+        overwrite: bool = False,
+        entity_feeds: Optional[Dict[str, str]] = None,
+    ):
+        if output_format not in ENTITY_FEED_EXPORTERS:
+            raise ValueError(
+                f"Unsupported output format {output_format}, expected one of "
+                f"{', '.join(ENTITY_FEED_EXPORTERS)}"
+            )
+
+        self._output_dir = output_dir
+        self._output_format = output_format
+        self._overwrite = overwrite
+        self._entity_feeds = entity_feeds or ALL_ENTITY_FEEDS
+        self._exporters: Dict[str, Tuple[BinaryIO, BaseItemExporter]] = {}
+
+    def __enter__(self) -> "EntityFeedWriter":
+        """Use the writer as a context manager, closing every feed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Finish every feed and close their files."""
+        self.close()
+
+    def _get_exporter(self, feed_name: str) -> BaseItemExporter:
+        if feed_name not in self._exporters:
+            path = self._output_dir / f"{feed_name}.{self._output_format}"
+            is_new_file = (
+                self._overwrite or not path.exists() or path.stat().st_size == 0
+            )
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            file = open(path, "wb" if self._overwrite else "ab")
+            exporter_class = ENTITY_FEED_EXPORTERS[self._output_format]
+            if exporter_class is CsvItemExporter:
+                exporter = exporter_class(file, include_headers_line=is_new_file)
+            else:
+                exporter = exporter_class(file)
+            exporter.start_exporting()
+            self._exporters[feed_name] = (file, exporter)
+
+        return self._exporters[feed_name][1]
+
+    def write(self, entity: Any) -> None:
+        """Write an entity dataclass to the feed of its type."""
+        entity_class = f"{type(entity).__module__}.{type(entity).__qualname__}"
+        self._get_exporter(self._entity_feeds[entity_class]).export_item(entity)
+
+    def close(self) -> None:
+        """Finish every feed and close their files."""
+        for file, exporter in self._exporters.values():
+            exporter.finish_exporting()
+            file.close()
+        self._exporters.clear()
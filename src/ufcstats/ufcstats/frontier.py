@@ -0,0 +1,350 @@
+"""Crawl frontier shared by several crawler processes through one SQLite file.
+
+Each process runs the same spider with FrontierScheduler as its SCHEDULER.
+Requests are stored in the frontier rather than in memory, so every process
+claims the next request from one shared queue, and a request any process has
+seen, e.g. the events listing or an event found by another process, is
+never fetched twice. Processes can join a running crawl at any time.
+"""
+
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from time import time
+from typing import Any, List, Optional, Tuple
+from uuid import uuid4
+
+from scrapy import Request, Spider
+from scrapy.core.scheduler import BaseScheduler
+from scrapy.crawler import Crawler
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.request import RequestFingerprinterProtocol, request_from_dict
+
+FRONTIER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    id INTEGER PRIMARY KEY,
+    spider TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    url TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    request BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (spider, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS frontier_next
+    ON frontier (spider, status, priority DESC, id);
+"""
+
+# Request meta keys holding the frontier row a request was claimed from, and
+# the fingerprint it was claimed with
+FRONTIER_ID_META_KEY = "frontier_id"
+FRONTIER_FINGERPRINT_META_KEY = "frontier_fingerprint"
+
+
+class CrawlFrontier:
+    """SQLite-backed queue of requests and seen-set shared by crawler processes.
+
+    Each request is a row, unique per spider and request fingerprint, that is
+    pending until a worker claims it, then done or failed. A claim that is
+    not finished within the claim timeout, e.g. because its worker was
+    killed, can be claimed again by any worker. Every claim that ends with
+    the request returned to the queue, i.e. released, requeued to retry it
+    or expired, counts as an attempt, and a request is failed rather than
+    claimed again once it reaches the maximum number of attempts.
+
+    Args:
+        path (str | Path): Path of the SQLite database file.
+
+    Attributes:
+        _connection (sqlite3.Connection): Open connection to the database.
+
+    """
+
+    def __init__(self, path: str | Path):
+        # Waits for the write lock held by another process rather than failing
+        self._connection = sqlite3.connect(path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(FRONTIER_SCHEMA)
+
+    def add(
+        self, spider: str, fingerprint: str, url: str, priority: int, request: bytes
+    ) -> bool:
+        """Add a request unless any worker has already added it.
+
+        Args:
+            spider (str): Name of the spider the request is for.
+            fingerprint (str): Fingerprint identifying the request.
+            url (str): URL of the request.
+            priority (int): Priority of the request, higher is claimed first.
+            request (bytes): The serialised request.
+
+        Returns:
+            bool: True if the request was added, False if it was seen before.
+
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO frontier (spider, fingerprint, url, priority, request) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (spider, fingerprint) DO NOTHING",
+                (spider, fingerprint, url, priority, request),
+            )
+
+        return cursor.rowcount == 1
+
+    def requeue(self, frontier_id: int, priority: int, request: bytes) -> None:
+        """Return a claimed request to the queue, e.g. to retry it.
+
+        Args:
+            frontier_id (int): ID of the request's row.
+            priority (int): Priority of the request, higher is claimed first.
+            request (bytes): The serialised request to claim next time.
+
+        """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE frontier SET status = 'pending', worker = NULL, "
+                "attempts = attempts + 1, priority = ?, request = ? WHERE id = ?",
+                (priority, request, frontier_id),
+            )
+
+    def claim(
+        self, spider: str, worker: str, claim_timeout: float, max_attempts: int
+    ) -> Optional[Tuple[int, str, bytes]]:
+        """Atomically claim the pending request with the highest priority.
+
+        Args:
+            spider (str): Name of the spider to claim a request for.
+            worker (str): ID of the claiming worker.
+            claim_timeout (float): Seconds after which another worker's claim
+                is given up on.
+            max_attempts (int): Attempts after which a request is failed.
+
+        Returns:
+            Optional[Tuple[int, str, bytes]]: ID of the claimed row, the
+                request's fingerprint and the serialised request, or None if
+                no request is pending.
+
+        """
+        now = time()
+        with self._connection:
+            self._connection.execute(
+                "UPDATE frontier SET status = 'pending', worker = NULL, "
+                "attempts = attempts + 1 "
+                "WHERE spider = ? AND status = 'claimed' AND claimed_at < ?",
+                (spider, now - claim_timeout),
+            )
+            self._connection.execute(
+                "UPDATE frontier SET status = 'failed' "
+                "WHERE spider = ? AND status = 'pending' AND attempts >= ?",
+                (spider, max_attempts),
+            )
+            row: Optional[Tuple[int, str, bytes]] = self._connection.execute(
+                "UPDATE frontier SET status = 'claimed', worker = ?, claimed_at = ? "
+                "WHERE id = ("
+                "SELECT id FROM frontier WHERE spider = ? AND status = 'pending' "
+                "ORDER BY priority DESC, id LIMIT 1"
+                ") RETURNING id, fingerprint, request",
+                (worker, now, spider),
+            ).fetchone()
+
+        return row
+
+    def _set_status(self, frontier_id: int, status: str) -> bool:
+        with self._connection:
+            cursor = self._connection.execute(
+                "UPDATE frontier SET status = ? WHERE id = ? AND status = 'claimed'",
+                (status, frontier_id),
+            )
+
+        return cursor.rowcount == 1
+
+    def mark_done(self, frontier_id: int) -> bool:
+        """Mark a claimed request as parsed successfully.
+
+        Returns:
+            bool: False if the request was not claimed, e.g. already failed.
+
+        """
+        return self._set_status(frontier_id, "done")
+
+    def mark_failed(self, frontier_id: int) -> bool:
+        """Mark a claimed request as failed, so it is not claimed again.
+
+        Returns:
+            bool: False if the request was not claimed, e.g. already done.
+
+        """
+        return self._set_status(frontier_id, "failed")
+
+    def release(self, spider: str, worker: str) -> None:
+        """Return every request a worker still has claimed to the queue, as an attempt.
+
+        Args:
+            spider (str): Name of the spider the worker is running.
+            worker (str): ID of the worker.
+
+        """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE frontier SET status = 'pending', worker = NULL, "
+                "attempts = attempts + 1 "
+                "WHERE spider = ? AND status = 'claimed' AND worker = ?",
+                (spider, worker),
+            )
+
+    def has_unfinished(self, spider: str, worker: str) -> bool:
+        """Check whether requests are pending or claimed by other workers.
+
+        Requests claimed by other workers may still lead to new requests, so
+        a worker keeps waiting for them rather than closing its spider.
+
+        Args:
+            spider (str): Name of the spider to check.
+            worker (str): ID of the checking worker.
+
+        Returns:
+            bool: True if the crawl is not finished.
+
+        """
+        row = self._connection.execute(
+            "SELECT 1 FROM frontier WHERE spider = ? AND (status = 'pending' "
+            "OR (status = 'claimed' AND worker != ?)) LIMIT 1",
+            (spider, worker),
+        ).fetchone()
+
+        return row is not None
+
+    def count(self, spider: str, status: str) -> int:
+        """Count the requests of a spider with a status, e.g. failed."""
+        row: Tuple[int] = self._connection.execute(
+            "SELECT COUNT(*) FROM frontier WHERE spider = ? AND status = ?",
+            (spider, status),
+        ).fetchone()
+
+        return row[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+class FrontierScheduler(BaseScheduler):
+    """Scheduler storing requests in a CrawlFrontier at FRONTIER_DB.
+
+    Requests are fetched once per frontier, including requests with
+    dont_filter set such as start URLs, unless they are retried or
+    redirected by this worker. Requests that cannot be serialised, e.g.
+    because their callback is a lambda, are kept in memory by this worker.
+    The spider stays open while any worker has requests that may lead to
+    more, and requests still claimed on close are returned to the queue.
+
+    Args:
+        frontier (CrawlFrontier): The shared frontier.
+        crawler (Crawler): The crawler running the spider.
+
+    Attributes:
+        _worker (str): ID of this worker in the frontier.
+        _local_requests (List[Request]): Requests that could not be serialised.
+
+    """
+
+    def __init__(self, frontier: CrawlFrontier, crawler: Crawler):
+        self._frontier = frontier
+        self._stats: StatsCollector = crawler.stats  # type: ignore[assignment]
+        self._fingerprinter: RequestFingerprinterProtocol = (
+            crawler.request_fingerprinter  # type: ignore[assignment]
+        )
+        self._claim_timeout = crawler.settings.getfloat("FRONTIER_CLAIM_TIMEOUT_SECS")
+        self._max_attempts = crawler.settings.getint("FRONTIER_MAX_ATTEMPTS")
+        self._worker = f"{os.getpid()}-{uuid4().hex[:8]}"
+        self._local_requests: List[Request] = []
+        self._spider: Optional[Spider] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "FrontierScheduler":
+        """Create the scheduler with the frontier at FRONTIER_DB."""
+        return cls(CrawlFrontier(crawler.settings.get("FRONTIER_DB")), crawler)
+
+    @property
+    def _spider_name(self) -> str:
+        return self._spider.name if self._spider is not None else ""
+
+    def open(self, spider: Spider) -> None:
+        """Start claiming requests for the spider."""
+        self._spider = spider
+
+    def close(self, reason: str) -> None:
+        """Return this worker's unfinished claims to the queue and close the frontier."""
+        self._frontier.release(self._spider_name, self._worker)
+        self._frontier.close()
+
+    def has_pending_requests(self) -> bool:
+        """Whether any request is left to claim now or may be added later."""
+        return bool(self._local_requests) or self._frontier.has_unfinished(
+            self._spider_name, self._worker
+        )
+
+    def _serialise(self, request: Request) -> Optional[bytes]:
+        try:
+            return pickle.dumps(request.to_dict(spider=self._spider), protocol=4)
+        except (ValueError, AttributeError, pickle.PicklingError):
+            return None
+
+    def enqueue_request(self, request: Request) -> bool:
+        """Add a request to the frontier, or requeue it if it was claimed here."""
+        serialised_request = self._serialise(request)
+        if serialised_request is None:
+            self._local_requests.append(request)
+            self._stats.inc_value("frontier/local", spider=self._spider)
+            return True
+
+        fingerprint = self._fingerprinter.fingerprint(request).hex()
+        frontier_id: Optional[int] = request.meta.get(FRONTIER_ID_META_KEY)
+        claimed_fingerprint = request.meta.get(FRONTIER_FINGERPRINT_META_KEY)
+        if frontier_id is not None and claimed_fingerprint == fingerprint:
+            # A retry of a request this worker claimed
+            self._frontier.requeue(frontier_id, request.priority, serialised_request)
+            self._stats.inc_value("frontier/requeued", spider=self._spider)
+            return True
+        if frontier_id is not None:
+            # A redirect, which is added as a request of its own
+            self._frontier.mark_done(frontier_id)
+
+        is_added = self._frontier.add(
+            self._spider_name,
+            fingerprint,
+            request.url,
+            request.priority,
+            serialised_request,
+        )
+        if not is_added:
+            self._stats.inc_value("frontier/seen", spider=self._spider)
+            return False
+
+        self._stats.inc_value("frontier/enqueued", spider=self._spider)
+        return True
+
+    def next_request(self) -> Optional[Request]:
+        """Claim the next request from the frontier."""
+        if self._local_requests:
+            return self._local_requests.pop()
+
+        claimed = self._frontier.claim(
+            self._spider_name, self._worker, self._claim_timeout, self._max_attempts
+        )
+        if claimed is None:
+            return None
+
+        frontier_id, fingerprint, serialised_request = claimed
+        request_dict: Any = pickle.loads(serialised_request)
+        request = request_from_dict(request_dict, spider=self._spider)
+        request.meta[FRONTIER_ID_META_KEY] = frontier_id
+        request.meta[FRONTIER_FINGERPRINT_META_KEY] = fingerprint
+        self._stats.inc_value("frontier/claimed", spider=self._spider)
+
+        return request
@@ -0,0 +1,474 @@
+"""HTTP cache policy and single-file storage for ufcstats.com pages.
+
+Completed event and fight pages never change once published, while event
+listings, fighter pages and the pages of upcoming events and fights are
+updated after every event. The policy keeps the former forever and
+revalidates the latter after a configurable TTL. Whether a page is completed
+is checked once, when it is stored, and kept in a header of the cached
+response, so serving it from the cache does not parse it.
+
+The storage keeps every cached response of every spider in one SQLite file,
+with compressed bodies, instead of a directory of files per response. Each
+request is cached once, whichever spider made it, so a page fetched by one
+spider is served from the cache to the others. The
+file is copied as a single artifact, or converted from and to the filesystem
+storage's directories with:
+
+    python -m ufcstats.httpcache import .scrapy/httpcache
+    python -m ufcstats.httpcache export ci-cache.db
+
+"""
+
+import argparse
+from dataclasses import dataclass, replace
+from pathlib import Path
+import pickle
+import sqlite3
+from time import time
+from typing import Iterator, List, Optional
+
+from scrapy import Spider
+from scrapy.extensions.httpcache import RFC2616Policy
+from scrapy.http import Headers, Request, Response, TextResponse
+from scrapy.responsetypes import responsetypes
+from scrapy.settings import BaseSettings
+from scrapy.utils.project import data_path
+from scrapy.utils.python import to_bytes
+from scrapy.utils.request import RequestFingerprinterProtocol
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+from response_archive import compress_body, decompress_body
+from ufcstats.parsers.base_parser import CssQueries
+from ufcstats.spiders.constants import NEXT_FIGHT_FLAG
+
+SQLITE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    fingerprint TEXT PRIMARY KEY,
+    spider TEXT NOT NULL,
+    url TEXT NOT NULL,
+    method TEXT NOT NULL,
+    request_body BLOB NOT NULL,
+    status INTEGER NOT NULL,
+    response_url TEXT NOT NULL,
+    headers BLOB NOT NULL,
+    body BLOB NOT NULL,
+    timestamp REAL NOT NULL
+);
+"""
+
+# Header added to cached event and fight pages, b"1" if they show results
+COMPLETED_PAGE_HEADER = b"X-Ufcstats-Completed-Page"
+
+
+def is_completed_page(response: Response) -> bool:
+    """Check whether an event or fight page shows the results of its fights.
+
+    A fight page is completed once its fighters have an outcome, and an event
+    page once every fight on it has one, rather than the flag of a fight
+    that has not taken place yet.
+
+    Args:
+        response (Response): An event or fight page response.
+
+    Returns:
+        bool: True if the page shows results and will no longer change.
+
+    """
+    if not isinstance(response, TextResponse):
+        return False
+
+    if "fight-details" in response.url:
+        outcomes = response.css(CssQueries.fight_outcomes_query).getall()
+    else:
+        outcomes = response.css(CssQueries.event_fight_outcomes_query).getall()
+    outcomes = [outcome.strip().lower() for outcome in outcomes]
+
+    return any(outcomes) and NEXT_FIGHT_FLAG not in outcomes
+
+
+class UfcStatsCachePolicy(RFC2616Policy):
+    """Cache policy treating completed event and fight pages as immutable.
+
+    Responses for URLs matching HTTPCACHE_PERMANENT_URL_PATTERNS are always
+    served from the cache once they show the results of their fights, which
+    is recorded in their COMPLETED_PAGE_HEADER when they are stored. Pages
+    cached without the header are revalidated like other pages, and stored
+    with it when refetched. Pages
+    of upcoming events and fights, and any other cached response, are fresh for
+    HTTPCACHE_TTL_SECS, or until it is requested with Cache-Control: no-cache.
+    It is then revalidated with If-None-Match and If-Modified-Since when the
+    cached response has an ETag or Last-Modified header, and refetched
+    otherwise.
+
+    ufcstats.com responses carry no expiry hints, so every successful response
+    is stored rather than relying on Cache-Control headers.
+
+    Args:
+        settings (BaseSettings): The crawler settings.
+
+    Attributes:
+        permanent_url_patterns (List[str]): URL substrings of pages that never change.
+        ttl_secs (int): Seconds before other cached pages are revalidated.
+
+    """
+
+    def __init__(self, settings: BaseSettings):
+        super().__init__(settings)
+        self.permanent_url_patterns: List[str] = settings.getlist(
+            "HTTPCACHE_PERMANENT_URL_PATTERNS"
+        )
+        self.ttl_secs: int = settings.getint("HTTPCACHE_TTL_SECS")
+
+    def _is_permanent_url(self, request: Request) -> bool:
+        return any(pattern in request.url for pattern in self.permanent_url_patterns)
+
+    def _is_permanent(self, response: Response, request: Request) -> bool:
+        return (
+            self._is_permanent_url(request)
+            and response.headers.get(COMPLETED_PAGE_HEADER) == b"1"
+        )
+
+    def should_cache_response(self, response: Response, request: Request) -> bool:
+        """Cache every successful response, flagging whether pages are completed."""
+        if response.status != 200:
+            return False
+
+        if self._is_permanent_url(request):
+            is_completed = is_completed_page(response)
+            response.headers[COMPLETED_PAGE_HEADER] = b"1" if is_completed else b"0"
+        return True
+
+    def is_cached_response_fresh(
+        self, cachedresponse: Response, request: Request
+    ) -> bool:
+        """Check whether a cached response can be used without contacting the site."""
+        if self._is_permanent(cachedresponse, request):
+            return True
+
+        is_no_cache = b"no-cache" in self._parse_cachecontrol(request)
+        current_age = self._compute_current_age(cachedresponse, request, time())
+        if current_age < self.ttl_secs and not is_no_cache:
+            return True
+
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A response cached for a request.
+
+    Attributes:
+        spider (str): Name of the spider that last cached a response to the
+            request.
+        fingerprint (str): Hex fingerprint of the request.
+        url (str): URL of the request.
+        method (str): HTTP method of the request.
+        request_body (bytes): Body of the request, e.g. a GraphQL query.
+        status (int): HTTP status of the response.
+        response_url (str): URL of the response.
+        headers (bytes): Raw headers of the response.
+        body (bytes): Uncompressed body of the response.
+        timestamp (float): When the response was cached.
+
+    """
+
+    spider: str
+    fingerprint: str
+    url: str
+    method: str
+    request_body: bytes
+    status: int
+    response_url: str
+    headers: bytes
+    body: bytes
+    timestamp: float
+
+
+class SqliteHttpCache:
+    """SQLite file of cached responses, one per request fingerprint.
+
+    Bodies are compressed with zstd when zstandard is installed, and gzip
+    otherwise. Several crawler processes can share the file.
+
+    Args:
+        path (str | Path): Path of the SQLite database file.
+
+    Attributes:
+        _connection (sqlite3.Connection): Open connection to the database.
+
+    """
+
+    def __init__(self, path: str | Path):
+        # Waits for the write lock held by another process rather than failing
+        self._connection = sqlite3.connect(path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SQLITE_CACHE_SCHEMA)
+
+    def get(self, fingerprint: str) -> Optional[CacheEntry]:
+        """Get the response cached for a request, or None if it is not cached."""
+        row = self._connection.execute(
+            "SELECT spider, fingerprint, url, method, request_body, status, "
+            "response_url, headers, body, timestamp FROM responses "
+            "WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        entry = CacheEntry(*row)
+        return replace(entry, body=decompress_body(entry.body))
+
+    def put(self, entry: CacheEntry) -> None:
+        """Cache a response, unless a more recently cached one is stored."""
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO responses (spider, fingerprint, url, method, "
+                "request_body, status, response_url, headers, body, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (fingerprint) DO UPDATE SET spider = excluded.spider, "
+                "url = excluded.url, method = excluded.method, "
+                "request_body = excluded.request_body, "
+                "status = excluded.status, response_url = excluded.response_url, "
+                "headers = excluded.headers, body = excluded.body, "
+                "timestamp = excluded.timestamp "
+                "WHERE excluded.timestamp >= responses.timestamp",
+                (
+                    entry.spider,
+                    entry.fingerprint,
+                    entry.url,
+                    entry.method,
+                    entry.request_body,
+                    entry.status,
+                    entry.response_url,
+                    entry.headers,
+                    compress_body(entry.body)[0],
+                    entry.timestamp,
+                ),
+            )
+
+    def get_all(
+        self, spider: Optional[str] = None, with_bodies: bool = True
+    ) -> Iterator[CacheEntry]:
+        """Iterate over every cached response, or those of a spider.
+
+        Args:
+            spider (Optional[str]): Only responses last cached by this spider.
+            with_bodies (bool): Whether to read the bodies, which are empty
+                otherwise, e.g. to read them later with get_body.
+
+        """
+        body_column = "body" if with_bodies else "x''"
+        cursor = self._connection.execute(
+            "SELECT spider, fingerprint, url, method, request_body, status, "
+            f"response_url, headers, {body_column}, timestamp FROM responses "
+            "WHERE spider = ? OR ? IS NULL ORDER BY fingerprint",
+            (spider, spider),
+        )
+        for row in cursor:
+            entry = CacheEntry(*row)
+            yield replace(entry, body=decompress_body(entry.body))
+
+    def get_body(self, fingerprint: str) -> bytes:
+        """Get the uncompressed body of a cached response.
+
+        Raises:
+            KeyError: If no response is cached for the request.
+
+        """
+        row = self._connection.execute(
+            "SELECT body FROM responses WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No response cached for {fingerprint}")
+
+        return decompress_body(row[0])
+
+    def copy_to(self, path: str | Path) -> None:
+        """Write a compacted copy of the cache to a new file, e.g. to upload it."""
+        self._connection.execute("VACUUM INTO ?", (str(path),))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+def get_sqlite_cache_path(settings: BaseSettings) -> Path:
+    """Get the SQLite cache file, HTTPCACHE_DIR with a .db suffix in the data dir."""
+    return Path(data_path(f"{settings['HTTPCACHE_DIR']}.db", createdir=False))
+
+
+class SqliteCacheStorage:
+    """HTTPCACHE_STORAGE keeping every spider's responses in one SqliteHttpCache.
+
+    A response cached by one spider is served to any spider making the same
+    request. Responses older than HTTPCACHE_EXPIRATION_SECS, if set, are not
+    served.
+
+    Args:
+        settings (BaseSettings): The crawler settings.
+
+    Attributes:
+        path (Path): Path of the SQLite database file.
+        expiration_secs (int): Seconds a response is served for, or 0 for ever.
+
+    """
+
+    def __init__(self, settings: BaseSettings):
+        self.path = get_sqlite_cache_path(settings)
+        self.expiration_secs: int = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        self._cache: Optional[SqliteHttpCache] = None
+        self._fingerprinter: Optional[RequestFingerprinterProtocol] = None
+
+    def open_spider(self, spider: Spider) -> None:
+        """Open the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache = SqliteHttpCache(self.path)
+        self._fingerprinter = spider.crawler.request_fingerprinter
+
+    def close_spider(self, spider: Spider) -> None:
+        """Close the cache file."""
+        if self._cache is not None:
+            self._cache.close()
+
+    def _get_fingerprint(self, request: Request) -> str:
+        assert self._fingerprinter is not None
+        return self._fingerprinter.fingerprint(request).hex()
+
+    def retrieve_response(self, spider: Spider, request: Request) -> Optional[Response]:
+        """Get the response cached for a request, or None if missing or expired."""
+        assert self._cache is not None
+        entry = self._cache.get(self._get_fingerprint(request))
+        if entry is None or 0 < self.expiration_secs < time() - entry.timestamp:
+            return None
+
+        headers = Headers(headers_raw_to_dict(entry.headers))
+        response_class = responsetypes.from_args(
+            headers=headers, url=entry.response_url, body=entry.body
+        )
+        return response_class(
+            url=entry.response_url,
+            headers=headers,
+            status=entry.status,
+            body=entry.body,
+        )
+
+    def store_response(
+        self, spider: Spider, request: Request, response: Response
+    ) -> None:
+        """Cache a response to a request."""
+        assert self._cache is not None
+        self._cache.put(
+            CacheEntry(
+                spider.name,
+                self._get_fingerprint(request),
+                request.url,
+                request.method,
+                request.body,
+                response.status,
+                response.url,
+                headers_dict_to_raw(response.headers) or b"",
+                response.body,
+                time(),
+            )
+        )
+
+
+def _read_cache_file(path: Path) -> bytes:
+    # The filesystem storage gzips every file with HTTPCACHE_GZIP
+    return decompress_body(path.read_bytes()) if path.exists() else b""
+
+
+def iter_filesystem_cache(cache_dir: Path) -> Iterator[CacheEntry]:
+    """Iterate over every response in a filesystem storage HTTPCACHE_DIR."""
+    for meta_path in sorted(cache_dir.glob("*/*/*/pickled_meta")):
+        entry_dir = meta_path.parent
+        metadata = pickle.loads(_read_cache_file(meta_path))
+        yield CacheEntry(
+            entry_dir.parent.parent.name,
+            entry_dir.name,
+            metadata["url"],
+            metadata["method"],
+            _read_cache_file(entry_dir / "request_body"),
+            metadata["status"],
+            metadata["response_url"],
+            _read_cache_file(entry_dir / "response_headers"),
+            _read_cache_file(entry_dir / "response_body"),
+            metadata["timestamp"],
+        )
+
+
+def write_filesystem_cache(entry: CacheEntry, cache_dir: Path) -> None:
+    """Write a response to a HTTPCACHE_DIR in the filesystem storage's layout."""
+    entry_dir = cache_dir / entry.spider / entry.fingerprint[:2] / entry.fingerprint
+    entry_dir.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "url": entry.url,
+        "method": entry.method,
+        "status": entry.status,
+        "response_url": entry.response_url,
+        "timestamp": entry.timestamp,
+    }
+    (entry_dir / "meta").write_bytes(to_bytes(repr(metadata)))
+    (entry_dir / "pickled_meta").write_bytes(pickle.dumps(metadata, protocol=4))
+    (entry_dir / "response_headers").write_bytes(entry.headers)
+    (entry_dir / "response_body").write_bytes(entry.body)
+    (entry_dir / "request_headers").write_bytes(b"")
+    (entry_dir / "request_body").write_bytes(entry.request_body)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Import responses into the SQLite HTTP cache, or export them from it."""
+    arg_parser = argparse.ArgumentParser(description=main.__doc__)
+    arg_parser.add_argument(
+        "command",
+        choices=["import", "export"],
+        help="import from, or export to, a filesystem HTTPCACHE_DIR or SQLite file",
+    )
+    arg_parser.add_argument(
+        "path", type=Path, help="HTTPCACHE_DIR directory, or .db SQLite cache file"
+    )
+    arg_parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(".scrapy/httpcache.db"),
+        help="Path of the SQLite HTTP cache",
+    )
+    arg_parser.add_argument("--spider", help="Only export responses of a spider")
+    args = arg_parser.parse_args(argv)
+    is_sqlite_path = args.path.suffix == ".db"
+    if is_sqlite_path and args.spider is not None:
+        arg_parser.error("--spider only applies to exports to a HTTPCACHE_DIR")
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    cache = SqliteHttpCache(args.db)
+    try:
+        num_entries = 0
+        if args.command == "import" and is_sqlite_path:
+            # Merged rather than copied, so the newest response of each request wins
+            source_cache = SqliteHttpCache(args.path)
+            for entry in source_cache.get_all():
+                cache.put(entry)
+                num_entries += 1
+            source_cache.close()
+            print(f"Imported {num_entries} responses from {args.path} to {args.db}")
+        elif args.command == "import":
+            for entry in iter_filesystem_cache(args.path):
+                cache.put(entry)
+                num_entries += 1
+            print(f"Imported {num_entries} responses from {args.path} to {args.db}")
+        elif is_sqlite_path:
+            cache.copy_to(args.path)
+            print(f"Copied {args.db} to {args.path}")
+        else:
+            for entry in cache.get_all(args.spider):
+                write_filesystem_cache(entry, args.path)
+                num_entries += 1
+            print(f"Exported {num_entries} responses from {args.db} to {args.path}")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,26 @@ See documentation in:
 https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 """
 
+from hashlib import sha1
+from typing import Any, Dict, Iterable, List, Optional
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.misc import load_object
+
+from ufcstats.crawl_state import CrawlStateStore
+from ufcstats.dead_letters import DeadLetterStore
+from ufcstats.frontier import CrawlFrontier, FRONTIER_ID_META_KEY, FrontierScheduler
+from ufcstats.parsers.base_parser import CssQueries
+from ufcstats.parsers.html_trim import trim_html
+from ufcstats.sharding import get_shard, get_spider_shard
+from utils import get_uuid_string
+
+# Hash of a changed fighter page's content, recorded once its Fighter is scraped
+CONTENT_HASH_META_KEY = "content_hash"
 
 # useful for handling different item types with a single interface
 
@@ -101,3 +121,355 @@ class UfcScraperDownloaderMiddleware:
 
     # def spider_opened(self, spider):
     #     spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class IncrementalCrawlMiddleware:
+    """Spider middleware that skips event, fight and fighter pages crawled on earlier runs.
+
+    Enabled with the INCREMENTAL_CRAWL setting. Records every event, fight and
+    fighter URL in a CrawlStateStore at CRAWL_STATE_DB, together with when it
+    was fetched and whether its callback finished without raising. Requests to
+    pages that are already complete for the spider are dropped, so only new
+    or previously failed pages are fetched.
+
+    Fighters linked from each newly parsed fight page are marked stale, so an
+    incremental fighter crawl only refreshes fighters who have fought since
+    the last run, plus fighters it has not seen before. Stale pages are
+    requested with Cache-Control: no-cache to bypass the HTTP cache.
+    """
+
+    TRACKED_URL_PATTERNS = ("event-details", "fight-details", "fighter-details")
+
+    def __init__(self, state_store: CrawlStateStore, stats: StatsCollector):
+        self._state_store = state_store
+        self._stats = stats
+        self._css_queries = CssQueries()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "IncrementalCrawlMiddleware":
+        """Create the middleware if incremental crawling is enabled."""
+        if not crawler.settings.getbool("INCREMENTAL_CRAWL"):
+            raise NotConfigured
+
+        state_store = CrawlStateStore(crawler.settings.get("CRAWL_STATE_DB"))
+        middleware = cls(state_store, crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def _is_tracked(self, url: str) -> bool:
+        return any(pattern in url for pattern in self.TRACKED_URL_PATTERNS)
+
+    def process_spider_output(
+        self, response: Response, result: Iterable[Any], spider: Spider
+    ) -> Iterable[Any]:
+        """Drop requests to complete pages and record the response as parsed."""
+        is_tracked_response = self._is_tracked(response.url)
+        try:
+            for item_or_request in result:
+                if isinstance(item_or_request, Request) and self._is_tracked(
+                    item_or_request.url
+                ):
+                    if self._state_store.is_complete(spider.name, item_or_request.url):
+                        self._stats.inc_value("incremental/skipped", spider=spider)
+                        continue
+                    if is_tracked_response:
+                        self._state_store.record_discovered(
+                            spider.name, item_or_request.url, response.url
+                        )
+                    if self._state_store.is_stale(spider.name, item_or_request.url):
+                        item_or_request.headers["Cache-Control"] = "no-cache"
+                        self._stats.inc_value("incremental/stale", spider=spider)
+                yield item_or_request
+        except Exception:
+            if is_tracked_response:
+                self._state_store.record_fetched(spider.name, response.url, False)
+            raise
+
+        if is_tracked_response:
+            self._state_store.record_fetched(spider.name, response.url, True)
+            self._stats.inc_value("incremental/parsed", spider=spider)
+
+        if "fight-details" in response.url:
+            self._mark_fighters_stale(response)
+
+    def _mark_fighters_stale(self, response: Response) -> None:
+        fighter_urls = response.css(self._css_queries.fighter_urls_query).getall()
+        for fighter_url in fighter_urls:
+            self._state_store.mark_stale(fighter_url)
+
+    def process_spider_exception(
+        self, response: Response, exception: Exception, spider: Spider
+    ) -> None:
+        """Record the response as failed so it is fetched again on the next run."""
+        if self._is_tracked(response.url):
+            self._state_store.record_fetched(spider.name, response.url, False)
+            self._stats.inc_value("incremental/failed", spider=spider)
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the crawl state store."""
+        self._state_store.close()
+
+
+class ShardMiddleware:
+    """Spider middleware that only follows the event and fighter pages in the spider's shard.
+
+    Active for spiders run with the shard and num_shards arguments. Requests
+    to event and fighter pages in other shards are dropped, as are items for
+    those pages built from listings, e.g. by the listing fast path. Pages
+    reached from a followed page, such as an event's fights, are always kept.
+    """
+
+    SHARDED_URL_PATTERNS = ("event-details", "fighter-details")
+
+    def __init__(self, stats: StatsCollector):
+        self._stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ShardMiddleware":
+        """Create the middleware."""
+        return cls(crawler.stats)
+
+    def _is_in_other_shard(self, url: str, shard: int, num_shards: int) -> bool:
+        return (
+            any(pattern in url for pattern in self.SHARDED_URL_PATTERNS)
+            and get_shard(url, num_shards) != shard
+        )
+
+    def process_spider_output(
+        self, response: Response, result: Iterable[Any], spider: Spider
+    ) -> Iterable[Any]:
+        """Drop requests and items for event and fighter pages in other shards."""
+        spider_shard = get_spider_shard(spider)
+        if spider_shard is None:
+            yield from result
+            return
+
+        for item_or_request in result:
+            url = getattr(item_or_request, "url", None)
+            if url is not None and self._is_in_other_shard(url, *spider_shard):
+                self._stats.inc_value("shard/skipped", spider=spider)
+                continue
+            yield item_or_request
+
+
+def is_frontier_scheduled(crawler: Crawler) -> bool:
+    """Check whether the crawler's SCHEDULER is a FrontierScheduler."""
+    # Any scheduler counts as a subclass of BaseScheduler subclasses, so check
+    # its bases instead
+    return FrontierScheduler in load_object(crawler.settings["SCHEDULER"]).__mro__
+
+
+class FrontierMiddleware:
+    """Spider middleware that marks requests claimed from a shared CrawlFrontier as done or failed.
+
+    Enabled when SCHEDULER is a FrontierScheduler. A claimed request is done
+    once its callback finishes without raising, and failed otherwise, or if
+    the request is dropped by the scheduler, so no worker claims it again.
+    """
+
+    def __init__(self, frontier: CrawlFrontier, stats: StatsCollector):
+        self._frontier = frontier
+        self._stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "FrontierMiddleware":
+        """Create the middleware if requests are scheduled through a frontier."""
+        if not is_frontier_scheduled(crawler):
+            raise NotConfigured
+
+        frontier = CrawlFrontier(crawler.settings.get("FRONTIER_DB"))
+        middleware = cls(frontier, crawler.stats)
+        crawler.signals.connect(
+            middleware.request_dropped, signal=signals.request_dropped
+        )
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def _mark_failed(self, meta: Dict[str, Any], spider: Spider) -> None:
+        frontier_id = meta.get(FRONTIER_ID_META_KEY)
+        if frontier_id is not None and self._frontier.mark_failed(frontier_id):
+            self._stats.inc_value("frontier/failed", spider=spider)
+
+    def process_spider_output(
+        self, response: Response, result: Iterable[Any], spider: Spider
+    ) -> Iterable[Any]:
+        """Mark the response's request as done once its callback has finished."""
+        try:
+            yield from result
+        except Exception:
+            self._mark_failed(response.meta, spider)
+            raise
+
+        frontier_id = response.meta.get(FRONTIER_ID_META_KEY)
+        if frontier_id is not None and self._frontier.mark_done(frontier_id):
+            self._stats.inc_value("frontier/done", spider=spider)
+
+    def process_spider_exception(
+        self, response: Response, exception: Exception, spider: Spider
+    ) -> None:
+        """Mark the response's request as failed."""
+        self._mark_failed(response.meta, spider)
+
+    def request_dropped(self, request: Request, spider: Spider) -> None:
+        """Mark a claimed request the scheduler dropped as failed."""
+        self._mark_failed(request.meta, spider)
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the frontier."""
+        self._frontier.close()
+
+
+class FrontierDownloaderMiddleware:
+    """Downloader middleware that marks claimed requests that failed to download as failed.
+
+    Enabled when SCHEDULER is a FrontierScheduler. Runs after RetryMiddleware,
+    so only requests that are not retried, e.g. once their retries are used
+    up or because they were ignored, are failed rather than left claimed.
+    """
+
+    def __init__(self, frontier: CrawlFrontier, stats: StatsCollector):
+        self._frontier = frontier
+        self._stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "FrontierDownloaderMiddleware":
+        """Create the middleware if requests are scheduled through a frontier."""
+        if not is_frontier_scheduled(crawler):
+            raise NotConfigured
+
+        frontier = CrawlFrontier(crawler.settings.get("FRONTIER_DB"))
+        middleware = cls(frontier, crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        """Mark the request as failed, leaving the exception to be handled."""
+        frontier_id = request.meta.get(FRONTIER_ID_META_KEY)
+        if frontier_id is not None and self._frontier.mark_failed(frontier_id):
+            self._stats.inc_value("frontier/failed", spider=spider)
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the frontier."""
+        self._frontier.close()
+
+
+class DeadLetterMiddleware:
+    """Spider middleware that keeps each page a page parser raised on in a DeadLetterStore.
+
+    Enabled with the DEAD_LETTER_ENABLED setting. The response body, URL,
+    page parser, failing Parser subclass and traceback are stored at
+    DEAD_LETTER_DB, created on the first failure, so the pages can be parsed
+    again offline once the parser is fixed. Exceptions are passed on, so they
+    are still logged and counted as spider errors.
+    """
+
+    def __init__(self, path: str, stats: StatsCollector):
+        self._path = path
+        self._stats = stats
+        self._store: Optional[DeadLetterStore] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "DeadLetterMiddleware":
+        """Create the middleware if dead letters are enabled."""
+        if not crawler.settings.getbool("DEAD_LETTER_ENABLED"):
+            raise NotConfigured
+
+        middleware = cls(crawler.settings.get("DEAD_LETTER_DB"), crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def process_spider_exception(
+        self, response: Response, exception: Exception, spider: Spider
+    ) -> None:
+        """Store the response if a page parser raised the exception."""
+        page_parser = getattr(exception, "page_parser", None)
+        if page_parser is None:
+            return
+
+        if self._store is None:
+            self._store = DeadLetterStore(self._path)
+        self._store.add(spider.name, response, page_parser, exception)
+        self._stats.inc_value("dead_letter/stored", spider=spider)
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the dead letter store."""
+        if self._store is not None:
+            self._store.close()
+
+
+def skip_unchanged_page(response: Response, **kwargs: Any) -> List[Any]:
+    """Callback for pages that have not changed since they were last parsed."""
+    return []
+
+
+class FighterChangeDetectionMiddleware:
+    """Downloader middleware that skips parsing fighter pages that have not changed.
+
+    Enabled with the FIGHTER_CHANGE_DETECTION setting. The content section of
+    each fighter page, as trimmed for parsing, is hashed and compared with
+    the hash recorded for the fighter_id in the CrawlStateStore at
+    CRAWL_STATE_DB. An unchanged page is passed to skip_unchanged_page
+    instead of its callback, so it is neither parsed nor emitted, but spider
+    middlewares still see it as parsed. A changed page's hash is only
+    recorded once its Fighter has been scraped, so a page that fails to parse
+    is parsed again on the next run.
+
+    Not used with LISTING_FAST_PATH, which already only fetches fighter pages
+    whose listing row has changed, and needs every fetched page parsed.
+    """
+
+    def __init__(self, state_store: CrawlStateStore, stats: StatsCollector):
+        self._state_store = state_store
+        self._stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "FighterChangeDetectionMiddleware":
+        """Create the middleware if change detection is enabled."""
+        if not crawler.settings.getbool(
+            "FIGHTER_CHANGE_DETECTION"
+        ) or crawler.settings.getbool("LISTING_FAST_PATH"):
+            raise NotConfigured
+
+        state_store = CrawlStateStore(crawler.settings.get("CRAWL_STATE_DB"))
+        middleware = cls(state_store, crawler.stats)
+        crawler.signals.connect(middleware.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+
+        return middleware
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        """Send an unchanged fighter page to skip_unchanged_page."""
+        if "fighter-details" not in response.url or response.status != 200:
+            return response
+
+        content_hash = sha1(trim_html(response.body)).hexdigest()
+        fighter_id = get_uuid_string(response.url)
+        if self._state_store.get_content_hash(fighter_id) == content_hash:
+            self._stats.inc_value("change_detection/unchanged", spider=spider)
+            return response.replace(
+                request=request.replace(callback=skip_unchanged_page)
+            )
+
+        self._stats.inc_value("change_detection/changed", spider=spider)
+        request.meta[CONTENT_HASH_META_KEY] = content_hash
+        return response
+
+    def item_scraped(self, item: Any, response: Response, spider: Spider) -> None:
+        """Record the content hash of the changed fighter page an item came from."""
+        content_hash = response.meta.get(CONTENT_HASH_META_KEY)
+        if content_hash is not None:
+            self._state_store.record_content_hash(
+                get_uuid_string(response.url), content_hash
+            )
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Close the crawl state store."""
+        self._state_store.close()
@@ -0,0 +1,229 @@
+"""Run ufcstats.com page parsers in a pool of worker processes.
+
+Parsing a fight page with parsel/lxml blocks the reactor thread, so while a
+page is parsed nothing is downloaded, scheduled or exported. With the pool
+enabled, response bodies are sent to worker processes and the parsed entity
+dataclasses come back as Deferreds, so parse-heavy runs (e.g. replaying the
+HTTP cache with throttling off) use every core.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+from types import TracebackType
+from typing import Any, Callable, cast, List, Optional
+
+from scrapy import signals
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse, Response, TextResponse
+from twisted.internet import defer
+from twisted.internet.interfaces import IReactorFromThreads
+
+from ufcstats.parsers.base_parser import Parser
+from ufcstats.parsers.html_trim import (
+    is_html_trim_enabled,
+    set_html_trim,
+    trim_response,
+)
+from ufcstats.parsers.parser_backends import set_parser_backend
+
+# A module-level function, so it can be pickled and sent to a worker process
+PageParser = Callable[[Response], List[Any]]
+
+
+def get_page_parser_name(parse_page: PageParser) -> str:
+    """Get the import path of a page parser, e.g. to run it again later."""
+    return f"{parse_page.__module__}.{parse_page.__qualname__}"
+
+
+def get_response_encoding(response: Response) -> str:
+    """Get the encoding of a response body, utf-8 if it is not a TextResponse."""
+    if isinstance(response, TextResponse):
+        return response.encoding
+
+    return "utf-8"
+
+
+def _get_parser_class_name(traceback: Optional[TracebackType]) -> Optional[str]:
+    # The innermost Parser method in the traceback is where parsing failed
+    parser_class_name = None
+    while traceback is not None:
+        instance = traceback.tb_frame.f_locals.get("self")
+        if isinstance(instance, Parser):
+            parser_class_name = type(instance).__name__
+        traceback = traceback.tb_next
+
+    return parser_class_name
+
+
+def init_parser_process(parser_backend: str, html_trim: bool = False) -> None:
+    """Set up the parser backend and HTML trimming of a process running page parsers.
+
+    Args:
+        parser_backend (str): Name of the parser backend parsers use.
+        html_trim (bool): Whether fight and fighter pages are trimmed to their
+            content section before parsing.
+
+    """
+    set_parser_backend(parser_backend)
+    set_html_trim(html_trim)
+
+
+def run_page_parser(parse_page: PageParser, response: Response) -> List[Any]:
+    """Run a page parser, recording which parser failed on any exception raised.
+
+    Pages are trimmed to their content section first if enabled with
+    set_html_trim. The exception gets a page_parser attribute with the page
+    parser's import path, and a parser_class attribute with the name of the
+    Parser subclass that raised it, or None if it was raised outside a
+    parser. Both survive being sent back from a worker process.
+
+    Args:
+        parse_page (PageParser): Module-level function parsing a response
+            into entity dataclasses.
+        response (Response): The response to parse.
+
+    Returns:
+        List[Any]: The parsed entities.
+
+    """
+    if is_html_trim_enabled():
+        response = trim_response(response)
+
+    try:
+        return parse_page(response)
+    except Exception as exception:
+        exception.page_parser = get_page_parser_name(  # type: ignore[attr-defined]
+            parse_page
+        )
+        exception.parser_class = _get_parser_class_name(  # type: ignore[attr-defined]
+            exception.__traceback__
+        )
+        raise
+
+
+def _parse_in_worker(
+    parse_page: PageParser, url: str, body: bytes, encoding: str
+) -> List[Any]:
+    response = HtmlResponse(url=url, body=body, encoding=encoding)
+    return run_page_parser(parse_page, response)
+
+
+class ParserPool:
+    """Runs page parsers in worker processes, or inline when disabled.
+
+    Enabled with the PARSER_POOL_ENABLED setting, using PARSER_POOL_MAX_WORKERS
+    processes (one per core by default). Workers are started with spawn, as
+    forking a process running the reactor's threads is unsafe. The pool is
+    shut down when the spider closes. Parsers use the PARSER_BACKEND selector
+    backend, and get pages trimmed to their content section with
+    PARSER_TRIM_HTML, both inline and in the workers.
+
+    Args:
+        max_workers (Optional[int]): Number of worker processes, or None to
+            parse on the reactor thread.
+        parser_backend (str): Name of the parser backend workers use.
+        html_trim (bool): Whether workers trim pages before parsing.
+
+    Attributes:
+        _executor (Optional[ProcessPoolExecutor]): The worker pool, started on
+            first use.
+
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int],
+        parser_backend: str = "parsel",
+        html_trim: bool = False,
+    ):
+        self._max_workers = max_workers
+        self._parser_backend = parser_backend
+        self._html_trim = html_trim
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ParserPool":
+        """Create the pool from the crawler settings and shut it down on close."""
+        parser_backend = crawler.settings.get("PARSER_BACKEND", "parsel")
+        html_trim = crawler.settings.getbool("PARSER_TRIM_HTML")
+        init_parser_process(parser_backend, html_trim)
+        if not crawler.settings.getbool("PARSER_POOL_ENABLED"):
+            return cls(None, parser_backend, html_trim)
+
+        max_workers = crawler.settings.getint("PARSER_POOL_MAX_WORKERS")
+        parser_pool = cls(
+            max_workers or multiprocessing.cpu_count(), parser_backend, html_trim
+        )
+        crawler.signals.connect(parser_pool.close, signal=signals.spider_closed)
+
+        return parser_pool
+
+    @property
+    def enabled(self) -> bool:
+        """Whether pages are parsed in worker processes."""
+        return self._max_workers is not None
+
+    def parse(
+        self, parse_page: PageParser, response: Response
+    ) -> defer.Deferred[List[Any]]:
+        """Parse a response, in a worker process if the pool is enabled.
+
+        Args:
+            parse_page (PageParser): Module-level function parsing a response
+                into entity dataclasses.
+            response (Response): The response to parse.
+
+        Returns:
+            defer.Deferred[List[Any]]: Fires with the parsed entities, or fails
+                with the exception raised by parse_page, as run_page_parser
+                raises it, or with CancelledError if the pool is closed first.
+
+        """
+        if not self.enabled:
+            return defer.maybeDeferred(run_page_parser, parse_page, response)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_parser_process,
+                initargs=(self._parser_backend, self._html_trim),
+            )
+
+        future = self._executor.submit(
+            _parse_in_worker,
+            parse_page,
+            response.url,
+            response.body,
+            get_response_encoding(response),
+        )
+        parsed: defer.Deferred[List[Any]] = defer.Deferred()
+        future.add_done_callback(lambda done: self._fire_from_thread(parsed, done))
+
+        return parsed
+
+    @staticmethod
+    def _fire_from_thread(
+        parsed: defer.Deferred[List[Any]], done: Future[List[Any]]
+    ) -> None:
+        # Futures complete on an executor thread, Deferreds must fire on the reactor
+        from twisted.internet import reactor
+
+        reactor_threads = cast(IReactorFromThreads, reactor)
+        if done.cancelled():
+            # Cancelled by close, so fail with CancelledError rather than
+            # leave the callback awaiting the parse waiting forever
+            reactor_threads.callFromThread(parsed.cancel)
+            return
+
+        exception = done.exception()
+        if exception is not None:
+            reactor_threads.callFromThread(parsed.errback, exception)
+        else:
+            reactor_threads.callFromThread(parsed.callback, done.result())
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
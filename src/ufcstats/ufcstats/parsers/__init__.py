@@ -41,3 +41,24 @@ SIGNIFICANT_STRIKES_EXPECTED_HEADERS: List[str] = [
     "Clinch",
     "Ground",
 ]
+
+# Fight stat headers by cell format, used to decode stat values in one pass
+STRIKES_STAT_HEADERS: List[str] = [
+    "Sig. str.",
+    "Total str.",
+    "Td",
+    "Head",
+    "Body",
+    "Leg",
+    "Distance",
+    "Clinch",
+    "Ground",
+]
+COUNT_STAT_HEADERS: List[str] = [
+    "KD",
+    "Sub. att",
+    "Rev.",
+]
+TIME_STAT_HEADERS: List[str] = [
+    "Ctrl",
+]
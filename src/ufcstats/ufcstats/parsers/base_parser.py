@@ -6,6 +6,7 @@ from typing import Any, List, Optional
 
 from scrapy.http import Response
 
+from ufcstats.parsers.parser_backends import compile_queries, get_parser_backend
 from utils import get_uuid_string
 
 
@@ -24,12 +25,7 @@ class CssQueries:
     fighter_urls_query: str = "a.b-link.b-fight-details__person-link::attr(href)"
     bout_type_query: str = "i.b-fight-details__fight-title::text"
     fight_outcomes_query: str = "i.b-fight-details__person-status::text"
-    round_text_query: str = ".b-fight-details__label:contains('Round:')"
-    finish_method_query: str = ".b-fight-details__label:contains('Method:') + i::text"
-    secondary_finish_method_query: str = ".b-fight-details__label:contains('Details:')"
-    finish_round_query: str = ".b-fight-details__label:contains('Round:')"
-    finish_time_query: str = ".b-fight-details__label:contains('Time:')"
-    referee_query: str = ".b-fight-details__label:contains('Referee:') + span::text"
+    fight_details_label_query: str = "i.b-fight-details__label"
     judges_query: str = "i.b-fight-details__text-item"
     fighter_name_query: str = "span.b-content__title-highlight::text"
     fighter_nickname_query: str = "p.b-content__Nickname::text"
@@ -37,6 +33,23 @@ class CssQueries:
     fighter_record_query: str = "span.b-content__title-record::text"
     fighter_fights_query: str = "a[href*='fight-details']::attr(href)"
     event_name_query: str = "span.b-content__title-highlight::text"
+    listing_row_query: str = "tr[class^='b-statistics__table-row']"
+    listing_event_name_query: str = "a[href*='event-details']::text"
+    listing_event_date_query: str = "span.b-statistics__date::text"
+    listing_event_location_query: str = "td + td::text"
+    listing_fighter_urls_query: str = "a[href*='fighter-details']::attr(href)"
+    event_fight_rows_query: str = (
+        "tbody.b-fight-details__table-body tr.b-fight-details__table-row"
+    )
+    event_fight_urls_query: str = (
+        "tbody.b-fight-details__table-body tr.b-fight-details__table-row"
+        "::attr(data-link)"
+    )
+    event_fight_outcomes_query: str = "i.b-flag__text::text"
+    event_fighter_urls_query: str = "a[href*='fighter-details']::attr(href)"
+    event_fight_cells_query: str = "td.b-fight-details__table-col"
+    event_fight_values_query: str = "p.b-fight-details__table-text"
+    event_title_bout_query: str = "img[src$='belt.png']"
     fight_stat_headers_query: str = (
         "thead.b-fight-details__table-head th.b-fight-details__table-col::text"
     )
@@ -46,11 +59,13 @@ class CssQueries:
     fight_stat_values_query: str = (
         "tbody.b-fight-details__table-body p.b-fight-details__table-text::text"
     )
-    next_element_xpath: str = "./following-sibling::text()"
-    secondary_finish_method_xpath: str = "./ancestor::p/text()[normalize-space()]"
     span_text_xpath: str = "./span/text()"
 
 
+# Compiled once per process, so the lxml backend never translates a query twice
+compile_queries(CssQueries())
+
+
 class Parser(ABC):
     """Abstract base class for parsing web responses.
 
@@ -63,6 +78,8 @@ class Parser(ABC):
         _url (str): The URL extracted from the response.
         _id (str): A unique UUID generated based on the URL.
         _css_queries (CssQueries): An instance containing reusable CSS selector strings.
+        _backend (ParserBackend): Runs the queries against the response, chosen
+            with set_parser_backend.
 
     """
 
@@ -71,6 +88,7 @@ class Parser(ABC):
         self._url = self._response.url
         self._id = get_uuid_string(self._url)
         self._css_queries = CssQueries()
+        self._backend = get_parser_backend()(self._response)
 
     @abstractmethod
     def parse_response(self) -> Any:
@@ -103,11 +121,7 @@ class Parser(ABC):
                 if provided).
 
         """
-        result: str | None = (
-            self._response.css(query).xpath(xpath).get()
-            if xpath
-            else self._response.css(query).get()
-        )
+        result: str | None = self._backend.get(query, xpath)
 
         if not result:
             raise ValueError(f"No result for query {query} on {self._url}")
@@ -136,11 +150,7 @@ class Parser(ABC):
                 if provided).
 
         """
-        result: List[str] = (
-            self._response.css(query).xpath(xpath).getall()
-            if xpath
-            else self._response.css(query).getall()
-        )
+        result: List[str] = self._backend.get_all(query, xpath)
 
         if not result:
             raise ValueError(f"No results for query {query} on {self._url}")
@@ -5,12 +5,42 @@ fighters, and fight statistics (total and by-round).
 """
 
 from datetime import datetime, timezone
+from typing import Tuple
 
 from scrapy.http import Response
 
 from ufcstats.parsers.base_parser import Parser
 from entities.event import Event
-from utils import clean_string, get_uuid_string
+from utils import clean_string, format_date, get_uuid_strings
+
+
+def get_event_date_formatted(event_date: str) -> str:
+    """Convert an event date such as "October 26, 2024" to "2024-10-26"."""
+    return format_date(event_date, "%B %d, %Y")
+
+
+def get_event_location(event_location: str) -> Tuple[str, str, str]:
+    """Split a cleaned event location into city, state and country.
+
+    Args:
+        event_location (str): Location such as "Las Vegas, Nevada, USA" or
+            "London, United Kingdom".
+
+    Returns:
+        Tuple[str, str, str]: City, state and country, empty when not given.
+
+    """
+    event_location_split = event_location.split(", ")
+    if len(event_location_split) == 3:
+        return (
+            event_location_split[0],
+            event_location_split[1],
+            event_location_split[2],
+        )
+    if len(event_location_split) == 2:
+        return event_location_split[0], "", event_location_split[1]
+
+    return "", "", ""
 
 
 class EventInfoParser(Parser):
@@ -43,29 +73,18 @@ class EventInfoParser(Parser):
     def _get_event_date(self) -> None:
         event_date_raw = self._event_date_location[1]
         self._event_date = clean_string(event_date_raw)
-        event_date_dt = datetime.strptime(self._event_date, "%B %d, %Y")
-        self._event_date_formatted = datetime.strftime(event_date_dt, "%Y-%m-%d")
+        self._event_date_formatted = get_event_date_formatted(self._event_date)
 
     def _get_event_location(self) -> None:
         event_location_raw: str = self._event_date_location[3]
         event_location_clean: str = clean_string(event_location_raw)
-        event_location_split = event_location_clean.split(", ")
-
-        self._city = ""
-        self._state = ""
-        self._country = ""
-        if len(event_location_split) == 3:
-            self._city = event_location_split[0]
-            self._state = event_location_split[1]
-            self._country = event_location_split[2]
-        elif len(event_location_split) == 2:
-            self._city = event_location_split[0]
-            self._country = event_location_split[1]
+        self._city, self._state, self._country = get_event_location(
+            event_location_clean
+        )
 
     def _get_fights(self) -> None:
         fight_urls = self._safe_css_get_all(self._css_queries.fight_urls_query)
-        fight_ids = [get_uuid_string(fight_url) for fight_url in fight_urls]
-        self._fights = ", ".join(fight_ids)
+        self._fights = ", ".join(get_uuid_strings(fight_urls))
 
     def parse_response(self) -> Event:
         """Parse the HTML response to get key event attributes.
@@ -0,0 +1,94 @@
+"""HTML parser for the ufcstats.com completed events listing.
+
+The listing shows the name, date and location of every event, so Event
+items can be built from it without fetching each event page.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from lxml import etree
+from scrapy.http import Response
+
+from ufcstats.parsers.base_parser import Parser
+from ufcstats.parsers.event_info_parser import (
+    get_event_date_formatted,
+    get_event_location,
+)
+from ufcstats.parsers.parser_backends import get_all_in_element
+from entities.event import Event
+from utils import clean_strings, get_uuid_string
+
+
+class EventListingParser(Parser):
+    """Parses HTTP responses of the ufcstats.com events listing page.
+
+    Yields a partial Event dataclass per listed event. Fights are only shown
+    on event pages, so fights is None.
+
+    Args:
+        response (Response): The HTTP response to be parsed.
+
+    Attributes:
+        _response (Response): The raw response object.
+        _url (str): URL of the response.
+        _id (str): Deterministic UUID derived from the response URL.
+        _css_queries (Dict[str, str]): Mapping of semantic query names to
+            CSS selectors used to extract event metadata from the response.
+
+    """
+
+    def __init__(self, response: Response):
+        super().__init__(response)
+
+    def _get_row_value(self, row: etree._Element, query: str) -> str:
+        values = clean_strings(get_all_in_element(row, query))
+        return " ".join(value for value in values if value)
+
+    def _get_event(self, row: etree._Element, scraped_at: str) -> Optional[Event]:
+        event_urls = get_all_in_element(row, self._css_queries.event_urls_query)
+        if not event_urls:
+            # Header and spacer rows
+            return None
+
+        event_url = event_urls[0].strip()
+        name = self._get_row_value(row, self._css_queries.listing_event_name_query)
+        event_date = self._get_row_value(
+            row, self._css_queries.listing_event_date_query
+        )
+        location = self._get_row_value(
+            row, self._css_queries.listing_event_location_query
+        )
+        if not name or not event_date:
+            raise ValueError(f"Incomplete listing row for {event_url} on {self._url}")
+        city, state, country = get_event_location(location)
+
+        return Event(
+            scraped_at=scraped_at,
+            event_id=get_uuid_string(event_url),
+            url=event_url,
+            name=name,
+            date=event_date,
+            date_formatted=get_event_date_formatted(event_date),
+            city=city,
+            state=state,
+            country=country,
+            fights=None,
+        )
+
+    def parse_response(self) -> Iterator[Event]:
+        """Parse the HTML response to get an Event per listing row.
+
+        Args:
+            response (Response): The response object to query.
+
+        Returns:
+            Iterator[Event]: Dataclass containing the event attributes shown on
+                the listing, one per listed event.
+
+        """
+        scraped_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        for row in self._backend.get_elements(self._css_queries.listing_row_query):
+            event = self._get_event(row, scraped_at)
+            if event is not None:
+                yield event
@@ -5,14 +5,18 @@ fighters, and fight statistics (total and by-round).
 """
 
 from datetime import datetime, timezone
+from typing import Dict, Optional
 
+from lxml import etree
 from scrapy.http import Response
 
 from . import WEIGHT_CLASSES_LOWER
 from ufcstats.parsers.base_parser import Parser
+from ufcstats.parsers.parser_backends import get_element_text
 from entities.fight import Fight
 from utils import (
     clean_string,
+    clean_strings,
     get_uuid_string,
 )
 
@@ -31,11 +35,59 @@ class FightInfoParser(Parser):
         _id (str): Deterministic UUID derived from the response URL.
         _css_queries (Dict[str, str]): Mapping of semantic query names to
             CSS selectors used to extract fight metadata from the response.
+        _label_values (Dict[str, str]): Mapping of each fight details label,
+            e.g. Round, Time, Method, Details, Referee or Time format, to its
+            cleaned value.
 
     """
 
     def __init__(self, response: Response):
         super().__init__(response)
+        self._label_values = self._get_label_values()
+
+    @staticmethod
+    def _get_label_value(label: etree._Element) -> Optional[str]:
+        # "Round: 5" - the value is the text after the label
+        if label.tail and label.tail.strip():
+            return label.tail
+
+        # "Method: <i>KO/TKO</i>", "Referee: <span>Herb Dean</span>"
+        next_element = label.getnext()
+        if next_element is not None:
+            return next_element.text
+
+        # "<i><i>Details:</i></i> Punch to Head" - the value is text of the paragraph
+        paragraph = next(label.iterancestors("p"), None)
+        if paragraph is None:
+            return None
+        paragraph_text = [paragraph.text, *(child.tail for child in paragraph)]
+
+        return next((text for text in paragraph_text if text and text.strip()), None)
+
+    def _get_label_values(self) -> Dict[str, str]:
+        """Walk the fight details labels once and index their values by label."""
+        label_values = {}
+        for label in self._backend.get_elements(
+            self._css_queries.fight_details_label_query
+        ):
+            label_name = clean_string(get_element_text(label)).rstrip(":")
+            label_value = self._get_label_value(label)
+            if label_value and label_name not in label_values:
+                label_values[label_name] = clean_string(label_value)
+
+        return label_values
+
+    def _get_label(self, label_name: str) -> str:
+        """Get the value of a fight details label, e.g. Round or Referee.
+
+        Raises:
+            ValueError: If the page has no value for the label.
+
+        """
+        if not self._label_values.get(label_name):
+            raise ValueError(f"No value for label {label_name} on {self._url}")
+
+        return self._label_values[label_name]
 
     def _get_event_id(self) -> None:
         event_url = self._safe_css_get(self._css_queries.event_urls_query)
@@ -56,24 +108,17 @@ class FightInfoParser(Parser):
 
     def _get_weight_class(self) -> None:
         bout_type_text = self._safe_css_get_all(self._css_queries.bout_type_query)
-        self._bout_type = [
-            clean_string(text) for text in bout_type_text if clean_string(text) != ""
-        ][0]
+        self._bout_type = [text for text in clean_strings(bout_type_text) if text][0]
         self._weight_class = None
         for weight_class in WEIGHT_CLASSES_LOWER:
             if weight_class in self._bout_type.lower():
                 self._weight_class = weight_class
 
     def _get_num_rounds(self) -> None:
-        num_rounds_raw = self._safe_css_get(
-            query=self._css_queries.round_text_query,
-            xpath=self._css_queries.next_element_xpath,
-        )
-        self._num_rounds = int(clean_string(num_rounds_raw))
+        self._num_rounds = int(self._get_label("Round"))
 
     def _get_finish_method(self) -> None:
-        finish_method_raw = self._safe_css_get(self._css_queries.finish_method_query)
-        finish_method_clean = clean_string(finish_method_raw)
+        finish_method_clean = self._get_label("Method")
         self._finish_method = finish_method_clean
 
         if "decision" in finish_method_clean.lower():
@@ -82,32 +127,17 @@ class FightInfoParser(Parser):
             self._secondary_finish_method = decision[1].lower()
         else:
             self._primary_finish_method = finish_method_clean.lower()
-            secondary_finish_method_raw = self._safe_css_get(
-                query=self._css_queries.secondary_finish_method_query,
-                xpath=self._css_queries.secondary_finish_method_xpath,
-            )
-            self._secondary_finish_method = clean_string(
-                secondary_finish_method_raw
-            ).lower()
+            self._secondary_finish_method = self._get_label("Details").lower()
 
     def _get_finish_round(self) -> None:
-        finish_round_raw = self._safe_css_get(
-            query=self._css_queries.finish_round_query,
-            xpath=self._css_queries.next_element_xpath,
-        )
-        self._finish_round = int(clean_string(finish_round_raw))
+        self._finish_round = int(self._get_label("Round"))
 
-        finish_time_raw = self._safe_css_get(
-            query=self._css_queries.finish_time_query,
-            xpath=self._css_queries.next_element_xpath,
-        )
-        finish_time = clean_string(finish_time_raw).split(":")
+        finish_time = self._get_label("Time").split(":")
         self._finish_time_minute = int(finish_time[0])
         self._finish_time_second = int(finish_time[1])
 
     def _get_referee(self) -> None:
-        referee_raw = self._safe_css_get(self._css_queries.referee_query)
-        self._referee = clean_string(referee_raw)
+        self._referee = self._get_label("Referee")
 
     def _get_judges(self) -> None:
         judge_and_referee_list = self._safe_css_get_all(
@@ -120,7 +150,7 @@ class FightInfoParser(Parser):
 
         if len(judge_and_referee_list) > 1:
             judge_list = judge_and_referee_list[1:]
-            judge_list_clean = [clean_string(judge) for judge in judge_list]
+            judge_list_clean = clean_strings(judge_list)
             self._judge_1 = judge_list_clean[0]
             self._judge_2 = judge_list_clean[1]
             self._judge_3 = judge_list_clean[2]
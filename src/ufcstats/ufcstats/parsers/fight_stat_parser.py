@@ -4,12 +4,18 @@ This module contains Scrapy-based parsers for UFC events, fights,
 fighters, and fight statistics (total and by-round).
 """
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterator
+from functools import lru_cache
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from scrapy.http import Response
 
 from . import (
+    COUNT_STAT_HEADERS,
+    STRIKES_STAT_HEADERS,
+    TIME_STAT_HEADERS,
     TOTALS_STATS_EXPECTED_HEADERS,
     SIGNIFICANT_STRIKES_EXPECTED_HEADERS,
 )
@@ -17,12 +23,135 @@ from ufcstats.parsers.base_parser import Parser
 from entities.fight_stats import FightStats
 from entities.fight_stats_by_round import FightStatsByRound
 from utils import (
-    clean_string,
+    clean_strings,
     get_uuid_string,
-    get_strikes_landed_attempted,
 )
 
 
+@dataclass(frozen=True)
+class StatValueFormat:
+    """Format of a cleaned fight stat value, e.g. "12 of 30", "3:05" or "2".
+
+    Attributes:
+        pattern (re.Pattern[str]): Matches a single value.
+        column_pattern (re.Pattern[str]): Matches many values of the format,
+            each followed by a newline.
+        num_integers (int): Number of integers each value decodes to.
+
+    """
+
+    pattern: re.Pattern[str]
+    column_pattern: re.Pattern[str]
+    num_integers: int
+
+
+def _get_stat_value_format(value_regex: str, num_integers: int) -> StatValueFormat:
+    return StatValueFormat(
+        pattern=re.compile(value_regex),
+        column_pattern=re.compile(f"(?:{value_regex}\n)*"),
+        num_integers=num_integers,
+    )
+
+
+STRIKES_VALUE_FORMAT = _get_stat_value_format(r"\d+ of \d+", 2)
+TIME_VALUE_FORMAT = _get_stat_value_format(r"\d+:\d+", 2)
+COUNT_VALUE_FORMAT = _get_stat_value_format(r"\d+", 1)
+STAT_VALUE_FORMATS: Dict[str, StatValueFormat] = {
+    **{header: STRIKES_VALUE_FORMAT for header in STRIKES_STAT_HEADERS},
+    **{header: TIME_VALUE_FORMAT for header in TIME_STAT_HEADERS},
+    **{header: COUNT_VALUE_FORMAT for header in COUNT_STAT_HEADERS},
+}
+INTEGER_PATTERN = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=None)
+def _get_stat_columns(
+    headers: Tuple[str, ...],
+) -> List[Tuple[StatValueFormat, List[Tuple[int, str]]]]:
+    # Group header positions by value format, once per distinct header layout
+    stat_columns: Dict[StatValueFormat, List[Tuple[int, str]]] = {}
+    for index, header in enumerate(headers):
+        value_format = STAT_VALUE_FORMATS.get(header.split("_round_")[0])
+        if value_format is not None:
+            stat_columns.setdefault(value_format, []).append((index, header))
+
+    return list(stat_columns.items())
+
+
+def decode_fight_stat_values(
+    headers: List[str], fighter_stat_values: Dict[str, List[str]], url: str
+) -> Dict[str, Dict[str, Tuple[int, ...]]]:
+    """Decode every stat value of a fight, for all fighters and rounds, in one pass.
+
+    "X of Y" values decode to (landed, attempted), "M:SS" values to
+    (minutes, seconds) and counts to (count,). Percentages are not decoded.
+    All values of one format are validated by a single regex match and their
+    integers read by a single findall, rather than parsing cell by cell.
+
+    Args:
+        headers (List[str]): Stat headers, e.g. "Td" or "Td_round_2".
+        fighter_stat_values (Dict[str, List[str]]): Mapping of fighter ID to
+            the fighter's cleaned stat values, in the same order as headers.
+        url (str): URL of the fight page, used in error messages.
+
+    Returns:
+        Dict[str, Dict[str, Tuple[int, ...]]]: Mapping of fighter ID to a
+            mapping of stat header to its decoded integers.
+
+    Raises:
+        ValueError: If any value does not match its column's format. The
+            message lists every invalid cell.
+
+    """
+    stat_columns = _get_stat_columns(tuple(headers))
+
+    decoded_stats: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+    invalid_cells: List[str] = []
+    for fighter_id, values in fighter_stat_values.items():
+        fighter_decoded_stats: Dict[str, Tuple[int, ...]] = {}
+        for value_format, columns in stat_columns:
+            column_values = [values[index] for index, _ in columns]
+            joined_values = "\n".join(column_values) + "\n"
+            if not value_format.column_pattern.fullmatch(joined_values):
+                invalid_cells.extend(
+                    f"{header}={value!r} (fighter {fighter_id})"
+                    for (_, header), value in zip(columns, column_values)
+                    if not value_format.pattern.fullmatch(value)
+                )
+                continue
+
+            integers = iter(map(int, INTEGER_PATTERN.findall(joined_values)))
+            decoded_values = zip(*[integers] * value_format.num_integers)
+            for (_, header), decoded_value in zip(columns, decoded_values):
+                fighter_decoded_stats[header] = decoded_value
+        decoded_stats[fighter_id] = fighter_decoded_stats
+
+    if invalid_cells:
+        raise ValueError(
+            f"Invalid fight stat values on {url}: {', '.join(invalid_cells)}"
+        )
+
+    return decoded_stats
+
+
+@dataclass(frozen=True)
+class FightStatTables:
+    """Fight stat tables extracted once from a ufcstats.com fight page.
+
+    Holds the decoded stat values for both fighters, keyed by header, so the
+    totals and per-round outputs can be built from a single extraction.
+
+    Attributes:
+        num_rounds (int): Number of rounds in the per-round tables.
+        fighter_decoded_stats (Dict[str, Dict[str, Tuple[int, ...]]]): Mapping
+            of fighter ID to a mapping of stat header to its decoded integers.
+
+    """
+
+    num_rounds: int
+    fighter_decoded_stats: Dict[str, Dict[str, Tuple[int, ...]]]
+
+
 class FightStatParser(Parser):
     """Parses HTTP responses of ufcstats.com fight pages.
 
@@ -31,6 +160,8 @@ class FightStatParser(Parser):
 
     Args:
         response (Response): The HTTP response to be parsed.
+        fight_stat_tables (Optional[FightStatTables]): Stat tables already
+            extracted from the same response, e.g. by another fight stat parser.
 
     Attributes:
         _response (Response): The raw response object.
@@ -38,13 +169,28 @@ class FightStatParser(Parser):
         _id (str): Deterministic UUID derived from the response URL.
         _css_queries (Dict[str, str]): Mapping of semantic query names to
             CSS selectors used to extract fight metadata from the response.
+        _fight_stat_tables (Optional[FightStatTables]): Stat tables for the
+            response, extracted on first use.
 
     """
 
-    def __init__(self, response: Response):
+    def __init__(
+        self,
+        response: Response,
+        fight_stat_tables: Optional[FightStatTables] = None,
+    ):
         super().__init__(response)
         self._fight_id = self._id
         self._get_fighter_ids()
+        self._fight_stat_tables = fight_stat_tables
+
+    @property
+    def fight_stat_tables(self) -> FightStatTables:
+        """Stat tables for the response, extracted once and shared between parsers."""
+        self._get_fight_stat_dicts()
+        assert self._fight_stat_tables is not None
+
+        return self._fight_stat_tables
 
     def _get_fighter_ids(self) -> None:
         fighter_urls = tuple(
@@ -56,21 +202,20 @@ class FightStatParser(Parser):
 
     def _get_fight_stat_headers(self) -> None:
         headers = self._safe_css_get_all(self._css_queries.fight_stat_headers_query)
-        headers_clean = [clean_string(header) for header in headers]
+        headers_clean = clean_strings(headers)
 
         round_headers = self._safe_css_get_all(self._css_queries.round_headers_query)
-        round_headers_clean = [
-            clean_string(round_header) for round_header in round_headers
-        ]
+        round_headers_clean = clean_strings(round_headers)
         # Divide by two as the number of rounds is duplicated for stats and significant strikes
         self._num_rounds = int(len(round_headers_clean) / 2)
 
         totals_headers_clean = headers_clean[0:10]
         totals_headers_clean.remove("Fighter")
-        assert totals_headers_clean == TOTALS_STATS_EXPECTED_HEADERS, (
-            f"Totals headers {totals_headers_clean} for url {self._url}",
-            f"do not match expected headers: {TOTALS_STATS_EXPECTED_HEADERS}",
-        )
+        if totals_headers_clean != TOTALS_STATS_EXPECTED_HEADERS:
+            raise ValueError(
+                f"Totals headers {totals_headers_clean} for url {self._url} "
+                f"do not match expected headers: {TOTALS_STATS_EXPECTED_HEADERS}"
+            )
         totals_by_round_headers = [
             f"{header}_round_{round}"
             for round in range(1, self._num_rounds + 1)
@@ -79,10 +224,12 @@ class FightStatParser(Parser):
 
         sig_strikes_headers_clean = headers_clean[10:]
         sig_strikes_headers_clean.remove("Fighter")
-        assert sig_strikes_headers_clean == SIGNIFICANT_STRIKES_EXPECTED_HEADERS, (
-            f"Totals headers {sig_strikes_headers_clean} for url {self._url}",
-            f"do not match expected headers: {SIGNIFICANT_STRIKES_EXPECTED_HEADERS}",
-        )
+        if sig_strikes_headers_clean != SIGNIFICANT_STRIKES_EXPECTED_HEADERS:
+            raise ValueError(
+                f"Significant strikes headers {sig_strikes_headers_clean} for url "
+                f"{self._url} do not match expected headers: "
+                f"{SIGNIFICANT_STRIKES_EXPECTED_HEADERS}"
+            )
         sig_strikes_by_round_headers = [
             f"{header}_round_{round}"
             for round in range(1, self._num_rounds + 1)
@@ -98,82 +245,84 @@ class FightStatParser(Parser):
 
     def _get_fight_stat_values(self) -> None:
         values = self._safe_css_get_all(self._css_queries.fight_stat_values_query)
-        values_clean = [
-            clean_string(value) for value in values if clean_string(value) != ""
-        ]
+        values_clean = [value for value in clean_strings(values) if value != ""]
 
         self._fighter_1_stat_values = values_clean[0::2]
         self._fighter_2_stat_values = values_clean[1::2]
 
     def _get_fight_stat_dicts(self) -> None:
+        if self._fight_stat_tables is None:
+            self._fight_stat_tables = self._get_fight_stat_tables()
+
+        self._num_rounds = self._fight_stat_tables.num_rounds
+        self._fighter_decoded_stats = self._fight_stat_tables.fighter_decoded_stats
+
+    def _get_fight_stat_tables(self) -> FightStatTables:
         self._get_fight_stat_headers()
         self._get_fight_stat_values()
 
         num_fighter_1_values = len(self._fighter_1_stat_values)
         num_fighter_2_values = len(self._fighter_2_stat_values)
         num_headers = len(self._all_stat_headers)
-        assert num_fighter_1_values == num_headers, (
-            f"Number of stat values {num_fighter_1_values} does not match number of",
-            f"headers {num_headers} for fighter_1: {self._fighter_1_id}",
-        )
-        assert num_fighter_2_values == num_headers, (
-            f"Number of stat values {num_fighter_2_values} does not match number of",
-            f"headers {num_headers} for fighter_1: {self._fighter_2_id}",
+        # Stats can be missing, e.g. for a fight whose results are published
+        # before its stats
+        if num_fighter_1_values != num_headers:
+            raise ValueError(
+                f"Number of stat values {num_fighter_1_values} does not match number "
+                f"of headers {num_headers} for fighter_1: {self._fighter_1_id}"
+            )
+        if num_fighter_2_values != num_headers:
+            raise ValueError(
+                f"Number of stat values {num_fighter_2_values} does not match number "
+                f"of headers {num_headers} for fighter_2: {self._fighter_2_id}"
+            )
+
+        fighter_decoded_stats = decode_fight_stat_values(
+            self._all_stat_headers,
+            {
+                self._fighter_1_id: self._fighter_1_stat_values,
+                self._fighter_2_id: self._fighter_2_stat_values,
+            },
+            self._url,
         )
 
-        fighter_1_stats_dict = dict(
-            zip(self._all_stat_headers, self._fighter_1_stat_values)
-        )
-        fighter_2_stats_dict = dict(
-            zip(self._all_stat_headers, self._fighter_2_stat_values)
+        return FightStatTables(
+            num_rounds=self._num_rounds,
+            fighter_decoded_stats=fighter_decoded_stats,
         )
-        self._fighter_stats_dicts = {
-            self._fighter_1_id: fighter_1_stats_dict,
-            self._fighter_2_id: fighter_2_stats_dict,
-        }
 
     def _get_fight_stats(self, fighter_id: str) -> FightStats:
-        self._get_fight_stat_dicts()
-        fighter_stat_dict = self._fighter_stats_dicts[fighter_id]
+        fighter_stats = self._fighter_decoded_stats[fighter_id]
 
         fight_stat_id = get_uuid_string(self._fight_id + fighter_id)
-        (total_strikes_landed, total_strikes_attempted) = get_strikes_landed_attempted(
-            fighter_stat_dict["Total str."]
-        )
-        (significant_strikes_landed, significant_strikes_attempted) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Sig. str."])
-        )
+        (total_strikes_landed, total_strikes_attempted) = fighter_stats["Total str."]
+        (significant_strikes_landed, significant_strikes_attempted) = fighter_stats[
+            "Sig. str."
+        ]
         (significant_strikes_landed_head, significant_strikes_attempted_head) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Head"])
+            fighter_stats["Head"]
         )
         (significant_strikes_landed_body, significant_strikes_attempted_body) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Body"])
+            fighter_stats["Body"]
         )
         (significant_strikes_landed_leg, significant_strikes_attempted_leg) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Leg"])
+            fighter_stats["Leg"]
         )
         (
             significant_strikes_landed_distance,
             significant_strikes_attempted_distance,
-        ) = get_strikes_landed_attempted(fighter_stat_dict["Distance"])
+        ) = fighter_stats["Distance"]
         (significant_strikes_landed_clinch, significant_strikes_attempted_clinch) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Clinch"])
+            fighter_stats["Clinch"]
         )
         (significant_strikes_landed_ground, significant_strikes_attempted_ground) = (
-            get_strikes_landed_attempted(fighter_stat_dict["Ground"])
-        )
-        knockdowns = int(fighter_stat_dict["KD"])
-        (takedowns_landed, takedowns_attempted) = get_strikes_landed_attempted(
-            fighter_stat_dict["Td"]
+            fighter_stats["Ground"]
         )
-        control_time_raw = clean_string(fighter_stat_dict["Ctrl"])
-        (control_time_minutes_string, control_time_seconds_string) = (
-            control_time_raw.split(":")
-        )
-        control_time_minutes = int(control_time_minutes_string)
-        control_time_seconds = int(control_time_seconds_string)
-        submissions_attempted = int(fighter_stat_dict["Sub. att"])
-        reversals = int(fighter_stat_dict["Rev."])
+        (knockdowns,) = fighter_stats["KD"]
+        (takedowns_landed, takedowns_attempted) = fighter_stats["Td"]
+        (control_time_minutes, control_time_seconds) = fighter_stats["Ctrl"]
+        (submissions_attempted,) = fighter_stats["Sub. att"]
+        (reversals,) = fighter_stats["Rev."]
 
         return FightStats(
             scraped_at=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
@@ -217,6 +366,8 @@ class FightStatParser(Parser):
                 Yields one FightStats object per fighter.
 
         """
+        self._get_fight_stat_dicts()
+
         fighter_1_stats = self._get_fight_stats(self._fighter_1_id)
         fighter_2_stats = self._get_fight_stats(self._fighter_2_id)
 
@@ -232,6 +383,8 @@ class FightStatByRoundParser(FightStatParser):
 
     Args:
         response (Response): The HTTP response to be parsed.
+        fight_stat_tables (Optional[FightStatTables]): Stat tables already
+            extracted from the same response, e.g. by a FightStatParser.
 
     Attributes:
         _response (Response): The raw response object.
@@ -240,54 +393,53 @@ class FightStatByRoundParser(FightStatParser):
 
     """
 
-    def __init__(self, response: Response):
-        super().__init__(response)
+    def __init__(
+        self,
+        response: Response,
+        fight_stat_tables: Optional[FightStatTables] = None,
+    ):
+        super().__init__(response, fight_stat_tables)
 
     def _get_fight_stats_by_round(
         self, fighter_id: str, round: int
     ) -> FightStatsByRound:
-        fighter_stat_dict = self._fighter_stats_dicts[fighter_id]
+        fighter_stats = self._fighter_decoded_stats[fighter_id]
         fight_stat_by_round_id = get_uuid_string(
             self._fight_id + fighter_id + str(round)
         )
 
-        (total_strikes_landed, total_strikes_attempted) = get_strikes_landed_attempted(
-            fighter_stat_dict[f"Total str._round_{round}"]
-        )
-        (significant_strikes_landed, significant_strikes_attempted) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Sig. str._round_{round}"])
-        )
+        (total_strikes_landed, total_strikes_attempted) = fighter_stats[
+            f"Total str._round_{round}"
+        ]
+        (significant_strikes_landed, significant_strikes_attempted) = fighter_stats[
+            f"Sig. str._round_{round}"
+        ]
         (significant_strikes_landed_head, significant_strikes_attempted_head) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Head_round_{round}"])
+            fighter_stats[f"Head_round_{round}"]
         )
         (significant_strikes_landed_body, significant_strikes_attempted_body) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Body_round_{round}"])
+            fighter_stats[f"Body_round_{round}"]
         )
         (significant_strikes_landed_leg, significant_strikes_attempted_leg) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Leg_round_{round}"])
+            fighter_stats[f"Leg_round_{round}"]
         )
         (
             significant_strikes_landed_distance,
             significant_strikes_attempted_distance,
-        ) = get_strikes_landed_attempted(fighter_stat_dict[f"Distance_round_{round}"])
+        ) = fighter_stats[f"Distance_round_{round}"]
         (significant_strikes_landed_clinch, significant_strikes_attempted_clinch) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Clinch_round_{round}"])
+            fighter_stats[f"Clinch_round_{round}"]
         )
         (significant_strikes_landed_ground, significant_strikes_attempted_ground) = (
-            get_strikes_landed_attempted(fighter_stat_dict[f"Ground_round_{round}"])
+            fighter_stats[f"Ground_round_{round}"]
         )
-        knockdowns = int(fighter_stat_dict[f"KD_round_{round}"])
-        (takedowns_landed, takedowns_attempted) = get_strikes_landed_attempted(
-            fighter_stat_dict[f"Td_round_{round}"]
-        )
-        control_time_raw = clean_string(fighter_stat_dict[f"Ctrl_round_{round}"])
-        (control_time_minutes_string, control_time_seconds_string) = (
-            control_time_raw.split(":")
-        )
-        control_time_minutes = int(control_time_minutes_string)
-        control_time_seconds = int(control_time_seconds_string)
-        submissions_attempted = int(fighter_stat_dict[f"Sub. att_round_{round}"])
-        reversals = int(fighter_stat_dict[f"Rev._round_{round}"])
+        (knockdowns,) = fighter_stats[f"KD_round_{round}"]
+        (takedowns_landed, takedowns_attempted) = fighter_stats[f"Td_round_{round}"]
+        (control_time_minutes, control_time_seconds) = fighter_stats[
+            f"Ctrl_round_{round}"
+        ]
+        (submissions_attempted,) = fighter_stats[f"Sub. att_round_{round}"]
+        (reversals,) = fighter_stats[f"Rev._round_{round}"]
 
         return FightStatsByRound(
             scraped_at=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
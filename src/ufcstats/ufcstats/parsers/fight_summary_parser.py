@@ -0,0 +1,156 @@
+"""HTML parser for the fight results table of ufcstats.com event pages.
+
+Each fight on an event page has a row with its fighters, result, headline
+stats, weight class, method, round and time, so fight results can be built
+from the event page without fetching each fight page.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+from scrapy.http import Response
+
+from ufcstats.parsers.base_parser import Parser
+from ufcstats.parsers.parser_backends import (
+    get_all_in_element,
+    get_element_text,
+    get_elements_in_element,
+)
+from ufcstats.spiders.constants import NEXT_FIGHT_FLAG
+from entities.fight_summary import FightSummary
+from utils import clean_string, get_uuid_string
+
+# Outcomes of fighter 1 and fighter 2 by the flag shown on the row, the winner
+# is always listed first
+EVENT_FIGHT_OUTCOMES: Dict[str, Tuple[str, str]] = {
+    "win": ("W", "L"),
+    "draw": ("D", "D"),
+    "nc": ("NC", "NC"),
+}
+# W/L, Fighter, Kd, Str, Td, Sub, Weight class, Method, Round, Time
+NUM_EVENT_FIGHT_COLUMNS = 10
+
+
+class FightSummaryParser(Parser):
+    """Parses the fight results table of HTTP responses of ufcstats.com event pages.
+
+    Yields a FightSummary dataclass per fight with a result. Fights that have
+    not taken place yet have no result or stats, so they are skipped.
+
+    Args:
+        response (Response): The HTTP response to be parsed.
+
+    Attributes:
+        _response (Response): The raw response object.
+        _url (str): URL of the response.
+        _id (str): Deterministic UUID derived from the response URL.
+        _css_queries (Dict[str, str]): Mapping of semantic query names to
+            CSS selectors used to extract fight metadata from the response.
+
+    """
+
+    def __init__(self, response: Response):
+        super().__init__(response)
+
+    def _get_cell_values(self, row: etree._Element) -> List[List[str]]:
+        return [
+            [
+                clean_string(get_element_text(value))
+                for value in get_elements_in_element(
+                    cell, self._css_queries.event_fight_values_query
+                )
+            ]
+            for cell in get_elements_in_element(
+                row, self._css_queries.event_fight_cells_query
+            )
+        ]
+
+    def _get_fighter_counts(self, values: List[str], fight_url: str) -> Tuple[int, int]:
+        if len(values) != 2 or not all(value.isdigit() for value in values):
+            raise ValueError(
+                f"Invalid fight stat values {values} for {fight_url} on {self._url}"
+            )
+
+        return int(values[0]), int(values[1])
+
+    def _get_fight_summary(
+        self, row: etree._Element, scraped_at: str
+    ) -> Optional[FightSummary]:
+        fight_outcomes = [
+            clean_string(outcome).lower()
+            for outcome in get_all_in_element(
+                row, self._css_queries.event_fight_outcomes_query
+            )
+        ]
+        if not fight_outcomes or fight_outcomes[0] == NEXT_FIGHT_FLAG:
+            # Fights that have not taken place yet
+            return None
+
+        fight_url = (row.get("data-link") or "").strip()
+        if fight_outcomes[0] not in EVENT_FIGHT_OUTCOMES:
+            raise ValueError(
+                f"Unknown fight outcome {fight_outcomes[0]} for {fight_url} "
+                f"on {self._url}"
+            )
+        fighter_1_outcome, fighter_2_outcome = EVENT_FIGHT_OUTCOMES[fight_outcomes[0]]
+
+        fighter_urls = get_all_in_element(
+            row, self._css_queries.event_fighter_urls_query
+        )
+        cell_values = self._get_cell_values(row)
+        if len(fighter_urls) != 2 or len(cell_values) < NUM_EVENT_FIGHT_COLUMNS:
+            raise ValueError(f"Incomplete fight row for {fight_url} on {self._url}")
+
+        knockdowns, strikes, takedowns, submissions = (
+            self._get_fighter_counts(values, fight_url) for values in cell_values[2:6]
+        )
+        weight_class, method, finish_round, finish_time = cell_values[6:10]
+        if not method or not finish_round or not finish_time:
+            raise ValueError(f"Incomplete fight row for {fight_url} on {self._url}")
+        finish_time_minute, finish_time_second = finish_time[0].split(":")
+
+        return FightSummary(
+            scraped_at=scraped_at,
+            fight_id=get_uuid_string(fight_url),
+            event_id=self._id,
+            url=fight_url,
+            fighter_1_id=get_uuid_string(fighter_urls[0]),
+            fighter_2_id=get_uuid_string(fighter_urls[1]),
+            fighter_1_outcome=fighter_1_outcome,
+            fighter_2_outcome=fighter_2_outcome,
+            fighter_1_knockdowns=knockdowns[0],
+            fighter_2_knockdowns=knockdowns[1],
+            fighter_1_significant_strikes_landed=strikes[0],
+            fighter_2_significant_strikes_landed=strikes[1],
+            fighter_1_takedowns_landed=takedowns[0],
+            fighter_2_takedowns_landed=takedowns[1],
+            fighter_1_submissions_attempted=submissions[0],
+            fighter_2_submissions_attempted=submissions[1],
+            weight_class=" ".join(weight_class),
+            title_bout=bool(
+                get_elements_in_element(row, self._css_queries.event_title_bout_query)
+            ),
+            finish_method=method[0],
+            finish_method_details=" ".join(value for value in method[1:] if value),
+            finish_round=int(finish_round[0]),
+            finish_time_minute=int(finish_time_minute),
+            finish_time_second=int(finish_time_second),
+        )
+
+    def parse_response(self) -> Iterator[FightSummary]:
+        """Parse the HTML response to get a FightSummary per fight row.
+
+        Args:
+            response (Response): The response object to query.
+
+        Returns:
+            Iterator[FightSummary]: Dataclass containing the result and headline
+                stats of a fight, one per fight that has taken place.
+
+        """
+        scraped_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        for row in self._backend.get_elements(self._css_queries.event_fight_rows_query):
+            fight_summary = self._get_fight_summary(row, scraped_at)
+            if fight_summary is not None:
+                yield fight_summary
@@ -5,12 +5,66 @@ fighters, and fight statistics (total and by-round).
 """
 
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
 from scrapy.http import Response
 
 from ufcstats.parsers.base_parser import Parser
 from entities.fighter import Fighter
-from utils import clean_string, get_uuid_string
+from utils import clean_string, format_date, get_uuid_strings
+
+
+def get_fighter_names(full_name: str) -> Tuple[str, str, str]:
+    """Split a cleaned fighter name into full name, first name and last names."""
+    names = full_name.split(" ")
+    return " ".join(names), names[0], " ".join(names[1:])
+
+
+def get_fighter_height(
+    height: str,
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    """Convert a cleaned height such as 6' 0" to feet, inches and centimetres.
+
+    Args:
+        height (str): Height in feet and inches, or "--" when not known.
+
+    Returns:
+        Tuple[Optional[int], Optional[int], Optional[float]]: Feet, inches and
+            centimetres, all None when the height is not known.
+
+    """
+    if height == "--":
+        return None, None, None
+
+    height_ft = int(height.split("'")[0])
+    height_in = int(height.split("'")[1].replace('"', "").strip())
+    height_cm = float(((height_ft * 12.0) * 2.54) + (height_in * 2.54))
+
+    return height_ft, height_in, height_cm
+
+
+def get_fighter_weight(weight: str) -> Optional[int]:
+    """Convert a cleaned weight such as "185 lbs." to pounds, or None for "--"."""
+    weight = weight.replace("lbs.", "").strip()
+    return int(weight) if weight != "--" else None
+
+
+def get_fighter_reach(reach: str) -> Tuple[Optional[int], Optional[int]]:
+    """Convert a cleaned reach such as 73" or 73.0" to inches and centimetres.
+
+    Args:
+        reach (str): Reach in inches, or "--" when not known.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Inches and centimetres, both None
+            when the reach is not known.
+
+    """
+    reach = reach.replace('"', "")
+    if reach == "--":
+        return None, None
+
+    return int(float(reach)), int(float(reach) * 2.54)
 
 
 class FighterInfoParser(Parser):
@@ -38,42 +92,25 @@ class FighterInfoParser(Parser):
 
     def _get_fighter_name(self) -> None:
         name_raw = self._safe_css_get(self._css_queries.fighter_name_query)
-        name_clean = clean_string(name_raw)
-        names = name_clean.split(" ")
-        self._full_name = " ".join(names)
-        self._first_name = names[0]
-        self._last_names = " ".join(names[1:])
-
-        nickname_raw = self._response.css(
-            self._css_queries.fighter_nickname_query
-        ).get()
+        self._full_name, self._first_name, self._last_names = get_fighter_names(
+            clean_string(name_raw)
+        )
+
+        nickname_raw = self._backend.get(self._css_queries.fighter_nickname_query)
         self._nickname = clean_string(nickname_raw) if nickname_raw else ""
 
     def _get_fighter_height(self) -> None:
-        self._height_ft = None
-        self._height_in = None
-        self._height_cm = None
-        height = clean_string(self._fighter_stats[1])
-        if height != "--":
-            self._height_ft = int(height.split("'")[0])
-            self._height_in = int(height.split("'")[1].replace('"', "").strip())
-            self._height_cm = float(
-                ((self._height_ft * 12.0) * 2.54) + (self._height_in * 2.54)
-            )
+        self._height_ft, self._height_in, self._height_cm = get_fighter_height(
+            clean_string(self._fighter_stats[1])
+        )
 
     def _get_fighter_weight(self) -> None:
-        self._weight_lbs = None
-        weight = clean_string(self._fighter_stats[3]).replace("lbs.", "")
-        if weight != "--":
-            self._weight_lbs = int(weight)
+        self._weight_lbs = get_fighter_weight(clean_string(self._fighter_stats[3]))
 
     def _get_fighter_reach(self) -> None:
-        self._reach_in = None
-        self._reach_cm = None
-        reach = clean_string(self._fighter_stats[5]).replace('"', "")
-        if reach != "--":
-            self._reach_in = int(reach)
-            self._reach_cm = int(float(reach) * 2.54)
+        self._reach_in, self._reach_cm = get_fighter_reach(
+            clean_string(self._fighter_stats[5])
+        )
 
     def _get_fighter_stance(self) -> None:
         self._stance = clean_string(self._fighter_stats[7])
@@ -84,8 +121,7 @@ class FighterInfoParser(Parser):
         dob_string = clean_string(self._fighter_stats[9])
         if dob_string != "--":
             self._dob = dob_string
-            dob_dt = datetime.strptime(dob_string, "%b %d, %Y")
-            self._dob_formatted = datetime.strftime(dob_dt, "%Y-%m-%d")
+            self._dob_formatted = format_date(dob_string, "%b %d, %Y")
 
     def _get_fighter_record(self) -> None:
         record_raw = self._safe_css_get(self._css_queries.fighter_record_query)
@@ -106,11 +142,9 @@ class FighterInfoParser(Parser):
 
     def _get_fight_ids(self) -> None:
         self._fight_ids = None
-        fight_urls = self._response.css(self._css_queries.fighter_fights_query).getall()
+        fight_urls = self._backend.get_all(self._css_queries.fighter_fights_query)
         if fight_urls:
-            fight_id_list = [get_uuid_string(url) for url in fight_urls]
-
-            self._fight_ids = ", ".join(fight_id_list)
+            self._fight_ids = ", ".join(get_uuid_strings(fight_urls))
 
     def parse_response(self) -> Fighter:
         """Parse the HTML response to get key fighter attributes.
@@ -0,0 +1,115 @@
+"""HTML parser for the ufcstats.com fighters listing of one letter.
+
+The listing shows the name, nickname, height, weight, reach, stance and
+wins/losses/draws of every fighter, so Fighter items can be built from it
+without fetching each fighter page.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from lxml import etree
+from scrapy.http import Response
+
+from ufcstats.parsers.base_parser import Parser
+from ufcstats.parsers.fighter_info_parser import (
+    get_fighter_height,
+    get_fighter_names,
+    get_fighter_reach,
+    get_fighter_weight,
+)
+from ufcstats.parsers.parser_backends import get_all_in_element, get_element_text
+from entities.fighter import Fighter
+from utils import clean_string, get_uuid_string
+
+# First, Last, Nickname, Ht., Wt., Reach, Stance, W, L, D, followed by Belt
+NUM_LISTING_COLUMNS = 10
+
+
+class FighterListingParser(Parser):
+    """Parses HTTP responses of the ufcstats.com fighters listing pages.
+
+    Yields a partial Fighter dataclass per listed fighter. Date of birth and
+    fights are only shown on fighter pages, so dob, dob_formatted and
+    fight_ids are None. No contests are not listed either, so record is built
+    from wins, losses and draws and no_contests is 0.
+
+    Args:
+        response (Response): The HTTP response to be parsed.
+
+    Attributes:
+        _response (Response): The raw response object.
+        _url (str): URL of the response.
+        _id (str): Deterministic UUID derived from the response URL.
+        _css_queries (Dict[str, str]): Mapping of semantic query names to
+            CSS selectors used to extract fighter metadata from the response.
+
+    """
+
+    def __init__(self, response: Response):
+        super().__init__(response)
+
+    def _get_fighter(self, row: etree._Element, scraped_at: str) -> Optional[Fighter]:
+        fighter_urls = get_all_in_element(
+            row, self._css_queries.listing_fighter_urls_query
+        )
+        if not fighter_urls:
+            # Header and spacer rows
+            return None
+
+        fighter_url = fighter_urls[0].strip()
+        cells = [clean_string(get_element_text(cell)) for cell in row.iter("td")]
+        if len(cells) < NUM_LISTING_COLUMNS:
+            raise ValueError(f"Incomplete listing row for {fighter_url} on {self._url}")
+
+        first, last, nickname, height, weight, reach, stance, *record = cells[
+            :NUM_LISTING_COLUMNS
+        ]
+        full_name, first_name, last_names = get_fighter_names(
+            " ".join(name for name in (first, last) if name)
+        )
+        height_ft, height_in, height_cm = get_fighter_height(height)
+        reach_in, reach_cm = get_fighter_reach(reach)
+        wins, losses, draws = (int(value) for value in record)
+
+        return Fighter(
+            scraped_at=scraped_at,
+            fighter_id=get_uuid_string(fighter_url),
+            url=fighter_url,
+            full_name=full_name,
+            first_name=first_name,
+            last_names=last_names,
+            nickname=nickname,
+            height_ft=height_ft,
+            height_in=height_in,
+            height_cm=height_cm,
+            weight_lbs=get_fighter_weight(weight),
+            reach_in=reach_in,
+            reach_cm=reach_cm,
+            stance=stance,
+            dob=None,
+            dob_formatted=None,
+            record=f"{wins}-{losses}-{draws}",
+            wins=wins,
+            losses=losses,
+            draws=draws,
+            no_contests=0,
+            fight_ids=None,
+        )
+
+    def parse_response(self) -> Iterator[Fighter]:
+        """Parse the HTML response to get a Fighter per listing row.
+
+        Args:
+            response (Response): The response object to query.
+
+        Returns:
+            Iterator[Fighter]: Dataclass containing the fighter attributes shown
+                on the listing, one per listed fighter.
+
+        """
+        scraped_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        for row in self._backend.get_elements(self._css_queries.listing_row_query):
+            fighter = self._get_fighter(row, scraped_at)
+            if fighter is not None:
+                yield fighter
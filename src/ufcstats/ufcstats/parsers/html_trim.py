@@ -0,0 +1,83 @@
+"""Cut fight and fighter pages down to the markup parsers query before parsing.
+
+Every query on a fight or fighter page matches inside the page's
+b-statistics__section_details section: the title, the b-fight-details
+blocks and the b-list__box career stats. The header, navigation, scripts
+and footer around it, and the significant strikes charts at the end of fight
+pages, are never queried, but lxml still builds a tree for them. A byte-level
+search for the section's start and end markers drops them before the tree is
+built. Pages without the markers, e.g. listings, are parsed whole.
+"""
+
+from scrapy.http import HtmlResponse, Response
+
+# Pages whose parsers only query the content section
+TRIMMED_URL_PATTERNS = ("fight-details", "fighter-details")
+
+CONTENT_START_MARKER = b'<section class="b-statistics__section_details">'
+FOOTER_MARKER = b"<footer"
+CHARTS_MARKER = b'<div class="b-fight-details__charts"'
+SECTION_MARKER = b"<section"
+
+_html_trim_enabled = False
+
+
+def trim_html(body: bytes) -> bytes:
+    """Cut a ufcstats.com page body down to its content section.
+
+    Args:
+        body (bytes): The page's HTML.
+
+    Returns:
+        bytes: The content section, up to the footer or the charts section,
+            wrapped in html and body tags. The body is returned unchanged
+            if it has no content section, or no section before the charts.
+
+    """
+    start = body.find(CONTENT_START_MARKER)
+    if start == -1:
+        return body
+
+    end = body.find(FOOTER_MARKER, start)
+    if end == -1:
+        end = len(body)
+    charts = body.find(CHARTS_MARKER, start, end)
+    if charts != -1:
+        # The charts are the last section of a fight page, after every stat table
+        end = body.rfind(SECTION_MARKER, start, charts)
+    if end <= start:
+        # Trimming would leave nothing for the parsers, so they get the whole
+        # page and fail with their usual errors if it has no stats
+        return body
+
+    return b"<html><body>" + body[start:end] + b"</body></html>"
+
+
+def trim_response(response: Response) -> Response:
+    """Trim a fight or fighter page response, or return other responses as they are.
+
+    The trimmed response keeps the encoding of the original, as its meta
+    charset tag is trimmed away.
+    """
+    if not isinstance(response, HtmlResponse) or not any(
+        pattern in response.url for pattern in TRIMMED_URL_PATTERNS
+    ):
+        return response
+
+    trimmed_body = trim_html(response.body)
+    if trimmed_body is response.body:
+        return response
+
+    return response.replace(body=trimmed_body, encoding=response.encoding)
+
+
+def set_html_trim(enabled: bool) -> None:
+    """Set whether page parsers run afterwards in this process get trimmed pages."""
+    global _html_trim_enabled
+
+    _html_trim_enabled = enabled
+
+
+def is_html_trim_enabled() -> bool:
+    """Return whether pages are trimmed before parsing, set with set_html_trim."""
+    return _html_trim_enabled
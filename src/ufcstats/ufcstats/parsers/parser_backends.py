@@ -0,0 +1,268 @@
+"""Selector backends used by parsers to run CssQueries against a response.
+
+The parsel backend translates each CSS query to XPath and wraps every match
+in a Selector on every call. The lxml backend compiles each query once per
+process and evaluates it directly against the response's lxml tree, which is
+faster when reparsing many pages. Both return the same strings.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Any, cast, Dict, Iterator, List, Optional, Type
+
+from lxml import etree
+from parsel.csstranslator import css2xpath
+from scrapy.http import Response, TextResponse
+
+
+class ParserBackend(ABC):
+    """Runs CSS queries, optionally followed by a relative XPath, on a response.
+
+    Args:
+        response (Response): The HTTP response to query.
+
+    """
+
+    def __init__(self, response: Response):
+        self._response = response
+
+    @abstractmethod
+    def get(self, query: str, xpath: Optional[str] = None) -> Optional[str]:
+        """Return the first value matching the query, or None if nothing matches."""
+        pass
+
+    @abstractmethod
+    def get_all(self, query: str, xpath: Optional[str] = None) -> List[str]:
+        """Return every value matching the query."""
+        pass
+
+    @abstractmethod
+    def get_elements(self, query: str) -> List[etree._Element]:
+        """Return the lxml elements matching a CSS query selecting elements."""
+        pass
+
+
+class ParselBackend(ParserBackend):
+    """Backend using the response's parsel selector, as Scrapy does by default."""
+
+    def get(self, query: str, xpath: Optional[str] = None) -> Optional[str]:
+        """Return the first value matching the query, or None if nothing matches."""
+        if xpath:
+            return self._response.css(query).xpath(xpath).get()
+
+        return self._response.css(query).get()
+
+    def get_all(self, query: str, xpath: Optional[str] = None) -> List[str]:
+        """Return every value matching the query."""
+        if xpath:
+            return self._response.css(query).xpath(xpath).getall()
+
+        return self._response.css(query).getall()
+
+    def get_elements(self, query: str) -> List[etree._Element]:
+        """Return the lxml elements matching a CSS query selecting elements."""
+        return [selector.root for selector in self._response.css(query)]
+
+
+@lru_cache(maxsize=None)
+def compile_css(query: str) -> etree.XPath:
+    """Compile a CSS query, including ::text and ::attr(), to an lxml XPath.
+
+    Args:
+        query (str): A CSS selector string.
+
+    Returns:
+        etree.XPath: The compiled query, translated as parsel translates it.
+
+    """
+    return etree.XPath(css2xpath(query), smart_strings=False)
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(xpath: str) -> etree.XPath:
+    """Compile an XPath expression to an lxml XPath.
+
+    Args:
+        xpath (str): An XPath expression.
+
+    Returns:
+        etree.XPath: The compiled expression.
+
+    """
+    return etree.XPath(xpath, smart_strings=False)
+
+
+def compile_queries(queries: Any) -> None:
+    """Compile every query of a queries dataclass ahead of parsing.
+
+    Fields named *_xpath are compiled as XPath and all others as CSS.
+
+    Args:
+        queries (Any): Dataclass instance holding query strings, e.g. CssQueries.
+
+    """
+    for name, query in asdict(queries).items():
+        if name.endswith("_xpath"):
+            compile_xpath(query)
+        else:
+            compile_css(query)
+
+
+def _evaluate(compiled: etree.XPath, element: etree._Element) -> List[Any]:
+    # Queries selecting nodes return a list, others (e.g. count()) one value,
+    # which parsel also returns as a single result
+    results = compiled(element)
+    if isinstance(results, list):
+        return results
+
+    return [results]
+
+
+def _to_string(result: Any) -> str:
+    # Serialise XPath results the way parsel's Selector.get() does
+    if isinstance(result, etree._Element):
+        return etree.tostring(
+            result, method="html", encoding="unicode", with_tail=False
+        )
+    if result is True:
+        return "1"
+    if result is False:
+        return "0"
+
+    return str(result)
+
+
+def get_all_in_element(element: etree._Element, query: str) -> List[str]:
+    """Return every value matching a CSS query within an element.
+
+    Used to query rows returned by ParserBackend.get_elements one at a time.
+
+    Args:
+        element (etree._Element): Element to query, e.g. a table row.
+        query (str): A CSS selector string.
+
+    Returns:
+        List[str]: Values matching the query, as parsel would return them.
+
+    """
+    return [_to_string(result) for result in _evaluate(compile_css(query), element)]
+
+
+def get_element_text(element: etree._Element) -> str:
+    """Return the text of an element and its descendants, as joined by itertext.
+
+    Args:
+        element (etree._Element): Element to get the text of, e.g. a table cell.
+
+    Returns:
+        str: The element's text, without its tail.
+
+    """
+    # Text parsed from HTML is always str, though lxml also allows bytes
+    return "".join(cast(Iterator[str], element.itertext()))
+
+
+def get_elements_in_element(
+    element: etree._Element, query: str
+) -> List[etree._Element]:
+    """Return the elements matching a CSS query selecting elements within an element.
+
+    Args:
+        element (etree._Element): Element to query, e.g. a table row.
+        query (str): A CSS selector string selecting elements.
+
+    Returns:
+        List[etree._Element]: Elements matching the query, in document order.
+
+    """
+    return [
+        result
+        for result in _evaluate(compile_css(query), element)
+        if isinstance(result, etree._Element)
+    ]
+
+
+class LxmlBackend(ParserBackend):
+    """Backend evaluating precompiled XPath against one lxml tree of the response.
+
+    Uses the tree Scrapy parses once per response, so parsers sharing a
+    response share the tree. Queries are compiled once per process rather
+    than translated and wrapped in Selectors on each call.
+
+    Args:
+        response (Response): The HTTP response to query.
+
+    Attributes:
+        _root (etree._Element): Root of the response's parsed HTML tree.
+
+    """
+
+    def __init__(self, response: Response):
+        super().__init__(response)
+        self._root: etree._Element = cast(TextResponse, response).selector.root
+
+    def _evaluate(self, query: str, xpath: Optional[str]) -> List[Any]:
+        results = _evaluate(compile_css(query), self._root)
+        if not xpath:
+            return results
+
+        compiled_xpath = compile_xpath(xpath)
+        return [
+            result
+            for element in results
+            if isinstance(element, etree._Element)
+            for result in _evaluate(compiled_xpath, element)
+        ]
+
+    def get(self, query: str, xpath: Optional[str] = None) -> Optional[str]:
+        """Return the first value matching the query, or None if nothing matches."""
+        results = self._evaluate(query, xpath)
+
+        return _to_string(results[0]) if results else None
+
+    def get_all(self, query: str, xpath: Optional[str] = None) -> List[str]:
+        """Return every value matching the query."""
+        return [_to_string(result) for result in self._evaluate(query, xpath)]
+
+    def get_elements(self, query: str) -> List[etree._Element]:
+        """Return the lxml elements matching a CSS query selecting elements."""
+        return [
+            result
+            for result in _evaluate(compile_css(query), self._root)
+            if isinstance(result, etree._Element)
+        ]
+
+
+PARSER_BACKENDS: Dict[str, Type[ParserBackend]] = {
+    "parsel": ParselBackend,
+    "lxml": LxmlBackend,
+}
+
+_parser_backend: Type[ParserBackend] = ParselBackend
+
+
+def set_parser_backend(name: str) -> None:
+    """Select the backend every parser created afterwards in this process uses.
+
+    Args:
+        name (str): Name of the backend in PARSER_BACKENDS.
+
+    Raises:
+        ValueError: If no backend has the given name.
+
+    """
+    global _parser_backend
+
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend {name}, expected one of "
+            f"{', '.join(PARSER_BACKENDS)}"
+        )
+
+    _parser_backend = PARSER_BACKENDS[name]
+
+
+def get_parser_backend() -> Type[ParserBackend]:
+    """Return the backend class selected with set_parser_backend."""
+    return _parser_backend
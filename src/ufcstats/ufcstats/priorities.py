@@ -0,0 +1,69 @@
+"""Request priorities that crawl ufcstats.com events newest first, one at a time.
+
+The events listing shows the newest event first. Each event is requested at
+a lower priority than the one listed above it, and the fight pages of an
+event at a priority between their event's and the next event's. So the
+scheduler always downloads the fights of the newest event it has reached
+before moving on to the next event, and partial or time-boxed crawls cover
+the most recent events completely.
+"""
+
+from typing import Any, Iterable, List
+
+from scrapy import Request
+from scrapy.http import Response
+
+# Leaves room for each event's fight pages between two consecutive events
+EVENT_PRIORITY_STEP = 2
+
+
+def get_event_priority(event_index: int) -> int:
+    """Get the priority of the event at a position on the events listing.
+
+    Args:
+        event_index (int): Position of the event on the listing, 0 for the
+            newest event.
+
+    Returns:
+        int: Request priority, lower for older events.
+
+    """
+    return -EVENT_PRIORITY_STEP * event_index
+
+
+def follow_events(
+    response: Response, event_urls: Iterable[str], **kwargs: Any
+) -> List[Request]:
+    """Follow the event URLs of the events listing, newest first.
+
+    Args:
+        response (Response): The events listing response.
+        event_urls (Iterable[str]): Event URLs in the order they are listed.
+        **kwargs (Any): Passed to Response.follow, e.g. callback.
+
+    Returns:
+        List[Request]: A request per event, at decreasing priorities.
+
+    """
+    return [
+        response.follow(event_url, priority=get_event_priority(event_index), **kwargs)
+        for event_index, event_url in enumerate(event_urls)
+    ]
+
+
+def follow_fights(
+    response: Response, fight_urls: Iterable[str], **kwargs: Any
+) -> List[Request]:
+    """Follow the fight URLs of an event page ahead of every older event.
+
+    Args:
+        response (Response): The event page response.
+        fight_urls (Iterable[str]): Fight URLs listed on the event page.
+        **kwargs (Any): Passed to Response.follow, e.g. callback.
+
+    Returns:
+        List[Request]: A request per fight, just above the event's priority.
+
+    """
+    event_priority = response.request.priority if response.request is not None else 0
+    return list(response.follow_all(fight_urls, priority=event_priority + 1, **kwargs))
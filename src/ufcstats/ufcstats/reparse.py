@@ -0,0 +1,323 @@
+"""Regenerate entity feeds by parsing stored responses again, without the network.
+
+Walks the pages stored in the SQLite HTTP cache, e.g. after a crawl with the
+default HTTPCACHE_ENABLED, or in a filesystem HTTP cache, or the latest
+responses in a response archive, and runs the current parsers on every core.
+Event, fight and fighter pages are parsed with the ufcstats page parsers, and
+fightodds.io GraphQL fight odds and fighter responses with the fightodds
+parsers. So a new entity field only needs a local reparse, not a full crawl:
+
+    python -m ufcstats.reparse .scrapy/httpcache.db --output-format jsonl
+    python -m ufcstats.reparse archive --archive
+
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import json
+import multiprocessing
+from pathlib import Path
+import pickle
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from scrapy.http import HtmlResponse, Response, TextResponse
+from scrapy.utils.misc import load_object
+
+from ufcstats.entity_feeds import EntityFeedWriter
+from ufcstats.httpcache import SqliteHttpCache
+from ufcstats.parser_pool import init_parser_process, PageParser, run_page_parser
+from ufcstats.spiders.constants import UFCSTATS_ALL_ENTITY_FEEDS as ALL_ENTITY_FEEDS
+from ufcstats.spiders.fight_pages import parse_event_page, parse_fight_page
+from ufcstats.spiders.fight_summaries import parse_fight_summaries_page
+from ufcstats.spiders.fighters import parse_fighter_page
+from response_archive import decompress_body, ResponseArchive
+
+FIGHTODDS_API_HOST = "api.fightodds.io"
+
+# Page parsers run on the ufcstats.com pages whose URL contains each pattern
+PAGE_PARSERS: Dict[str, List[PageParser]] = {
+    "event-details": [parse_event_page, parse_fight_summaries_page],
+    "fight-details": [parse_fight_page],
+    "fighter-details": [parse_fighter_page],
+}
+# fightodds.io parser classes run on the responses to each GraphQL operation.
+# Event responses need the event's listing row as well, so are not parsed
+FIGHTODDS_OPERATION_PARSERS: Dict[str, str] = {
+    "FightOddsQuery": "fightodds.parsers.fight_odds_parser.FightOddsParser",
+    "FighterStatsQuery": "fightodds.parsers.fighter_info_parser.FighterParser",
+}
+FIGHTODDS_ENTITY_FEEDS: Dict[str, str] = {
+    "fightodds.entities.fight_odds.FightOdds": "fightodds_fight_betting_odds",
+    "fightodds.entities.fighter.Fighter": "fightodds_fighters",
+}
+
+
+@dataclass(frozen=True)
+class StoredPage:
+    """A stored response, read by the process that parses it.
+
+    Attributes:
+        url (str): URL of the response.
+        request_body (bytes): Body of the request, e.g. a GraphQL query.
+        body_path (Path): File holding the response body, compressed or not,
+            or the SQLite HTTP cache holding it.
+        timestamp (float): When the response was stored.
+        cache_key (Optional[str]): Request fingerprint of the response in the
+            SQLite HTTP cache at body_path, if any.
+
+    """
+
+    url: str
+    request_body: bytes
+    body_path: Path
+    timestamp: float
+    cache_key: Optional[str] = None
+
+
+def _read_cache_file(path: Path) -> bytes:
+    # The cache gzips every file with HTTPCACHE_GZIP
+    return decompress_body(path.read_bytes())
+
+
+@lru_cache(maxsize=None)
+def _open_sqlite_cache(path: Path) -> SqliteHttpCache:
+    # Opened once per worker process
+    return SqliteHttpCache(path)
+
+
+def _read_body(page: StoredPage) -> bytes:
+    if page.cache_key is None:
+        return _read_cache_file(page.body_path)
+
+    return _open_sqlite_cache(page.body_path).get_body(page.cache_key)
+
+
+def _iter_filesystem_cache_pages(
+    cache_dir: Path, spider: Optional[str]
+) -> Iterator[StoredPage]:
+    spider_dirs = [cache_dir / spider] if spider else sorted(cache_dir.iterdir())
+    for spider_dir in spider_dirs:
+        for meta_path in sorted(spider_dir.glob("*/*/pickled_meta")):
+            metadata = pickle.loads(_read_cache_file(meta_path))
+            if metadata["status"] == 200:
+                yield StoredPage(
+                    metadata["response_url"],
+                    _read_cache_file(meta_path.parent / "request_body"),
+                    meta_path.parent / "response_body",
+                    metadata["timestamp"],
+                )
+
+
+def _iter_sqlite_cache_pages(path: Path, spider: Optional[str]) -> Iterator[StoredPage]:
+    cache = SqliteHttpCache(path)
+    try:
+        for entry in cache.get_all(spider, with_bodies=False):
+            if entry.status == 200:
+                yield StoredPage(
+                    entry.response_url,
+                    entry.request_body,
+                    path,
+                    entry.timestamp,
+                    entry.fingerprint,
+                )
+    finally:
+        cache.close()
+
+
+def iter_cached_pages(
+    cache_path: Path, spider: Optional[str] = None
+) -> Iterator[StoredPage]:
+    """Iterate over the successful responses in an HTTP cache.
+
+    A filesystem HTTPCACHE_DIR keeps a page once per spider that cached it,
+    e.g. every fight spider caches the event pages, so only the most recently
+    stored response per request is kept.
+
+    Args:
+        cache_path (Path): The SQLite HTTP cache file, or a filesystem
+            HTTPCACHE_DIR holding a directory per spider.
+        spider (Optional[str]): Only read the responses cached by this spider,
+            or last cached by it in a SQLite HTTP cache.
+
+    Yields:
+        StoredPage: The latest response per URL and request body.
+
+    """
+    if cache_path.is_file():
+        stored_pages = _iter_sqlite_cache_pages(cache_path, spider)
+    else:
+        stored_pages = _iter_filesystem_cache_pages(cache_path, spider)
+
+    pages: Dict[Tuple[str, bytes], StoredPage] = {}
+    for page in stored_pages:
+        key = (page.url, page.request_body)
+        if key not in pages or pages[key].timestamp < page.timestamp:
+            pages[key] = page
+
+    yield from pages.values()
+
+
+def iter_archived_pages(archive_dir: Path) -> Iterator[StoredPage]:
+    """Iterate over the latest successful response of every request in an archive.
+
+    Args:
+        archive_dir (Path): Directory of the response archive.
+
+    Yields:
+        StoredPage: The latest response per URL and GraphQL query.
+
+    """
+    archive = ResponseArchive(archive_dir)
+    try:
+        for archived_response in archive.get_latest():
+            yield StoredPage(
+                archived_response.url,
+                archived_response.request_body,
+                archive.get_object_path(archived_response.body_hash),
+                archived_response.last_fetched_at,
+            )
+    finally:
+        archive.close()
+
+
+def _parse_fightodds_response(response: Response, parser_class: str) -> List[Any]:
+    return list(load_object(parser_class)(response).parse_response())
+
+
+def parse_stored_page(page: StoredPage) -> Tuple[List[Any], List[str]]:
+    """Parse a stored response with every parser matching it.
+
+    Args:
+        page (StoredPage): The stored response.
+
+    Returns:
+        Tuple[List[Any], List[str]]: The parsed entities, and a message per
+            parser that failed on the response.
+
+    """
+    body = _read_body(page)
+    entities: List[Any] = []
+    errors: List[str] = []
+    if FIGHTODDS_API_HOST in page.url:
+        operation_name = json.loads(page.request_body or b"{}").get("operationName")
+        parser_class = FIGHTODDS_OPERATION_PARSERS.get(operation_name)
+        if parser_class is not None:
+            response = TextResponse(url=page.url, body=body, encoding="utf-8")
+            try:
+                entities.extend(_parse_fightodds_response(response, parser_class))
+            except Exception as exception:
+                errors.append(f"{page.url} {operation_name}: {exception!r}")
+        return entities, errors
+
+    response = HtmlResponse(url=page.url, body=body)
+    for pattern, page_parsers in PAGE_PARSERS.items():
+        if pattern not in page.url:
+            continue
+        for parse_page in page_parsers:
+            try:
+                entities.extend(run_page_parser(parse_page, response))
+            except Exception as exception:
+                parser_class = getattr(exception, "parser_class", None)
+                errors.append(f"{page.url} {parser_class}: {exception!r}")
+
+    return entities, errors
+
+
+def reparse_pages(
+    pages: List[StoredPage],
+    feed_writer: EntityFeedWriter,
+    max_workers: Optional[int] = None,
+    parser_backend: str = "parsel",
+    html_trim: bool = False,
+) -> Tuple[int, List[str]]:
+    """Parse stored responses across worker processes and write their entities.
+
+    Args:
+        pages (List[StoredPage]): The stored responses to parse.
+        feed_writer (EntityFeedWriter): Writes the parsed entities.
+        max_workers (Optional[int]): Number of worker processes, one per core
+            by default.
+        parser_backend (str): Name of the parser backend workers use.
+        html_trim (bool): Whether workers trim fight and fighter pages to
+            their content section before parsing.
+
+    Returns:
+        Tuple[int, List[str]]: Number of entities written, and a message per
+            parser that failed on a response.
+
+    """
+    num_entities = 0
+    errors: List[str] = []
+    max_workers = max_workers or multiprocessing.cpu_count()
+    # Several pages per task, so workers are not idle waiting for the next one
+    chunksize = max(1, len(pages) // (4 * max_workers))
+    with ProcessPoolExecutor(
+        max_workers,
+        initializer=init_parser_process,
+        initargs=(parser_backend, html_trim),
+    ) as executor:
+        for entities, page_errors in executor.map(
+            parse_stored_page, pages, chunksize=chunksize
+        ):
+            for entity in entities:
+                feed_writer.write(entity)
+            num_entities += len(entities)
+            errors.extend(page_errors)
+
+    return num_entities, errors
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse the responses in an HTTP cache or archive again and write fresh feeds."""
+    arg_parser = argparse.ArgumentParser(description=main.__doc__)
+    arg_parser.add_argument(
+        "cache_path",
+        type=Path,
+        help="The SQLite HTTP cache, HTTPCACHE_DIR or response archive to read",
+    )
+    arg_parser.add_argument(
+        "--archive", action="store_true", help="Read a response archive"
+    )
+    arg_parser.add_argument("--spider", help="Only read responses cached by a spider")
+    arg_parser.add_argument(
+        "--output-dir", type=Path, default=Path("data"), help="Directory of the feeds"
+    )
+    arg_parser.add_argument(
+        "--output-format", default="jsonl", help="Format of the feeds, jsonl or csv"
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, help="Number of worker processes, one per core"
+    )
+    arg_parser.add_argument(
+        "--parser-backend", default="parsel", help="Parser backend, parsel or lxml"
+    )
+    arg_parser.add_argument(
+        "--trim-html",
+        action="store_true",
+        help="Trim fight and fighter pages to their content section before parsing",
+    )
+    args = arg_parser.parse_args(argv)
+
+    if args.archive:
+        pages = list(iter_archived_pages(args.cache_path))
+    else:
+        pages = list(iter_cached_pages(args.cache_path, args.spider))
+    with EntityFeedWriter(
+        args.output_dir,
+        args.output_format,
+        overwrite=True,
+        entity_feeds={**ALL_ENTITY_FEEDS, **FIGHTODDS_ENTITY_FEEDS},
+    ) as feed_writer:
+        num_entities, errors = reparse_pages(
+            pages, feed_writer, args.workers, args.parser_backend, args.trim_html
+        )
+
+    for error in errors:
+        print(f"Failed to parse {error}")
+    print(f"Parsed {len(pages)} responses into {num_entities} entities")
+
+
+if __name__ == "__main__":
+    main()
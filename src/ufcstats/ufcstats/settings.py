@@ -46,15 +46,76 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-# SPIDER_MIDDLEWARES = {
-#    "ufcstats.middlewares.UfcScraperSpiderMiddleware": 543,
-# }
+SPIDER_MIDDLEWARES = {
+    "ufcstats.middlewares.DeadLetterMiddleware": 900,
+    "ufcstats.middlewares.FrontierMiddleware": 925,
+    "ufcstats.middlewares.IncrementalCrawlMiddleware": 950,
+    # Closer to the spider, so pages in other shards are never recorded as discovered
+    "ufcstats.middlewares.ShardMiddleware": 975,
+}
+
+# Incremental crawls only fetch event and fight pages that are new or failed
+# on a previous run, e.g. scrapy crawl crawl_fights -s INCREMENTAL_CRAWL=True
+INCREMENTAL_CRAWL = False
+CRAWL_STATE_DB = "crawl_state.db"
+
+# Crawler processes sharing a crawl, e.g. one per core, claim requests from a
+# frontier in FRONTIER_DB, e.g. -s SCHEDULER=ufcstats.frontier.FrontierScheduler.
+# A claim not finished within FRONTIER_CLAIM_TIMEOUT_SECS can be claimed again
+# by another process. Requests returned to the queue FRONTIER_MAX_ATTEMPTS times
+# are failed
+FRONTIER_DB = "frontier.db"
+FRONTIER_CLAIM_TIMEOUT_SECS = 10 * 60
+FRONTIER_MAX_ATTEMPTS = 3
+
+# Keep the body of every page a parser fails on, to parse again offline with
+# python -m ufcstats.dead_letters reparse once the parser is fixed
+DEAD_LETTER_ENABLED = True
+DEAD_LETTER_DB = "dead_letters.db"
+
+# Build items from listing pages where they show everything needed, and only
+# fetch detail pages for listing rows that are new or have changed since the
+# last run, e.g. scrapy crawl crawl_events -s LISTING_FAST_PATH=True
+LISTING_FAST_PATH = False
+
+# crawl_live_event polls its event page this often while fights are ending,
+# doubling the interval up to LIVE_POLL_MAX_SECS while no new results appear
+LIVE_POLL_MIN_SECS = 60
+LIVE_POLL_MAX_SECS = 10 * 60
+
+# Parse pages in a pool of worker processes instead of on the reactor thread,
+# using one process per core unless PARSER_POOL_MAX_WORKERS is set
+PARSER_POOL_ENABLED = False
+PARSER_POOL_MAX_WORKERS = 0
+
+# Selector backend parsers run their queries with: "parsel", or "lxml" to run
+# precompiled XPath against a single lxml tree, which is faster for reparsing
+PARSER_BACKEND = "parsel"
+
+# Cut fight and fighter pages down to the section parsers query before building
+# their lxml tree, which gives the same results in less time and memory
+PARSER_TRIM_HTML = False
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-# DOWNLOADER_MIDDLEWARES = {
-#    "ufcstats.middlewares.UfcScraperDownloaderMiddleware": 543,
-# }
+DOWNLOADER_MIDDLEWARES = {
+    # After decompression and redirects, so only final, decoded bodies are archived
+    "response_archive.ResponseArchiveMiddleware": 550,
+    # After the archive, so skipped pages are still archived
+    "ufcstats.middlewares.FighterChangeDetectionMiddleware": 500,
+    # Handles exceptions after RetryMiddleware (550), so retried requests stay claimed
+    "ufcstats.middlewares.FrontierDownloaderMiddleware": 540,
+}
+
+# Only parse and emit fighter pages whose content has changed since they were
+# last parsed, keyed by fighter_id in CRAWL_STATE_DB, e.g.
+# scrapy crawl crawl_fighters -s FIGHTER_CHANGE_DETECTION=True
+FIGHTER_CHANGE_DETECTION = False
+
+# Every distinct response body is kept compressed in RESPONSE_ARCHIVE_DIR, see
+# src/response_archive.py
+RESPONSE_ARCHIVE_ENABLED = True
+RESPONSE_ARCHIVE_DIR = "archive"
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -83,11 +144,19 @@ DOWNLOAD_DELAY = 1
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-# HTTPCACHE_ENABLED = True
-# HTTPCACHE_EXPIRATION_SECS = 0
-# HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_ENABLED = True
+# Expiry is decided by the policy, so the storage never expires entries itself
+HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_DIR = "httpcache"
 # HTTPCACHE_IGNORE_HTTP_CODES = []
-# HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# Every spider's responses are kept in one SQLite file, .scrapy/httpcache.db
+HTTPCACHE_STORAGE = "ufcstats.httpcache.SqliteCacheStorage"
+HTTPCACHE_POLICY = "ufcstats.httpcache.UfcStatsCachePolicy"
+# Event and fight pages never change once they show results, so those are cached
+# forever. Upcoming events and fights are revalidated like other pages
+HTTPCACHE_PERMANENT_URL_PATTERNS = ["event-details", "fight-details"]
+# Event listings, fighter pages and upcoming events are revalidated once a day
+HTTPCACHE_TTL_SECS = 24 * 60 * 60
 
 # Set settings whose default value is deprecated to a future-proof value
 FEED_EXPORT_ENCODING = "utf-8"
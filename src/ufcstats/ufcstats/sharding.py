@@ -0,0 +1,214 @@
+"""Split a backfill into shards crawled by separate processes, and merge their output.
+
+Run with -a shard=<i> -a num_shards=<n>, a spider only follows the event and
+fighter pages in shard i of n, so n processes or machines can share a
+backfill from a cached or archived copy of ufcstats.com. Pages are assigned to
+shards by hashing their UUID, so every process agrees on the split without
+coordinating. Each process writes its own partition of every feed, e.g.
+data/fights.shard-0-of-4.jsonl, which are merged into data/fights.jsonl with:
+
+    python -m ufcstats.sharding data
+
+"""
+
+import argparse
+import csv
+import json
+from pathlib import Path
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from scrapy import Spider
+
+from ufcstats.spiders.constants import UFCSTATS_ENTITY_ID_FIELDS as ENTITY_ID_FIELDS
+from utils import get_uuid_string
+
+PARTITION_PATTERN = re.compile(
+    r"^(?P<feed_name>\w+)\.shard-(?P<shard>\d+)-of-(?P<num_shards>\d+)"
+    r"\.(?P<output_format>\w+)$"
+)
+
+
+def get_shard(url: str, num_shards: int) -> int:
+    """Get the shard a page belongs to.
+
+    Args:
+        url (str): URL of the page, with or without www.
+        num_shards (int): Number of shards the crawl is split into.
+
+    Returns:
+        int: The page's shard, from 0 to num_shards - 1.
+
+    """
+    return UUID(get_uuid_string(url)).int % num_shards
+
+
+def get_spider_shard(spider: Spider) -> Optional[Tuple[int, int]]:
+    """Get the shard a spider was started with, from its shard and num_shards args.
+
+    Args:
+        spider (Spider): The running spider.
+
+    Returns:
+        Optional[Tuple[int, int]]: The spider's shard and the number of
+            shards, or None if the crawl is not sharded.
+
+    Raises:
+        ValueError: If only one of the arguments was given, or the shard is
+            not between 0 and num_shards - 1.
+
+    """
+    shard = getattr(spider, "shard", None)
+    num_shards = getattr(spider, "num_shards", None)
+    if shard is None and num_shards is None:
+        return None
+    if shard is None or num_shards is None:
+        raise ValueError("Sharded crawls need both the shard and num_shards arguments")
+    if not 0 <= int(shard) < int(num_shards):
+        raise ValueError(f"Invalid shard {shard}, expected 0 to {int(num_shards) - 1}")
+
+    return int(shard), int(num_shards)
+
+
+def get_partition_name(feed_name: str, shard: int, num_shards: int) -> str:
+    """Get the name a shard's partition of a feed is written to, without extension."""
+    return f"{feed_name}.shard-{shard}-of-{num_shards}"
+
+
+def _read_rows(path: Path, output_format: str) -> List[Dict[str, Any]]:
+    if output_format in ("jsonl", "jsonlines"):
+        with open(path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+    if output_format == "json":
+        with open(path, encoding="utf-8") as file:
+            rows: List[Dict[str, Any]] = json.load(file)
+        return rows
+    if output_format == "csv":
+        with open(path, newline="", encoding="utf-8") as file:
+            return list(csv.DictReader(file))
+
+    raise ValueError(f"Cannot merge {path}, unsupported output format {output_format}")
+
+
+def _write_rows(path: Path, output_format: str, rows: List[Dict[str, Any]]) -> None:
+    if output_format in ("jsonl", "jsonlines"):
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    elif output_format == "json":
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(rows, file, ensure_ascii=False)
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def merge_rows(
+    partitions: Iterable[List[Dict[str, Any]]], id_field: str
+) -> List[Dict[str, Any]]:
+    """Merge the rows of every partition of a feed, keeping one row per entity.
+
+    An entity is written by several shards when it is reached from pages in
+    different shards, e.g. a fighter listed on a page of every shard. The
+    most recently scraped row of each entity is kept.
+
+    Args:
+        partitions (Iterable[List[Dict[str, Any]]]): Rows of each partition.
+        id_field (str): Field holding the entity ID, e.g. fight_id.
+
+    Returns:
+        List[Dict[str, Any]]: One row per entity ID, in the order first seen.
+
+    """
+    merged_rows: Dict[str, Dict[str, Any]] = {}
+    for rows in partitions:
+        for row in rows:
+            entity_id = row[id_field]
+            merged_row = merged_rows.get(entity_id)
+            if merged_row is None or row["scraped_at"] > merged_row["scraped_at"]:
+                merged_rows[entity_id] = row
+
+    return list(merged_rows.values())
+
+
+def merge_partitions(data_dir: Path, remove_partitions: bool = False) -> List[Path]:
+    """Merge every partitioned feed in a directory into a single file per feed.
+
+    Args:
+        data_dir (Path): Directory the shards wrote their partitions to.
+        remove_partitions (bool): Whether to delete the partitions once merged.
+
+    Returns:
+        List[Path]: The merged feed files.
+
+    Raises:
+        ValueError: If the partitions of a feed disagree on the number of
+            shards, or a shard's partition is missing.
+
+    """
+    feed_partitions: Dict[Tuple[str, str], Dict[int, Path]] = {}
+    feed_num_shards: Dict[Tuple[str, str], int] = {}
+    for path in sorted(data_dir.iterdir()):
+        match = PARTITION_PATTERN.match(path.name)
+        if match is None:
+            continue
+
+        feed = (match["feed_name"], match["output_format"])
+        num_shards = int(match["num_shards"])
+        if feed_num_shards.setdefault(feed, num_shards) != num_shards:
+            raise ValueError(f"Partitions of {feed[0]} have different shard counts")
+        feed_partitions.setdefault(feed, {})[int(match["shard"])] = path
+
+    merged_paths = []
+    for (feed_name, output_format), partition_paths in feed_partitions.items():
+        if feed_name not in ENTITY_ID_FIELDS:
+            raise ValueError(f"Cannot merge {feed_name}, its entity ID is not known")
+
+        missing_shards = set(range(feed_num_shards[feed_name, output_format])) - set(
+            partition_paths
+        )
+        if missing_shards:
+            raise ValueError(
+                f"Missing partitions of {feed_name} for shards "
+                f"{', '.join(map(str, sorted(missing_shards)))}"
+            )
+
+        rows = merge_rows(
+            (
+                _read_rows(partition_paths[shard], output_format)
+                for shard in sorted(partition_paths)
+            ),
+            ENTITY_ID_FIELDS[feed_name],
+        )
+        merged_path = data_dir / f"{feed_name}.{output_format}"
+        _write_rows(merged_path, output_format, rows)
+        merged_paths.append(merged_path)
+
+        if remove_partitions:
+            for partition_path in partition_paths.values():
+                partition_path.unlink()
+
+    return merged_paths
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Merge the feed partitions written by a sharded crawl."""
+    arg_parser = argparse.ArgumentParser(description=main.__doc__)
+    arg_parser.add_argument(
+        "data_dir", type=Path, help="Directory holding the feed partitions"
+    )
+    arg_parser.add_argument(
+        "--remove-partitions",
+        action="store_true",
+        help="Delete the partitions once they are merged",
+    )
+    args = arg_parser.parse_args(argv)
+
+    for merged_path in merge_partitions(args.data_dir, args.remove_partitions):
+        print(f"Merged {merged_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Constants file for spider classes."""
+
+from typing import Dict
+
+UFCSTATS_EVENTS_URL = "http://www.ufcstats.com/statistics/events/completed?page=all"
+
+# Flag shown instead of a result on the next fight of an event in progress
+NEXT_FIGHT_FLAG = "next"
+
+# Maps each entity dataclass to the feed name it is written to, so spiders that
+# emit several entity types can route them to separate feeds.
+UFCSTATS_ENTITY_FEEDS: Dict[str, str] = {
+    "entities.event.Event": "events",
+    "entities.fight.Fight": "fights",
+    "entities.fight_stats.FightStats": "fight_stats",
+    "entities.fight_stats_by_round.FightStatsByRound": "fight_stats_by_round",
+}
+
+# Maps every entity dataclass to its feed name, for writing entities outside a
+# crawl, e.g. when parsing stored pages again
+UFCSTATS_ALL_ENTITY_FEEDS: Dict[str, str] = {
+    **UFCSTATS_ENTITY_FEEDS,
+    "entities.fighter.Fighter": "fighters",
+    "entities.fight_summary.FightSummary": "fight_summaries",
+}
+
+# Field holding the entity ID of each feed's rows, used to merge feed partitions
+UFCSTATS_ENTITY_ID_FIELDS: Dict[str, str] = {
+    "events": "event_id",
+    "fighters": "fighter_id",
+    "fights": "fight_id",
+    "fight_stats": "fight_stat_id",
+    "fight_stats_by_round": "fight_stat_by_round_id",
+    "fight_summaries": "fight_id",
+}
@@ -1,17 +1,49 @@
 """Spider to crawl all event URLs ufcstats.com and parse event overview metrics."""
 
-from typing import Any
+from dataclasses import replace
+from datetime import date
+from typing import Any, List, Optional
 
 import scrapy
+from scrapy.crawler import Crawler
 from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
 
+from ufcstats.crawl_state import CrawlStateStore, get_fingerprint
+from ufcstats.parser_pool import ParserPool
 from ufcstats.parsers.event_info_parser import EventInfoParser
+from ufcstats.parsers.event_listing_parser import EventListingParser
+from ufcstats.priorities import follow_events, get_event_priority
+
+# Event fields only shown on event pages, stored to fill in listed events
+DETAIL_PAGE_FIELDS = ("fights",)
+
+
+def parse_event_page(response: Response) -> List[Any]:
+    """Parse an event page into its Event."""
+    event_info_parser = EventInfoParser(response)
+    return [event_info_parser.parse_response()]
+
+
+def parse_events_listing_page(response: Response) -> List[Any]:
+    """Parse the events listing page into a partial Event per listed event."""
+    event_listing_parser = EventListingParser(response)
+    return list(event_listing_parser.parse_response())
 
 
 class CrawlEvents(scrapy.Spider):
-    """Crawl all event URLs from ufcstats.com and yield event overview metrics."""
+    """Crawl all event URLs from ufcstats.com and yield event overview metrics.
+
+    With the LISTING_FAST_PATH setting, events are built from the events
+    listing instead. An event page is only fetched, to get its fights, when
+    the event's listing row is new or has changed since it was last fetched,
+    or the event has not taken place yet. Other events are yielded from the
+    listing, with their fights as recorded when their page was last fetched.
+    """
 
     name = "crawl_events"
+    _parser_pool: ParserPool
+    _state_store: Optional[CrawlStateStore]
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -23,15 +55,78 @@ class CrawlEvents(scrapy.Spider):
 
     start_urls = ["http://www.ufcstats.com/statistics/events/completed?page=all"]
 
-    def parse(self, response: Response) -> Any:
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a pool to parse pages in."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+        spider._state_store = None
+        if crawler.settings.getbool("LISTING_FAST_PATH"):
+            spider._state_store = CrawlStateStore(
+                crawler.settings.get("CRAWL_STATE_DB")
+            )
+
+        return spider
+
+    async def parse(self, response: Response) -> Any:
         """Parse the events listing page and schedule requests to event pages."""
-        yield from response.follow_all(
-            response.css("a[href*='event-details']::attr(href)").getall(),
-            callback=self._get_events,
+        if self._state_store is None:
+            return follow_events(
+                response,
+                response.css("a[href*='event-details']::attr(href)").getall(),
+                callback=self._get_events,
+            )
+
+        listed_events = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_events_listing_page, response)
+        )
+        stats = self.crawler.stats
+        today = date.today().isoformat()
+        events_or_requests = []
+        for event_index, event in enumerate(listed_events):
+            fingerprint = get_fingerprint(
+                event.name, event.date, event.city, event.state, event.country
+            )
+            details = None
+            is_unchanged = (
+                self._state_store.get_fingerprint(self.name, event.url) == fingerprint
+            )
+            if is_unchanged and event.date_formatted < today:
+                details = self._state_store.get_details(self.name, event.url)
+
+            if details is not None:
+                if stats is not None:
+                    stats.inc_value("listing/unchanged", spider=self)
+                events_or_requests.append(replace(event, **details))
+            else:
+                if stats is not None:
+                    stats.inc_value("listing/fetched", spider=self)
+                events_or_requests.append(
+                    response.follow(
+                        event.url,
+                        callback=self._get_events,
+                        cb_kwargs={"listing_fingerprint": fingerprint},
+                        priority=get_event_priority(event_index),
+                    )
+                )
+
+        return events_or_requests
+
+    async def _get_events(
+        self, response: Response, listing_fingerprint: Optional[str] = None
+    ) -> Any:
+        events = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_event_page, response)
         )
+        if self._state_store is not None and listing_fingerprint is not None:
+            details = {field: getattr(events[0], field) for field in DETAIL_PAGE_FIELDS}
+            self._state_store.record_fingerprint(
+                self.name, response.url, listing_fingerprint, details
+            )
 
-    def _get_events(self, response: Response) -> Any:
-        event_info_parser = EventInfoParser(response)
-        event = event_info_parser.parse_response()
+        return events
 
-        yield (event)
+    def closed(self, reason: str) -> None:
+        """Close the crawl state store used by the listing fast path."""
+        if self._state_store is not None:
+            self._state_store.close()
@@ -0,0 +1,154 @@
+"""Spider to crawl every event and fight page on ufcstats.com once and parse all fight entities."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import scrapy
+from scrapy.crawler import Crawler
+from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
+
+from ufcstats.parser_pool import ParserPool
+from ufcstats.parsers.event_info_parser import EventInfoParser
+from ufcstats.parsers.fight_info_parser import FightInfoParser
+from ufcstats.parsers.fight_stat_parser import FightStatByRoundParser, FightStatParser
+from ufcstats.priorities import follow_events, follow_fights
+from ufcstats.sharding import get_partition_name, get_spider_shard
+from .constants import (
+    UFCSTATS_ENTITY_FEEDS as ENTITY_FEEDS,
+    UFCSTATS_EVENTS_URL as EVENTS_URL,
+)
+
+
+def get_entity_feeds(
+    output_format: str, overwrite: bool = True, shard: Optional[Tuple[int, int]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Build a FEEDS setting that writes each entity type to its own file.
+
+    Args:
+        output_format (str): Feed export format, e.g. csv or json.
+        overwrite (bool): Whether to replace existing files rather than append
+            to them, e.g. when resuming a crawl.
+        shard (Optional[Tuple[int, int]]): Shard and number of shards of a
+            sharded crawl, which writes its own partition of each feed.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: FEEDS mapping of data/<entity>.<format> to
+            feed options filtered to that entity's item class.
+
+    """
+    entity_feeds: Dict[str, Dict[str, Any]] = {}
+    for item_class, feed_name in ENTITY_FEEDS.items():
+        if shard is not None:
+            feed_name = get_partition_name(feed_name, *shard)
+        entity_feeds[f"data/{feed_name}.{output_format}"] = {
+            "format": output_format,
+            "item_classes": [item_class],
+            "overwrite": overwrite,
+        }
+
+    return entity_feeds
+
+
+def parse_event_page(response: Response) -> List[Any]:
+    """Parse an event page into its Event."""
+    event_info_parser = EventInfoParser(response)
+    return [event_info_parser.parse_response()]
+
+
+def parse_fight_page(response: Response) -> List[Any]:
+    """Parse a fight page into its Fight, FightStats and FightStatsByRound items."""
+    fight_info_parser = FightInfoParser(response)
+    fight_stat_parser = FightStatParser(response)
+    fight_stat_by_round_parser = FightStatByRoundParser(
+        response, fight_stat_parser.fight_stat_tables
+    )
+
+    return [
+        fight_info_parser.parse_response(),
+        *fight_stat_parser.parse_response(),
+        *fight_stat_by_round_parser.parse_response(),
+    ]
+
+
+class CrawlFightPages(scrapy.Spider):
+    """Crawl each event and fight page once and yield events, fights and fight stats.
+
+    Every fight page is downloaded a single time and parsed into a Fight, a
+    FightStats per fighter and a FightStatsByRound per fighter per round. The
+    event pages visited on the way are parsed into Event items.
+    """
+
+    name = "crawl_fight_pages"
+    _parser_pool: ParserPool
+
+    custom_settings = {
+        "AUTOTHROTTLE_ENABLED": True,
+        "AUTOTHROTTLE_START_DELAY": 1,
+        "AUTOTHROTTLE_MAX_DELAY": 10,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 1.0,
+        "RANDOMIZE_DOWNLOAD_DELAY": True,
+    }
+
+    start_urls = [EVENTS_URL]
+
+    def __init__(self, output_format: str | None = None, **kwargs: Any):
+        """Initialise spider with an optional per-entity output format.
+
+        Args:
+            output_format: If set, write each entity type to data/<entity>.<format>.
+            **kwargs: Passed through to the scrapy.Spider base class.
+
+        """
+        super().__init__(**kwargs)
+        self._output_format = output_format
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a parser pool and a feed per entity type.
+
+        Feeds are appended to when resuming a crawl with JOBDIR, and each
+        shard of a sharded crawl writes its own partition of them.
+        """
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+        if spider._output_format:
+            entity_feeds = get_entity_feeds(
+                spider._output_format,
+                overwrite=not crawler.settings.get("JOBDIR"),
+                shard=get_spider_shard(spider),
+            )
+            crawler.settings.set("FEEDS", entity_feeds, priority="spider")
+
+        return spider
+
+    def parse(self, response: Response) -> Any:
+        """Parse the events listing page and schedule requests to event pages."""
+        yield from self._get_event_urls(response)
+
+    def _get_event_urls(self, response: Response) -> Any:
+        """Get all event urls from main event page."""
+        yield from follow_events(
+            response,
+            response.css("a[href*='event-details']::attr(href)").getall(),
+            callback=self._get_events,
+        )
+
+    async def _get_events(self, response: Response) -> Any:
+        """Parse the event page and schedule requests to its fight pages."""
+        event_entities = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_event_page, response)
+        )
+
+        return [
+            *event_entities,
+            *follow_fights(
+                response,
+                response.css("a[href*='fight-details']::attr(href)").getall(),
+                callback=self._get_fight_entities,
+            ),
+        ]
+
+    async def _get_fight_entities(self, response: Response) -> Any:
+        return await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fight_page, response)
+        )
@@ -1,17 +1,30 @@
 """Spider to crawl all fight URLs on ufcstats.com and parse fight statistics per fighter."""
 
-from typing import Any
+from typing import Any, List
 
 import scrapy
+from scrapy.crawler import Crawler
 from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
 
+from ufcstats.parser_pool import ParserPool
 from ufcstats.parsers.fight_stat_parser import FightStatParser
+from ufcstats.priorities import follow_events, follow_fights
+
+
+def parse_fight_page(response: Response) -> List[Any]:
+    """Parse a fight page into the FightStats of both fighters."""
+    fight_stat_parser = FightStatParser(response)
+    fighter_1_stats, fighter_2_stats = tuple(fight_stat_parser.parse_response())
+
+    return [fighter_1_stats, fighter_2_stats]
 
 
 class CrawlFightStats(scrapy.Spider):
     """Crawl all fight URLs from ufcstats.com and yield fight statistics per fighter."""
 
     name = "crawl_fight_stats"
+    _parser_pool: ParserPool
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -23,27 +36,35 @@ class CrawlFightStats(scrapy.Spider):
 
     start_urls = ["http://www.ufcstats.com/statistics/events/completed?page=all"]
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a pool to parse pages in."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+
+        return spider
+
     def parse(self, response: Response) -> Any:
         """Parse the events listing page and schedule requests to event pages."""
         yield from self._get_event_urls(response)
 
     def _get_event_urls(self, response: Response) -> Any:
         """Get all event urls from main event page."""
-        yield from response.follow_all(
+        yield from follow_events(
+            response,
             response.css("a[href*='event-details']::attr(href)").getall(),
             callback=self._get_fight_urls,
         )
 
     def _get_fight_urls(self, response: Response) -> Any:
         """Get all fight urls from each event page."""
-        yield from response.follow_all(
+        yield from follow_fights(
+            response,
             response.css("a[href*='fight-details']::attr(href)").getall(),
             callback=self._get_fight_stats,
         )
 
-    def _get_fight_stats(self, response: Response) -> Any:
-        fight_stat_parser = FightStatParser(response)
-        fighter_1_stats, fighter_2_stats = tuple(fight_stat_parser.parse_response())
-
-        yield fighter_1_stats
-        yield fighter_2_stats
+    async def _get_fight_stats(self, response: Response) -> Any:
+        return await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fight_page, response)
+        )
@@ -0,0 +1,61 @@
+"""Spider to crawl all event URLs ufcstats.com and parse fight results from them."""
+
+from typing import Any, List
+
+import scrapy
+from scrapy.crawler import Crawler
+from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
+
+from ufcstats.parser_pool import ParserPool
+from ufcstats.parsers.fight_summary_parser import FightSummaryParser
+from ufcstats.priorities import follow_events
+
+
+def parse_fight_summaries_page(response: Response) -> List[Any]:
+    """Parse an event page into a FightSummary per fight that has taken place."""
+    fight_summary_parser = FightSummaryParser(response)
+    return list(fight_summary_parser.parse_response())
+
+
+class CrawlFightSummaries(scrapy.Spider):
+    """Crawl all event URLs from ufcstats.com and yield the result of each fight.
+
+    Results and headline stats are read from the fight table of each event
+    page, so one request per event is made instead of one per fight. Use the
+    fights and fight stats spiders for everything only shown on fight pages.
+    """
+
+    name = "crawl_fight_summaries"
+    _parser_pool: ParserPool
+
+    custom_settings = {
+        "AUTOTHROTTLE_ENABLED": True,
+        "AUTOTHROTTLE_START_DELAY": 1,
+        "AUTOTHROTTLE_MAX_DELAY": 10,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 1.0,
+        "RANDOMIZE_DOWNLOAD_DELAY": True,
+    }
+
+    start_urls = ["http://www.ufcstats.com/statistics/events/completed?page=all"]
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a pool to parse pages in."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+
+        return spider
+
+    def parse(self, response: Response) -> Any:
+        """Parse the events listing page and schedule requests to event pages."""
+        yield from follow_events(
+            response,
+            response.css("a[href*='event-details']::attr(href)").getall(),
+            callback=self._get_fight_summaries,
+        )
+
+    async def _get_fight_summaries(self, response: Response) -> Any:
+        return await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fight_summaries_page, response)
+        )
@@ -1,17 +1,67 @@
 """Spider to crawl all fighter URLs ufcstats.com and parse fighter overview metrics."""
 
-from typing import Any
+from dataclasses import replace
+from typing import Any, List, Optional
 
 import scrapy
+from scrapy.crawler import Crawler
 from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
 
+from ufcstats.crawl_state import CrawlStateStore, get_fingerprint
+from ufcstats.parser_pool import ParserPool
 from ufcstats.parsers.fighter_info_parser import FighterInfoParser
+from ufcstats.parsers.fighter_listing_parser import FighterListingParser
+from entities.fighter import Fighter
+
+# Fighter fields shown on the fighters listing, fingerprinted to detect changes
+LISTING_FIELDS = (
+    "full_name",
+    "nickname",
+    "height_ft",
+    "height_in",
+    "weight_lbs",
+    "reach_in",
+    "stance",
+    "wins",
+    "losses",
+    "draws",
+)
+# Fighter fields only shown on fighter pages, stored to fill in listed fighters
+DETAIL_PAGE_FIELDS = ("dob", "dob_formatted", "record", "no_contests", "fight_ids")
+
+
+def parse_fighter_page(response: Response) -> List[Any]:
+    """Parse a fighter page into its Fighter."""
+    fighter_info_parser = FighterInfoParser(response)
+    return [fighter_info_parser.parse_response()]
+
+
+def parse_fighters_listing_page(response: Response) -> List[Any]:
+    """Parse a fighters listing page into a partial Fighter per listed fighter."""
+    fighter_listing_parser = FighterListingParser(response)
+    return list(fighter_listing_parser.parse_response())
+
+
+def get_listing_fingerprint(fighter: Fighter) -> str:
+    """Fingerprint the fields of a fighter shown on their listing row."""
+    return get_fingerprint(*(str(getattr(fighter, field)) for field in LISTING_FIELDS))
 
 
 class CrawlFighters(scrapy.Spider):
-    """Crawl all fighter URLs from ufcstats.com and yield fighter overview metrics."""
+    """Crawl all fighter URLs from ufcstats.com and yield fighter overview metrics.
+
+    With the LISTING_FAST_PATH setting, fighters are built from the fighters
+    listings instead. A fighter page is only fetched when the fighter's
+    listing row is new or has changed since it was last fetched, so their
+    date of birth, no contests and fights are known. Other fighters are
+    yielded from the listing, with those fields as recorded when their page
+    was last fetched.
+    """
 
     name = "crawl_fighters"
+    _parser_pool: ParserPool
+    _state_store: Optional[CrawlStateStore]
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -19,9 +69,6 @@ class CrawlFighters(scrapy.Spider):
         "AUTOTHROTTLE_MAX_DELAY": 10,
         "AUTOTHROTTLE_TARGET_CONCURRENCY": 1.0,
         "RANDOMIZE_DOWNLOAD_DELAY": True,
-        "HTTPCACHE_ENABLED": True,
-        "HTTPCACHE_DIR": "httpcache",
-        "HTTPCACHE_EXPIRATION_SECS": None,
     }
 
     start_urls = [
@@ -29,15 +76,72 @@ class CrawlFighters(scrapy.Spider):
         for letter in "abcdefghijklmnopqrstuvwxyz"
     ]
 
-    def parse(self, response: Response) -> Any:
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a pool to parse pages in."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+        spider._state_store = None
+        if crawler.settings.getbool("LISTING_FAST_PATH"):
+            spider._state_store = CrawlStateStore(
+                crawler.settings.get("CRAWL_STATE_DB")
+            )
+
+        return spider
+
+    async def parse(self, response: Response) -> Any:
         """Parse the fighter listing page and schedule requests to fighter pages."""
-        yield from response.follow_all(
-            response.css("a[href*='fighter-details']::attr(href)").getall(),
-            callback=self._get_fighters,
+        if self._state_store is None:
+            return response.follow_all(
+                response.css("a[href*='fighter-details']::attr(href)").getall(),
+                callback=self._get_fighters,
+            )
+
+        listed_fighters = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fighters_listing_page, response)
+        )
+        stats = self.crawler.stats
+        fighters_or_requests = []
+        for fighter in listed_fighters:
+            fingerprint = get_listing_fingerprint(fighter)
+            details = None
+            if self._state_store.get_fingerprint(self.name, fighter.url) == fingerprint:
+                details = self._state_store.get_details(self.name, fighter.url)
+
+            if details is not None:
+                if stats is not None:
+                    stats.inc_value("listing/unchanged", spider=self)
+                fighters_or_requests.append(replace(fighter, **details))
+            else:
+                if stats is not None:
+                    stats.inc_value("listing/fetched", spider=self)
+                fighters_or_requests.append(
+                    response.follow(
+                        fighter.url,
+                        callback=self._get_fighters,
+                        cb_kwargs={"listing_fingerprint": fingerprint},
+                    )
+                )
+
+        return fighters_or_requests
+
+    async def _get_fighters(
+        self, response: Response, listing_fingerprint: Optional[str] = None
+    ) -> Any:
+        fighters = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fighter_page, response)
         )
+        if self._state_store is not None and listing_fingerprint is not None:
+            details = {
+                field: getattr(fighters[0], field) for field in DETAIL_PAGE_FIELDS
+            }
+            self._state_store.record_fingerprint(
+                self.name, response.url, listing_fingerprint, details
+            )
 
-    def _get_fighters(self, response: Response) -> Any:
-        fighter_info_parser = FighterInfoParser(response)
-        fighter = fighter_info_parser.parse_response()
+        return fighters
 
-        yield (fighter)
+    def closed(self, reason: str) -> None:
+        """Close the crawl state store used by the listing fast path."""
+        if self._state_store is not None:
+            self._state_store.close()
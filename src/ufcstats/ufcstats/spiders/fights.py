@@ -1,17 +1,28 @@
 """Spider to crawl all fight URLs ufcstats.com and parse fight overview metrics."""
 
-from typing import Any
+from typing import Any, List
 
 import scrapy
+from scrapy.crawler import Crawler
 from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
 
+from ufcstats.parser_pool import ParserPool
 from ufcstats.parsers.fight_info_parser import FightInfoParser
+from ufcstats.priorities import follow_events, follow_fights
+
+
+def parse_fight_page(response: Response) -> List[Any]:
+    """Parse a fight page into its Fight."""
+    fight_info_parser = FightInfoParser(response)
+    return [fight_info_parser.parse_response()]
 
 
 class CrawlFights(scrapy.Spider):
     """Crawl all fight URLs from ufcstats.com and yield fight overview metrics."""
 
     name = "crawl_fights"
+    _parser_pool: ParserPool
 
     custom_settings = {
         "AUTOTHROTTLE_ENABLED": True,
@@ -23,26 +34,35 @@ class CrawlFights(scrapy.Spider):
 
     start_urls = ["http://www.ufcstats.com/statistics/events/completed?page=all"]
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a pool to parse pages in."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+
+        return spider
+
     def parse(self, response: Response) -> Any:
         """Parse the events listing page and schedule requests to event pages."""
         yield from self._get_event_urls(response)
 
     def _get_event_urls(self, response: Response) -> Any:
         """Get all event urls from main event page."""
-        yield from response.follow_all(
+        yield from follow_events(
+            response,
             response.css("a[href*='event-details']::attr(href)").getall(),
             callback=self._get_fight_urls,
         )
 
     def _get_fight_urls(self, response: Response) -> Any:
         """Get all fight urls from each event page."""
-        yield from response.follow_all(
+        yield from follow_fights(
+            response,
             response.css("a[href*='fight-details']::attr(href)").getall(),
             callback=self._get_fights,
         )
 
-    def _get_fights(self, response: Response) -> Any:
-        fight_info_parser = FightInfoParser(response)
-        fight = fight_info_parser.parse_response()
-
-        yield fight
+    async def _get_fights(self, response: Response) -> Any:
+        return await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_fight_page, response)
+        )
@@ -0,0 +1,217 @@
+"""Spider to follow a single ufcstats.com event live and parse each fight once it ends."""
+
+from datetime import date
+from typing import Any, List, Optional, Set
+
+import scrapy
+from scrapy import Request, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.base import DelayedCall
+
+from ufcstats.parser_pool import ParserPool
+from ufcstats.parsers.base_parser import CssQueries
+from ufcstats.parsers.fight_summary_parser import FightSummaryParser
+from utils import get_uuid_string
+from .constants import UFCSTATS_EVENTS_URL as EVENTS_URL
+from .events import parse_events_listing_page
+from .fight_pages import get_entity_feeds, parse_fight_page
+
+LATEST_EVENT = "latest"
+
+
+def parse_live_event_page(response: Response) -> List[Any]:
+    """Parse an event page into a FightSummary per fight with a result."""
+    fight_summary_parser = FightSummaryParser(response)
+    return list(fight_summary_parser.parse_response())
+
+
+class CrawlLiveEvent(scrapy.Spider):
+    """Poll one event page and yield fights and fight stats as each fight ends.
+
+    The event page is polled every LIVE_POLL_MIN_SECS while results keep
+    coming in, backing off to LIVE_POLL_MAX_SECS while none do. Each fight
+    page is requested once its result is shown on the event page, and is
+    parsed into a Fight, FightStats and FightStatsByRound items. A fight page
+    is fetched again at the next poll only if it could not be parsed yet, e.g.
+    because its stats were not published with the result. The spider closes
+    once every fight on the card has been parsed.
+
+    Event and fight pages are cached forever by the HTTP cache, so every
+    request bypasses it.
+    """
+
+    name = "crawl_live_event"
+    _parser_pool: ParserPool
+    _min_poll_secs: float
+    _max_poll_secs: float
+    _poll_secs: float
+
+    custom_settings = {
+        "RANDOMIZE_DOWNLOAD_DELAY": True,
+    }
+
+    def __init__(
+        self,
+        event_url: str = LATEST_EVENT,
+        output_format: str | None = None,
+        **kwargs: Any,
+    ):
+        """Initialise spider with the event to follow.
+
+        Args:
+            event_url: URL of the event page, or "latest" for the most recent
+                event that has started according to the events listing.
+            output_format: If set, write each entity type to data/<entity>.<format>.
+            **kwargs: Passed through to the scrapy.Spider base class.
+
+        """
+        super().__init__(**kwargs)
+        self._event_url = None if event_url == LATEST_EVENT else event_url
+        self._output_format = output_format
+        # Fight IDs on the card, those requested and those parsed successfully
+        self._card_fight_ids: Optional[Set[str]] = None
+        self._requested_fight_ids: Set[str] = set()
+        self._parsed_fight_ids: Set[str] = set()
+        self._next_poll: Optional[DelayedCall] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args: Any, **kwargs: Any) -> Any:
+        """Create the spider with a parser pool that keeps polling while idle."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._parser_pool = ParserPool.from_crawler(crawler)
+        spider._min_poll_secs = crawler.settings.getfloat("LIVE_POLL_MIN_SECS")
+        spider._max_poll_secs = crawler.settings.getfloat("LIVE_POLL_MAX_SECS")
+        spider._poll_secs = spider._min_poll_secs
+        if spider._output_format:
+            crawler.settings.set(
+                "FEEDS", get_entity_feeds(spider._output_format), priority="spider"
+            )
+        crawler.signals.connect(spider._schedule_poll, signal=signals.spider_idle)
+
+        return spider
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether every fight on the card has been parsed."""
+        return self._card_fight_ids is not None and (
+            self._card_fight_ids <= self._parsed_fight_ids
+        )
+
+    def start_requests(self) -> Any:
+        """Request the event page, or the events listing to find the latest event."""
+        if self._event_url is None:
+            yield Request(
+                EVENTS_URL, callback=self._get_latest_event, meta={"dont_cache": True}
+            )
+        else:
+            yield self._get_poll_request()
+
+    def _get_poll_request(self) -> Request:
+        return Request(
+            self._event_url,  # type: ignore[arg-type]
+            callback=self._poll_event,
+            dont_filter=True,
+            meta={"dont_cache": True},
+        )
+
+    async def _get_latest_event(self, response: Response) -> Any:
+        """Follow the most recent event dated today or earlier."""
+        listed_events = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_events_listing_page, response)
+        )
+        today = date.today().isoformat()
+        started_events = [
+            event for event in listed_events if event.date_formatted <= today
+        ]
+        if not started_events:
+            raise ValueError(f"No event dated {today} or earlier on {response.url}")
+
+        latest_event = max(started_events, key=lambda event: event.date_formatted)
+        self.logger.info("Following %s (%s)", latest_event.name, latest_event.url)
+        self._event_url = latest_event.url
+
+        return [self._get_poll_request()]
+
+    async def _poll_event(self, response: Response) -> Any:
+        """Request each fight page whose result is new since the last poll."""
+        fight_summaries = await maybe_deferred_to_future(
+            self._parser_pool.parse(parse_live_event_page, response)
+        )
+        self._card_fight_ids = {
+            get_uuid_string(fight_url.strip())
+            for fight_url in response.css(CssQueries.event_fight_urls_query).getall()
+        }
+        if self.crawler.stats is not None:
+            self.crawler.stats.inc_value("live/polls", spider=self)
+
+        fight_requests = []
+        for fight_summary in fight_summaries:
+            if fight_summary.fight_id in self._requested_fight_ids:
+                continue
+
+            self._requested_fight_ids.add(fight_summary.fight_id)
+            fight_requests.append(
+                response.follow(
+                    fight_summary.url,
+                    callback=self._get_fight_entities,
+                    cb_kwargs={"fight_id": fight_summary.fight_id},
+                    meta={"dont_cache": True},
+                )
+            )
+
+        # Poll often while fights are ending, and back off while none are
+        if fight_requests:
+            self._poll_secs = self._min_poll_secs
+        else:
+            self._poll_secs = min(self._poll_secs * 2, self._max_poll_secs)
+        self.logger.info(
+            "%d of %d fights finished, %d new",
+            len(fight_summaries),
+            len(self._card_fight_ids),
+            len(fight_requests),
+        )
+
+        return fight_requests
+
+    async def _get_fight_entities(self, response: Response, fight_id: str) -> Any:
+        try:
+            fight_entities = await maybe_deferred_to_future(
+                self._parser_pool.parse(parse_fight_page, response)
+            )
+        except ValueError:
+            # Results can be published before the stats, so try again next poll
+            self.logger.warning("Could not parse %s yet", response.url, exc_info=True)
+            self._requested_fight_ids.discard(fight_id)
+            if self.crawler.stats is not None:
+                self.crawler.stats.inc_value("live/fight_retries", spider=self)
+            return []
+
+        self._parsed_fight_ids.add(fight_id)
+
+        return fight_entities
+
+    def _schedule_poll(self, spider: scrapy.Spider) -> None:
+        # Called on spider_idle, so the event is polled again once every fight
+        # page requested by the last poll has been handled
+        if spider is not self or self._event_url is None or self.is_finished:
+            return
+
+        if self._next_poll is None or not self._next_poll.active():
+            from twisted.internet import reactor
+
+            self._next_poll = reactor.callLater(  # type: ignore[attr-defined]
+                self._poll_secs, self._poll
+            )
+
+        raise DontCloseSpider
+
+    def _poll(self) -> None:
+        self.crawler.engine.crawl(self._get_poll_request())  # type: ignore[union-attr]
+
+    def closed(self, reason: str) -> None:
+        """Stop waiting for the next poll."""
+        if self._next_poll is not None and self._next_poll.active():
+            self._next_poll.cancel()
@@ -1,15 +1,25 @@
 """Utility functions for UFC data scraping and normalization."""
 
+from datetime import datetime
+from functools import lru_cache
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 from uuid import uuid5, NAMESPACE_URL
 
+# A cleaned fight stat such as "12 of 30", see get_strikes_landed_attempted
+STRIKES_LANDED_ATTEMPTED_PATTERN = re.compile(r"(\d+) of (\d+)")
+
+# 'www.' right after the URL scheme, see format_href
+WWW_SUBDOMAIN = "://www."
+
 
 def clean_string(raw_string: str) -> str:
     """Normalize whitespace in a string.
 
     Collapses consecutive whitespace characters (spaces, tabs, newlines, etc.)
     into a single space and removes leading and trailing whitespace.
+    Splitting on whitespace is several times faster than a regular
+    expression substitution, for clean and raw strings alike.
 
     Args:
         raw_string (str): The input string to clean.
@@ -18,14 +28,27 @@ def clean_string(raw_string: str) -> str:
         str: The cleaned string with normalized whitespace.
 
     """
-    return re.sub(r"\s+", " ", raw_string).strip()
+    return " ".join(raw_string.split())
+
+
+def clean_strings(raw_strings: Iterable[str]) -> List[str]:
+    """Normalize whitespace in each string, as clean_string does.
+
+    Args:
+        raw_strings (Iterable[str]): The input strings to clean.
+
+    Returns:
+        List[str]: The cleaned strings, in the same order.
+
+    """
+    return [" ".join(raw_string.split()) for raw_string in raw_strings]
 
 
 def format_href(url: str) -> str:
     """Remove the 'www.' subdomain from a URL string.
 
-    Uses a regular expression to strip 'www.' when it appears
-    immediately after the URL scheme (e.g., http:// or https://).
+    Strips 'www.' when it appears immediately after the URL scheme
+    (e.g., http:// or https://). URLs without it are returned as they are.
     This is because the URLs in the hrefs have www. but the URLs
     on each page don't, so this helps ensure the IDs are consistent.
 
@@ -36,7 +59,10 @@ def format_href(url: str) -> str:
         str: The normalized URL without the 'www.' subdomain.
 
     """
-    return re.sub(r"(?<=://)www\.", "", url)
+    if WWW_SUBDOMAIN not in url:
+        return url
+
+    return url.replace(WWW_SUBDOMAIN, "://")
 
 
 def get_uuid_string(input_string: str, should_format_href: bool = True) -> str:
@@ -62,6 +88,40 @@ def get_uuid_string(input_string: str, should_format_href: bool = True) -> str:
     return uuid_string
 
 
+def get_uuid_strings(urls: Iterable[str]) -> List[str]:
+    """Generate the UUID string of each URL, as get_uuid_string does.
+
+    Args:
+        urls (Iterable[str]): The URLs used to generate the UUIDs.
+
+    Returns:
+        List[str]: The generated UUIDs, in the same order.
+
+    """
+    return [str(uuid5(NAMESPACE_URL, format_href(url))) for url in urls]
+
+
+@lru_cache(maxsize=4096)
+def format_date(date_string: str, date_format: str) -> str:
+    """Convert a date string to the format "%Y-%m-%d".
+
+    Results are cached, as datetime.strptime is slow and the same dates
+    appear on many pages.
+
+    Args:
+        date_string (str): The date, e.g. "October 26, 2024".
+        date_format (str): The strptime format of date_string, e.g. "%B %d, %Y".
+
+    Returns:
+        str: The date formatted as "%Y-%m-%d", e.g. "2024-10-26".
+
+    Raises:
+        ValueError: If date_string does not match date_format.
+
+    """
+    return datetime.strptime(date_string, date_format).strftime("%Y-%m-%d")
+
+
 def get_strikes_landed_attempted(fight_stat: str) -> Tuple[int, int]:
     """Get strikes landed and attempted from fight stat string.
 
@@ -75,14 +135,14 @@ def get_strikes_landed_attempted(fight_stat: str) -> Tuple[int, int]:
         ValueError: If fight_stat does not match the format "X of Y"
 
     """
-    strikes_attempted_landed_pattern = re.compile(r"^\d+\s+of\s+\d+$")
-    fight_stat_clean = clean_string(fight_stat)
-    if not strikes_attempted_landed_pattern.fullmatch(fight_stat_clean):
+    fight_stat_match = STRIKES_LANDED_ATTEMPTED_PATTERN.fullmatch(
+        clean_string(fight_stat)
+    )
+    if fight_stat_match is None:
         raise ValueError(
             f"Invalid fight_stat format: {fight_stat!r}. Expected 'X of Y'."
         )
-    fight_stat_split: List[str] = fight_stat_clean.split(" of ")
-    landed = int(fight_stat_split[0])
-    attempted = int(fight_stat_split[1])
+    landed = int(fight_stat_match[1])
+    attempted = int(fight_stat_match[2])
 
     return landed, attempted